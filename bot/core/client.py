@@ -1,19 +1,23 @@
-import collections.abc
+from asyncio import Task, gather
+from collections import Counter, OrderedDict, defaultdict
 from datetime import datetime as _datetime
+from hashlib import sha256
+from json import dumps, loads
 from logging import getLogger
 from os import makedirs as _makedirs
 from os import path
-from string import Template
-from time import time
-from typing import TYPE_CHECKING, Any, Dict
+from sys import getsizeof
+from time import perf_counter, time
+from typing import TYPE_CHECKING, DefaultDict, Dict, List
 from typing import Optional as _Optional
-from typing import Sequence, Tuple, Type, TypeVar
+from typing import Sequence, Set, Tuple, Type, TypeVar
 from typing import Union as _Union
 
 from aiohttp import ClientSession
-from asyncpg import Connection, Pool, create_pool
+from asyncpg import create_pool
 from discord import Activity as _Activity
 from discord import ActivityType as _ActivityType
+from discord import AllowedMentions as _AllowedMentions
 from discord import Color as _Color
 from discord import Forbidden as _Forbidden
 from discord import HTTPException as _HTTPException
@@ -27,16 +31,27 @@ from .. import __version__ as version
 from ..handlers.errorhandler import XynusExceptionManager
 from ..templates.context import XynusContext
 from ..templates.embeds import ErrorEmbed
-from ..utils.functions import (decrypt, find_command_args,
-                               find_command_args_list, find_command_name,
-                               list_all_dirs, match_and_remove_prefix,
-                               search_directory)
+from ..utils.assets import SQLQuery, assets
+from ..utils.cache import Interner, ScopedCache
+from ..utils.extensions import get_requirements, load_order
+from ..utils.functions import list_all_dirs, search_directory
+from ..utils.mappings import MappingTemplate, ScopeMappings, split_invocation
+from ..utils.matchers import PrefixMatcher
+from ..utils.profiler import StartupProfiler
+from ..utils.remote_cache import RemoteCache, TieredLoader
+from .kvcache import CachedKV
 from .logger import XynusLogger as _Logger
+from .migrations import Migrator
+from .notifications import ScopeListener
+from .pool import InstrumentedPool
+from .queries import QueryRegistry
+from .registry import CommandRegistry
 from .settings import settings
+from .tickets import TicketIndex
 
 if TYPE_CHECKING:
 
-    from discord import AllowedMentions as _AllowedMentions
+    from discord import Guild as _Guild
     from discord import Intents as _Intents
     from discord import Message as _Message
     from discord.ui import View as _View
@@ -51,6 +66,32 @@ __all__: Tuple[str, ...] = (
 
 XCT = TypeVar("XCT", bound="XynusContext")
 
+# KV key holding the signature of the last synced command tree.
+TREE_SIGNATURE_KEY = "xynus.tree_signature"
+
+# KV key holding the fingerprint of the assets of the last boot.
+ASSETS_FINGERPRINT_KEY = "xynus.assets_fingerprint"
+
+# SQL files the bot can't work without, checked at boot.
+REQUIRED_QUERIES: Tuple[str, ...] = (
+    "set_ticket.sql",
+)
+
+# Compiled prefix matchers kept, the least recently used ones are dropped.
+PREFIX_MATCHERS_SIZE = 256
+
+# Shared by the scopes without mappings, it's immutable.
+_NO_MAPPINGS = ScopeMappings()
+
+
+def _encode_mappings(mappings: ScopeMappings, /) -> bytes:
+    return dumps(dict(mappings), separators=(",", ":")).encode()
+
+
+def _encode_prefixes(prefixes: Tuple[str, ...], /) -> bytes:
+    return dumps(prefixes, separators=(",", ":")).encode()
+
+
 # Custom context handling from:
 #   https://github.com/DuckBot-Discord/duck-hideout-manager-bot/blob/main/utils/bot_bases/context.py
 
@@ -67,7 +108,22 @@ class Xynus(_commands.AutoShardedBot):
         "_start_time",
         "_cmd_mapping_cache",
         "_prefix_cache",
+        "_prefix_matchers",
+        "_prefix_interner",
+        "_prefilter_stats",
+        "_warmup_task",
+        "_suggestion_cooldown",
         "_settings",
+        "command_registry",
+        "profiler",
+        "queries",
+        "scope_listener",
+        "tickets",
+        "remote_cache",
+        "_mapping_tier",
+        "_prefix_tier",
+        "_remote_tasks",
+        "_ticket_tasks",
         "db",
     )
 
@@ -76,6 +132,7 @@ class Xynus(_commands.AutoShardedBot):
             intents: "_Intents", 
             allowed_mentions: "_AllowedMentions",
             args: Sequence[str],
+            profiler: _Optional[StartupProfiler] = None,
             **options
         ) -> None:
         """
@@ -85,6 +142,8 @@ class Xynus(_commands.AutoShardedBot):
         :type intents: :class:`discord.Intents`
         :param allowed_mentions: The allowed mentions settings for the bot.
         :type allowed_mentions: :class:`discord.AllowedMentions`
+        :param profiler: The profiler timing the startup, a disabled one is used by default.
+        :type profiler: Optional[:class:`StartupProfiler`]
         :param options: Additional options to pass to the bot.
         :type options: dict
         """
@@ -99,14 +158,66 @@ class Xynus(_commands.AutoShardedBot):
         self.logger = _Logger("xynus.main", level=log_level)
 
         self.views: Dict[_View] = dict()
-        self._cmd_mapping_cache: Dict[str, Any] = dict()
-        self._prefix_cache: Dict[str, Any] = dict()
+        # Shared by every bot process, scopes missing here are read from it first.
+        self.remote_cache: _Optional[RemoteCache] = None
+        self._mapping_tier: _Optional[TieredLoader[ScopeMappings]] = None
+        self._prefix_tier: _Optional[TieredLoader[Tuple[str, ...]]] = None
+        self._remote_tasks: Set[Task] = set()
+
+        if settings.REDIS_URL:
+            self.remote_cache = RemoteCache.from_url(settings.REDIS_URL)
+            self._mapping_tier = TieredLoader(
+                self.remote_cache,
+                self._load_mappings,
+                namespace="xynus:mappings",
+                encode=_encode_mappings,
+                decode=self._decode_mappings,
+                ttl=settings.REDIS_CACHE_TTL
+            )
+            self._prefix_tier = TieredLoader(
+                self.remote_cache,
+                self._load_prefixes,
+                namespace="xynus:prefixes",
+                encode=_encode_prefixes,
+                decode=self._decode_prefixes,
+                ttl=settings.REDIS_CACHE_TTL
+            )
+
+        # Guild and user ids mapped to their mappings and prefixes.
+        # Strings are interned and prefix tuples shared between scopes,
+        # so the caches only count the containers of each scope.
+        self._cmd_mapping_cache: ScopedCache[int, ScopeMappings] = ScopedCache(
+            self._mapping_tier or self._load_mappings,
+            max_entries=settings.SCOPE_CACHE_SIZE,
+            max_bytes=settings.SCOPE_CACHE_MEMORY * 1024 * 1024 if settings.SCOPE_CACHE_MEMORY else None,
+            ttl=settings.SCOPE_CACHE_TTL,
+            sizeof=getsizeof
+        )
+        self._prefix_cache: ScopedCache[int, Tuple[str, ...]] = ScopedCache(
+            self._prefix_tier or self._load_prefixes,
+            max_entries=settings.SCOPE_CACHE_SIZE,
+            max_bytes=settings.SCOPE_CACHE_MEMORY * 1024 * 1024 if settings.SCOPE_CACHE_MEMORY else None,
+            ttl=settings.SCOPE_CACHE_TTL,
+            sizeof=getsizeof
+        )
+        self._prefix_interner: Interner = Interner()
+        self._prefix_matchers: OrderedDict[Tuple[str, ...], PrefixMatcher] = OrderedDict()
+        self._prefilter_stats: DefaultDict[int, Counter] = defaultdict(Counter)
+        self._warmup_task: _Optional[Task] = None
+        self.scope_listener: _Optional[ScopeListener] = None
+        # Refreshes of the tickets other processes changed.
+        self._ticket_tasks: Set[Task] = set()
+        self._suggestion_cooldown: _commands.CooldownMapping = _commands.CooldownMapping.from_cooldown(
+            1, settings.SUGGEST_COOLDOWN, _commands.BucketType.user
+        )
         
 
         self.error_webhook_url: _Optional[str] = settings.ERROR_WEBHOOK
         self._start_time: _Optional[_datetime] = None
         
         self._args = args
+        self.profiler: StartupProfiler = profiler or StartupProfiler(False)
+        self.command_registry: CommandRegistry = CommandRegistry(self)
         self.context_class: _Union[XynusContext, _commands.Context] = XynusContext
 
         
@@ -126,7 +237,7 @@ class Xynus(_commands.AutoShardedBot):
         """
         Called when the bot is ready.
 
-        This function changes the bot's presence, loads extensions, and syncs the command tree.
+        This function changes the bot's presence.
         """
         
         await self.change_presence(
@@ -137,31 +248,12 @@ class Xynus(_commands.AutoShardedBot):
             status=Status.idle
         )
 
-        log = getLogger("xynus.ext")
-
-        if self.cogs != {}: return log.warn("Skipped loading extensions: Reconnecting")
+        if self._start_time:
+            return # Reconnecting
 
         self.logger.info(f"Discord Client Logged in as {self.user.name}")
 
-        # Extension loading stuff
-
-        log.info("Started loading Extensions")
-    
-        for dir in list_all_dirs("./extensions"):
-            await self.load_extensions(dir)
-
-
-        log.info("Finished loading Extensions")
-
-
-        try:
-            synced = await self.tree.sync()
-            self.logger.info(f"Synced {len(synced)} command(s).")
-        except Exception as err:
-            self.logger.error("Failed to sync command tree: {}".format(err))
-
-        if not self._start_time:
-            self._start_time = _utils.utcnow()
+        self._start_time = _utils.utcnow()
     
     async def on_command_error(self, ctx: "XynusContext", error: _commands.CommandError):
         """
@@ -178,7 +270,7 @@ class Xynus(_commands.AutoShardedBot):
 
         from ..templates.views import ViewWithDeleteButton
         if isinstance(error, _commands.CommandNotFound):
-            return # type: ignore
+            return await self._suggest_commands(ctx)
 
         elif isinstance(error, _commands.MissingPermissions):
             text = "Sorry **{}**, you do not have permissions to do that!".format(ctx.message.author)
@@ -216,6 +308,47 @@ class Xynus(_commands.AutoShardedBot):
         except (_HTTPException, _Forbidden):
             pass # type: ignore
         
+    async def _suggest_commands(self, ctx: "XynusContext") -> None:
+        """|coro|
+
+        Replies with the commands closest to an unknown one, if enabled.
+
+        :param ctx: The context of the unknown command.
+        :type ctx: :class:`XynusContext`
+        """
+
+        if not self._settings.SUGGEST_COMMANDS or not ctx.invoked_with:
+            return
+
+        suggestions = self.command_registry.suggest(ctx.invoked_with, n=3)
+
+        if not suggestions:
+            return
+
+        bucket = self._suggestion_cooldown.get_bucket(ctx.message)
+
+        if bucket and bucket.update_rate_limit():
+            return
+
+        from ..templates.views import ViewWithDeleteButton
+
+        view = ViewWithDeleteButton(ctx.author)
+
+        try:
+            view.message = await ctx.reply(
+                "Did you mean {}?".format(
+                    ", ".join(
+                        f"`{ctx.clean_prefix}{command.qualified_name}`"
+                        for command in suggestions
+                    )
+                ),
+                view=view,
+                allowed_mentions=_AllowedMentions.none()
+            )
+
+        except (_HTTPException, _Forbidden):
+            pass # type: ignore
+
     async def on_error(self, event_method: str, /, *args, **kwargs):
         """
         Handles errors that occur during event processing.
@@ -238,31 +371,87 @@ class Xynus(_commands.AutoShardedBot):
 
 
 
-    async def load_extensions(self, path: str) -> None:
+    async def load_extensions(self, *paths: str) -> Dict[str, float]:
         """|coro|
 
-        Loads all extensions from a given directory path.
+        Loads all extensions from the given directory paths.
+
+        Extensions that don't require each other are loaded concurrently,
+        see :func:`bot.utils.extensions.get_requirements`.
 
-        :param path: The directory path containing extensions to load.
-        :type path: str
+        :param paths: The directory paths containing extensions to load.
+        :type paths: str
+        :return: The loaded extensions mapped to their loading time in milliseconds.
+        :rtype: Dict[str, float]
         """
 
+        log = getLogger("xynus.ext")
+        requirements: Dict[str, Tuple[str, ...]] = dict()
+
+        for extension_path in paths:
+            for extension in search_directory(extension_path):
+
+                if any(extension.endswith(ignored) for ignored in self._args.ignore):
+                    log.info("Skipped loading Extension: {}".format(extension))
+                    continue
+
+                try:
+                    requirements[extension] = get_requirements(extension)
+                except Exception as err:
+                    log.error("There was an error loading {}, Error: {}".format(extension, err))
+
+        timings: Dict[str, float] = dict()
+
+        for wave in load_order(requirements):
+            await gather(*(
+                self._load_timed_extension(extension, requirements[extension], timings)
+                for extension in wave
+            ))
+
+        return timings
+
+    async def _load_timed_extension(
+            self,
+            extension: str,
+            requires: Tuple[str, ...],
+            timings: Dict[str, float],
+            /
+    ) -> None:
+        log = getLogger("xynus.ext")
+
+        missing = [required for required in requires if required not in timings]
+
+        if missing:
+            return log.error("Skipped loading {}, missing requirements: {}".format(extension, ", ".join(missing)))
+
+        start_time = perf_counter()
 
+        try:
+            await self.load_extension(extension)
+
+        except Exception as err:
+            return log.error("There was an error loading {}, Error: {}".format(extension, err))
 
-        for extension in search_directory(path):
-            log = getLogger("xynus.ext")
+        timings[extension] = taked_time = round((perf_counter() - start_time) * 1000, 3)
+        log.info("loaded {} in {}ms".format(extension, taked_time))
 
-            if any(extension.endswith(ignored) for ignored in self._args.ignore):
-                log.info("Skipped loading Extension: {}".format(extension))
-                continue
+    async def add_cog(self, cog: _commands.Cog, /, **kwargs) -> None:
+        await super().add_cog(cog, **kwargs)
+        self.command_registry.invalidate()
 
+    async def remove_cog(self, name: str, /, **kwargs) -> _Optional[_commands.Cog]:
+        cog = await super().remove_cog(name, **kwargs)
+        self.command_registry.invalidate()
+        return cog
 
-            try:
-                await self.load_extension(extension)
-                log.info("loaded {}".format(extension))
-                
-            except Exception as err:
-                log.error("There was an error loading {}, Error: {}".format(extension, err))
+    def add_command(self, command: _commands.Command, /) -> None:
+        super().add_command(command)
+        self.command_registry.invalidate()
+
+    def remove_command(self, name: str, /) -> _Optional[_commands.Command]:
+        command = super().remove_command(name)
+        self.command_registry.invalidate()
+        return command
 
     def run(self):
         """Runs the bot.
@@ -277,7 +466,34 @@ class Xynus(_commands.AutoShardedBot):
             log_level=self.logger.level,
             root_logger=self.logger.root
         )
-    
+
+    async def close(self) -> None:
+        """|coro|
+
+        Closes the connection to Discord, the scope listener,
+        the remote cache and the database pool.
+        """
+
+        await super().close()
+
+        if self.scope_listener is not None:
+            await self.scope_listener.stop()
+
+        # Lets the pending invalidations reach the remote cache first.
+        if self._remote_tasks:
+            await gather(*self._remote_tasks, return_exceptions=True)
+
+        if self.remote_cache is not None:
+            await self.remote_cache.close()
+
+        if self._ticket_tasks:
+            await gather(*self._ticket_tasks, return_exceptions=True)
+
+        pool: _Optional[InstrumentedPool] = getattr(self, "pool", None)
+
+        if pool is not None:
+            await pool.close()
+
     async def get_prefix(self, message: Message) -> _Union[_utils.List[str], str]: # type: ignore
         """|coro|
 
@@ -300,28 +516,45 @@ class Xynus(_commands.AutoShardedBot):
             listening for.
         """
 
-        prefix = ret = self._get_cached_prefixes(message)
+        await self._load_scopes(self._prefix_cache, message)
 
-        if callable(prefix):
-            # self will be a Bot or AutoShardedBot
-            ret = await _utils.maybe_coroutine(prefix, self, message)  # type: ignore
+        return [*self._get_prefix_matcher(message).prefixes]
 
-        if not isinstance(ret, str):
-            try:
-                ret = list(ret)  # type: ignore
-            except TypeError:
-                # It's possible that a generator raised this exception.  Don't
-                # replace it with our own error if that's the case.
-                if isinstance(ret, collections.abc.Iterable):
-                    raise
 
-                raise TypeError(
-                    "command_prefix must be plain string, iterable of strings, or callable "
-                    f"returning either of these, not {ret.__class__.__name__}"
-                )
+    async def process_commands(self, message: Message, /) -> None:
+        """|coro|
+
+        Processes the commands of a message, rejecting the messages
+        that can't start with any prefix of their scope before
+        building a context for them.
+
+        :param message: The message to process commands for.
+        :type message: :class:`discord.Message`
+        """
+
+        if message.author.bot:
+            return
+
+        shard_id = message.guild.shard_id if message.guild else 0
+        stats = self._prefilter_stats[shard_id]
+
+        # Once the scopes are cached, messages are checked without awaiting
+        # anything. Missing ones are matched with the default prefixes until
+        # they are read, a message is only dropped after reading them.
+        if self._get_prefix_matcher(message).may_match(message.content):
+            await self._load_scopes(self._prefix_cache, message)
+        elif not await self._load_scopes(self._prefix_cache, message) \
+                or not self._get_prefix_matcher(message).may_match(message.content):
+            stats["filtered"] += 1
+            return
 
-        return ret
+        stats["passed"] += 1
 
+        # The mappings are only needed once a prefix may have been used.
+        await self._load_scopes(self._cmd_mapping_cache, message)
+
+        ctx = await self.get_context(message)
+        await self.invoke(ctx)
 
     async def get_context(
         self, message: "_Message", *, cls: Type[XCT] | None = None
@@ -342,55 +575,30 @@ class Xynus(_commands.AutoShardedBot):
         new_cls = cls or self.context_class
         if isinstance(message, Interaction):
             return await super().get_context(message, cls=new_cls)
-        
-        guild_cached_mapping: Dict[str, Any] = {}
-        user_cached_mapping: Dict[str, Any] = self._cmd_mapping_cache.get(message.author.id, {})
-        if message.guild:
-            guild_cached_mapping = self._cmd_mapping_cache.get(message.guild.id, {})
-
 
-        prefixes = await self.get_prefix(message)
-
-        if not prefixes:
-            return await super().get_context(message, cls=new_cls)
-        
-        prefixless_content = match_and_remove_prefix(prefixes, message.content)
-        
-        if prefixless_content:
-            command_name = find_command_name(prefixless_content)
+        # Already read by process_commands, only other callers read them here.
+        await self._load_scopes(self._prefix_cache, message)
+        await self._load_scopes(self._cmd_mapping_cache, message)
 
-            
-
-            cached_command: _Optional[str] = user_cached_mapping.get(command_name, None) \
-                or guild_cached_mapping.get(command_name, None)
-            
-            if cached_command:
-                listed_args = find_command_args_list(
-                    message.content, 
-                    prefixes, 
-                    command_name
-                )
-
-                args = find_command_args(
-                    message.content,
-                    prefixes,
-                    command_name
-                )
+        guild_cached_mapping: ScopeMappings = _NO_MAPPINGS
+        user_cached_mapping: ScopeMappings = self._cmd_mapping_cache.get(message.author.id, _NO_MAPPINGS)
+        if message.guild:
+            guild_cached_mapping = self._cmd_mapping_cache.get(message.guild.id, _NO_MAPPINGS)
 
-                kwargs = {
-                    "args": args,
-                }
 
-                for i, arg in enumerate(listed_args):
-                    kwargs[f"arg{i+1}"] = arg
+        matcher = self._get_prefix_matcher(message)
+        prefix = matcher.match(message.content)
 
-                cached_command = Template(cached_command).safe_substitute(
-                    **kwargs
-                )
+        if prefix is not None:
+            command_name, args = split_invocation(message.content[len(prefix):])
 
-                message.content = prefixes[0]+cached_command
-        
-        
+            cached_template: _Optional[MappingTemplate] = user_cached_mapping.get_template(command_name) \
+                or guild_cached_mapping.get_template(command_name)
+            
+            if cached_template:
+                # The longest prefix is always the bot mention, which can't
+                # be confused with the start of the mapped command.
+                message.content = matcher.prefixes[0] + cached_template.expand(args)
 
         return await super().get_context(message, cls=new_cls)
         
@@ -413,9 +621,21 @@ class Xynus(_commands.AutoShardedBot):
         self.exceptions: XynusExceptionManager = XynusExceptionManager(self)
 
 
+        profiler = self.profiler
+
+        with profiler.phase("assets"):
+            fingerprint = assets.load()
+            assets.require_queries(REQUIRED_QUERIES)
+            self.queries: QueryRegistry = QueryRegistry(assets)
+
+        self.logger.info(
+            f"Loaded {len(assets.emojis)} emoji(s) and {len(assets.queries)} SQL file(s), fingerprint {fingerprint[:12]}"
+        )
+
         try:
             start_time = time()
-            self.pool: Pool = await create_pool(
+
+            connect_kwargs = dict(
                 dsn=settings.DSN,
                 host=settings.HOST,
                 password=settings.PASSWORD,
@@ -424,43 +644,205 @@ class Xynus(_commands.AutoShardedBot):
                 port=settings.PORT
             )
 
+            with profiler.phase("create_pool"):
+                pool = await create_pool(
+                    **connect_kwargs,
+                    min_size=settings.POOL_MIN_SIZE,
+                    max_size=settings.POOL_MAX_SIZE,
+                    max_queries=settings.POOL_MAX_QUERIES,
+                    max_inactive_connection_lifetime=settings.POOL_MAX_INACTIVE_LIFETIME,
+                    init=self.queries.prepare
+                )
+
+                self.pool: InstrumentedPool = InstrumentedPool(
+                    pool,
+                    acquire_timeout=settings.POOL_ACQUIRE_TIMEOUT,
+                    leak_threshold=settings.POOL_LEAK_THRESHOLD,
+                    reclaim_after=settings.POOL_RECLAIM_AFTER
+                )
+
             taked_time = round((time() - start_time) * 1000 , 3)
 
-            self.db = KVDatabase(await self.pool.acquire())
-            await self.db._setup()
-            
-            with open("./schema.sql", "r") as fp:
-                schema = fp.read().strip()
-            
+            with profiler.phase("kv_setup"):
+                # The KV store keeps its connection for good.
+                self.db: CachedKV = CachedKV(
+                    KVDatabase(await self.pool.acquire(pinned=True)),
+                    ttl=settings.KV_CACHE_TTL,
+                    max_entries=settings.KV_CACHE_SIZE,
+                    remote=self.remote_cache
+                )
+                await self.db._setup()
             
-            await self.pool.execute(schema)
+            with profiler.phase("migrations"):
+                applied = await Migrator(self.pool).migrate()
 
-            
+                if applied:
+                    # Idle connections were opened before the tables changed,
+                    # reopening them prepares the queries again.
+                    await self.pool.expire_connections()
 
             log = getLogger("xynus.db")
             log.info(f"Connected to the database in {taked_time}ms")
 
-            async with self.pool.acquire() as conn:
-
-                mappings_count, prefixes_count = (
-                    await self._update_mapping_cache(conn),
-                    await self._update_prefix_cache(conn)
-                )
+            if applied:
+                log.info(f"Applied {len(applied)} migration(s).")
+            else:
+                log.debug("The database schema is up to date.")
+
+            with profiler.phase("tickets"):
+                self.tickets: TicketIndex = TicketIndex(self.pool, self.queries)
+
+                try:
+                    await self.tickets.load()
+                except Exception as err:
+                    # Whether members have an open ticket is read from the database instead.
+                    log.warning(f"Failed to index the open tickets {err}")
+
+            if settings.SCOPE_NOTIFICATIONS:
+                # Started before the warm-up, so nothing written meanwhile is missed.
+                with profiler.phase("scope_listener"):
+                    listener = ScopeListener(
+                        connect_kwargs,
+                        self._on_scope_change,
+                        ignore_pid=self.queries.has_connection
+                    )
+
+                    try:
+                        await listener.start()
+                        self.scope_listener = listener
+                    except Exception as err:
+                        log.warning(f"Failed to listen for scope changes {err}")
+
+            if await self.db.get(ASSETS_FINGERPRINT_KEY) != fingerprint:
+                log.info("Assets have changed since the last boot.")
+                await self.db.set(ASSETS_FINGERPRINT_KEY, fingerprint)
+
+            if settings.WARMUP_IN_BACKGROUND:
+                self._warmup_task = self.loop.create_task(self._warm_up_caches())
+                self._warmup_task.add_done_callback(self._on_warmup_done)
+
+                log.info("Warming up the caches in the background.")
 
-                if mappings_count:
-                    log.info(f"Cached {mappings_count!r} custom command mapping.")
-                
-                if prefixes_count:
-                    log.info(f"Cached {prefixes_count} custom prefix.")
-            
+            else:
+                with profiler.phase("cache_warmup"):
+                    await self._warm_up_caches()
 
         except Exception as err:
             self.logger.error(f"Failed to connect to the database {err}")
 
         from ..templates.views import PersistentViews
 
-        view_collection = PersistentViews(self)
-        view_collection.add_views()
+        with profiler.phase("persistent_views"):
+            view_collection = PersistentViews(self)
+            view_collection.add_views()
+
+        log = getLogger("xynus.ext")
+        log.info("Started loading Extensions")
+
+        start_time = perf_counter()
+
+        with profiler.phase("extensions"):
+            timings = await self.load_extensions(*list_all_dirs("./extensions"))
+
+        taked_time = round((perf_counter() - start_time) * 1000, 3)
+
+        log.info("Finished loading {} Extensions in {}ms".format(len(timings), taked_time))
+
+        if timings:
+            log.debug("Extension timings: {}".format(
+                ", ".join(
+                    f"{extension}={timing}ms"
+                    for extension, timing in sorted(timings.items(), key=lambda item: -item[1])
+                )
+            ))
+
+        with profiler.phase("command_registry"):
+            self.command_registry.build()
+            self.command_registry.prerender((settings.PREFIX[0], "/"))
+
+        try:
+            with profiler.phase("tree_sync"):
+                await self.sync_tree(force=self._args.force_sync)
+        except Exception as err:
+            self.logger.error("Failed to sync command tree: {}".format(err))
+
+        # Started once the boot is over, nothing it held could be reclaimed midway.
+        pool: _Optional[InstrumentedPool] = getattr(self, "pool", None)
+
+        if pool is not None:
+            pool.start_leak_detector()
+
+        if profiler.enabled:
+            report_path = profiler.dump("./data/profiles", version=version, extensions=timings)
+
+            self.logger.info(profiler.summary())
+            self.logger.info(f"Saved the startup profile to {report_path}")
+
+            imports_time = profiler.get_duration("imports")
+
+            if settings.IMPORT_BUDGET and imports_time and imports_time > settings.IMPORT_BUDGET:
+                self.logger.warning(
+                    f"Importing the bot took {imports_time}ms, over the {settings.IMPORT_BUDGET}ms budget."
+                )
+
+    def _get_tree_signature(self) -> str:
+        """Hashes the global application commands as they would be synced."""
+
+        payload = sorted(
+            (command.to_dict(self.tree) for command in self.tree.get_commands()),
+            key=lambda command: (command.get("type", 1), command["name"])
+        )
+
+        # The application ID is part of it, a different bot has its own commands.
+        return sha256(
+            dumps([self.application_id, payload], sort_keys=True, separators=(",", ":"), default=str).encode()
+        ).hexdigest()
+
+    async def sync_tree(self, *, force: bool = False) -> bool:
+        """|coro|
+
+        Syncs the command tree, unless it hasn't changed since the last sync.
+
+        The signature of the last synced tree is kept in the KV database.
+
+        :param force: Whether to sync even if the tree hasn't changed.
+        :type force: bool
+        :return: Whether the tree was synced.
+        :rtype: bool
+        """
+
+        log = getLogger("xynus.main")
+        start_time = perf_counter()
+
+        db: _Optional[KVDatabase] = getattr(self, "db", None)
+        signature = self._get_tree_signature()
+
+        if not force and db is not None and await db.get(TREE_SIGNATURE_KEY) == signature:
+            taked_time = round((perf_counter() - start_time) * 1000, 3)
+            log.info(f"Command tree is up to date, skipped syncing. (checked in {taked_time}ms)")
+            return False
+
+        synced = await self.tree.sync()
+
+        if db is not None:
+            await db.set(TREE_SIGNATURE_KEY, signature)
+
+        taked_time = round((perf_counter() - start_time) * 1000, 3)
+        log.info(f"Synced {len(synced)} command(s) in {taked_time}ms.")
+
+        return True
+
+    def _load_query(self, name: str, /) -> SQLQuery:
+        """
+        Retrives a SQL query from the asset registry.
+
+        :param name: The file name or the path relative to ``sql/``.
+        :type name: str
+        :raises AssetError: There is no such SQL file.
+        :rtype: :class:`SQLQuery`
+        """
+
+        return assets.get_query(name)
 
     def set_user_view(
             self,
@@ -488,80 +870,349 @@ class Xynus(_commands.AutoShardedBot):
 
         return _Color.from_rgb(*settings.MAIN_COLOR)
     
-    def _get_cached_prefixes(self, origin: Message, /): # type: ignore
+    def _get_prefix_matcher(self, origin: Message, /) -> PrefixMatcher:
         """
-        Retrives cached prefixes by using the origin message.
+        Retrives the precompiled prefix matcher for the origin message's scope.
+
+        Matchers are keyed by the scope's prefixes, so every guild/user
+        pair with the same prefixes shares one compiled pattern. They
+        never go stale, only the least recently used ones are dropped.
+        Scopes that aren't cached use the default prefixes, see :meth:`_load_scopes`.
         """
 
-        guild_id = origin.guild.id if origin.guild else None
-        user_id = origin.author.id
+        key = self._prefix_cache.get(origin.author.id, tuple())
 
-        guild_prefixes = self._prefix_cache.get(guild_id)
-        user_prefixes = self._prefix_cache.get(user_id)
+        if origin.guild:
+            key = self._prefix_cache.get(origin.guild.id, tuple()) + key
 
-        if not guild_prefixes and not user_prefixes:
-            return self.command_prefix
+        matcher = self._prefix_matchers.get(key)
 
-        prefixes = tuple()
-        
-        if guild_prefixes:
-            prefixes += (*guild_prefixes, )
+        if matcher is not None:
+            self._prefix_matchers.move_to_end(key)
+            return matcher
 
-        if user_prefixes:
-            prefixes += (*user_prefixes, )
-        
-        return _commands.when_mentioned_or(*prefixes)
+        prefixes = key or tuple(settings.PREFIX)
+        matcher = PrefixMatcher((*_commands.when_mentioned(self, origin), *prefixes))
+        self._prefix_matchers[key] = matcher
+
+        if len(self._prefix_matchers) > PREFIX_MATCHERS_SIZE:
+            self._prefix_matchers.popitem(last=False)
+
+        return matcher
+
+    def _cache_prefixes(self, scope_id: int, prefixes: _Optional[Tuple[str, ...]], /) -> None:
+        """
+        Writes the prefixes of a guild or user to the prefix cache.
+
+        Passing ``None`` (or no prefixes) caches the scope as having none.
+        Scopes that aren't cached are left out, they are read again when used.
+
+        :param scope_id: The guild or user id.
+        :type scope_id: int
+        :param prefixes: The new prefixes of the scope.
+        :type prefixes: Optional[Tuple[str, ...]]
+        """
+
+        self._prefix_cache.update(scope_id, self._prefix_interner.intern(tuple(prefixes)) if prefixes else None)
+        self._invalidate_remote(self._prefix_tier, scope_id)
+
+    async def get_scope_prefixes(self, scope_id: int, /) -> Tuple[str, ...]:
+        """|coro|
+
+        Returns the custom prefixes of a guild or user.
+
+        :param scope_id: The guild or user id.
+        :type scope_id: int
+        :rtype: Tuple[str, ...]
+        """
+
+        return await self._prefix_cache.fetch(scope_id) or tuple()
+
+    async def get_mappings(self, scope_id: int, /) -> ScopeMappings:
+        """|coro|
+
+        Returns the command mappings of a guild or user.
+
+        Mappings are read-only, use :meth:`_cache_mapping`
+        and :meth:`_cache_mappings` to change them.
+
+        :param scope_id: The guild or user id.
+        :type scope_id: int
+        :return: The triggers mapped to their commands.
+        :rtype: :class:`ScopeMappings`
+        """
+
+        return await self._cmd_mapping_cache.fetch(scope_id) or _NO_MAPPINGS
+
+    def _cache_mapping(self, scope_id: int, trigger: str, command: _Optional[str], /) -> None:
+        """
+        Writes a single mapping of a guild or user to the mapping cache.
+
+        :param scope_id: The guild or user id.
+        :type scope_id: int
+        :param trigger: The trigger of the mapping.
+        :type trigger: str
+        :param command: The mapped command, ``None`` to remove the mapping.
+        :type command: Optional[str]
+        """
+
+        self._invalidate_remote(self._mapping_tier, scope_id)
 
+        if scope_id not in self._cmd_mapping_cache:
+            return
 
+        mappings = self._cmd_mapping_cache.get(scope_id, _NO_MAPPINGS).replace(trigger, command)
+        self._cmd_mapping_cache.set(scope_id, mappings or None)
 
-    async def _update_prefix_cache(self, conn: Connection, /) -> int:
+    def _cache_mappings(self, scope_id: int, mappings: _Optional[Dict[str, str]], /) -> None:
+        """
+        Writes every mapping of a guild or user to the mapping cache.
+
+        :param scope_id: The guild or user id.
+        :type scope_id: int
+        :param mappings: The triggers mapped to their commands, ``None`` if there are none.
+        :type mappings: Optional[Dict[str, str]]
+        """
+
+        self._cmd_mapping_cache.update(scope_id, ScopeMappings(mappings) if mappings else None)
+        self._invalidate_remote(self._mapping_tier, scope_id)
+
+    def _invalidate_remote(self, tier: _Optional[TieredLoader], scope_id: int, /) -> None:
+        # Called once the change is committed, other processes read it from the database.
+        if tier is None:
+            return
+
+        task = self.loop.create_task(tier.invalidate((scope_id,)))
+        self._remote_tasks.add(task)
+        task.add_done_callback(self._remote_tasks.discard)
+
+    async def _load_scopes(self, cache: ScopedCache, message: Message, /) -> bool:
+        """|coro|
+
+        Makes sure the message's author and guild are in a scope
+        cache, reading only the missing ones.
+
+        :param cache: The prefix or mapping cache.
+        :type cache: :class:`ScopedCache`
+        :param message: The message to read the scopes of.
+        :type message: :class:`discord.Message`
+        :return: Whether any scope was missing.
+        :rtype: bool
+        """
+
+        scope_ids = [
+            scope_id
+            for scope_id in (message.author.id, message.guild.id if message.guild else None)
+            if scope_id is not None and scope_id not in cache
+        ]
+
+        if not scope_ids:
+            return False
+
+        try:
+            await cache.fetch_many(scope_ids)
+        except Exception as err:
+            getLogger("xynus.db").warning(f"Failed to load scopes {scope_ids}: {err}")
+
+        return True
+
+    def _intern_prefixes(self, prefixes: List[str], /) -> Tuple[str, ...]:
+        return self._prefix_interner.intern(tuple(prefixes))
+
+    def _decode_prefixes(self, value: bytes, /) -> Tuple[str, ...]:
+        return self._intern_prefixes(loads(value))
+
+    def _decode_mappings(self, value: bytes, /) -> ScopeMappings:
+        return ScopeMappings(loads(value))
+
+    async def _load_prefixes(self, scope_ids: List[int], /) -> Dict[int, Tuple[str, ...]]:
+        if getattr(self, "pool", None) is None:
+            return {}
+
+        async with self.pool.acquire() as conn:
+            records = await self.queries.fetch(conn, "prefixes/get_scope_prefixes", scope_ids)
+
+        return {
+            record["guild_id"] or record["user_id"]: self._intern_prefixes(record["prefixes"])
+            for record in records
+        }
+
+    async def _load_mappings(self, scope_ids: List[int], /) -> Dict[int, ScopeMappings]:
+        if getattr(self, "pool", None) is None:
+            return {}
+
+        async with self.pool.acquire() as conn:
+            records = await self.queries.fetch(conn, "mappings/get_scope_mappings", scope_ids)
+
+        mappings: Dict[int, Dict[str, str]] = {}
+
+        for record in records:
+            mappings.setdefault(record["guild_id"] or record["user_id"], {})[record["trigger"]] = record["command"]
+
+        return {scope_id: ScopeMappings(scope_mappings) for scope_id, scope_mappings in mappings.items()}
+
+    def _on_scope_change(self, kind: str, scope_id: _Optional[int], /) -> None:
+        if kind == "tickets":
+            # The open tickets are answered from memory, they are read again right away.
+            task = self.loop.create_task(self.tickets.refresh(scope_id))
+            self._ticket_tasks.add(task)
+            task.add_done_callback(self._on_ticket_refreshed)
+            return
+
+        # Another process changed the scope, it's read again on its next use.
+        if kind == "prefixes":
+            cache, tier = self._prefix_cache, self._prefix_tier
+        elif kind == "mappings":
+            cache, tier = self._cmd_mapping_cache, self._mapping_tier
+        else:
+            return
+
+        if scope_id is None:
+            cache.clear()
+        else:
+            cache.discard(scope_id)
+            # Also drops what a process may have read before the change was committed.
+            self._invalidate_remote(tier, scope_id)
+
+    def _on_ticket_refreshed(self, task: Task, /) -> None:
+        self._ticket_tasks.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            getLogger("xynus.db").warning(f"Failed to refresh a ticket {task.exception()}")
+
+    async def on_guild_remove(self, guild: "_Guild", /) -> None:
+        """Drops the cached settings of a guild the bot was removed from."""
+
+        self._prefix_cache.discard(guild.id)
+        self._cmd_mapping_cache.discard(guild.id)
+
+    async def _warm_up_caches(self) -> Tuple[int, int]:
+        """|coro|
+
+        Fills the prefix and mapping caches by streaming
+        both tables at the same time.
+
+        With :attr:`remote_cache`, the caches are filled from it instead
+        if another process published every scope there, otherwise the
+        scopes read from the database are published for the next ones.
+
+        :return: The amount of cached mappings and prefixes, or of
+            cached scopes when they were read from the remote cache.
+        :rtype: Tuple[int, int]
+        """
+
+        log = getLogger("xynus.db")
+        start_time = perf_counter()
+
+        if self.remote_cache is not None:
+            counts = await gather(
+                self._mapping_tier.warm_up(self._cmd_mapping_cache, batch_size=settings.WARMUP_BATCH_SIZE),
+                self._prefix_tier.warm_up(self._prefix_cache, batch_size=settings.WARMUP_BATCH_SIZE)
+            )
+
+            if None not in counts:
+                taked_time = round((perf_counter() - start_time) * 1000, 3)
+                log.info(
+                    f"Cached the mappings of {counts[0]} scope(s) and the prefixes "
+                    f"of {counts[1]} scope(s) from the remote cache in {taked_time}ms."
+                )
+
+                return counts
+
+        mappings_count, prefixes_count = await gather(
+            self._update_mapping_cache(),
+            self._update_prefix_cache()
+        )
+
+        if self.remote_cache is not None:
+            await gather(
+                self._mapping_tier.publish(self._cmd_mapping_cache, batch_size=settings.WARMUP_BATCH_SIZE),
+                self._prefix_tier.publish(self._prefix_cache, batch_size=settings.WARMUP_BATCH_SIZE)
+            )
+
+        elapsed = perf_counter() - start_time
+        taked_time = round(elapsed * 1000, 3)
+        rows_per_second = round((mappings_count + prefixes_count) / elapsed) if elapsed else 0
+
+        log.info(
+            f"Cached {mappings_count} custom command mapping(s) and {prefixes_count} "
+            f"custom prefix(es) in {taked_time}ms ({rows_per_second} rows/s)."
+        )
+
+        return mappings_count, prefixes_count
+
+    def _on_warmup_done(self, task: Task, /) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Failed to warm up the caches {task.exception()}")
+
+    async def _update_prefix_cache(self) -> int:
         """|coro|
         Updates prefix cache from the old data stored in database.
 
+        Scopes that were already read on their own are left as they are.
+
         :return: Cached records count.
         :rtype: int
         """
 
-        query = """
-        SELECT * FROM prefixes;
-        """
+        count = 0
 
-        records = await conn.fetch(query)
-        
-        for record in records:
-            key = record["guild_id"] or record["user_id"]
-            prefixes = map(lambda r: decrypt(r), record["prefixes"])
-            self._prefix_cache[key] = tuple(prefixes)
-        
-        return len(records)
+        # Streams for as long as the table takes, it's never reclaimed.
+        async with self.pool.acquire(pinned=True) as conn, conn.transaction():
+            async for records in self.queries.stream(
+                conn,
+                "prefixes/get_all_prefixes",
+                batch_size=settings.WARMUP_BATCH_SIZE
+            ):
+                for record in records:
+                    key = record["guild_id"] or record["user_id"]
 
-            
+                    if key not in self._prefix_cache:
+                        self._prefix_cache.set(key, self._intern_prefixes(record["prefixes"]))
+
+                count += len(records)
 
+        return count
 
-    async def _update_mapping_cache(self, conn: Connection, /) -> int:
+    async def _update_mapping_cache(self) -> int:
         """|coro|
         Updates mapping cache from the old data stored in database.
 
+        Rows come ordered by scope, so each scope is cached as soon as
+        its last mapping is read. Scopes that were already read on their
+        own are left as they are.
+
         :return: Cached records count.
         :rtype: int
         """
-        query = """
-        SELECT * FROM mappings;
-        """
 
-        records = await conn.fetch(query)
+        count = 0
+        scope_id: _Optional[int] = None
+        mappings: _Optional[Dict[str, str]] = None
 
-        for record in records:
-            trigger = decrypt(record["trigger"])
-            command = decrypt(record["command"])
-
-            key = record["guild_id"] or record["user_id"]
-            self.db._traverse_dict(
-                self._cmd_mapping_cache,
-                create_missing=True,
-                keys=[key, trigger]
-            )
-            
-            self._cmd_mapping_cache[key][trigger] = command
+        # Streams for as long as the table takes, it's never reclaimed.
+        async with self.pool.acquire(pinned=True) as conn, conn.transaction():
+            async for records in self.queries.stream(
+                conn,
+                "mappings/get_all_mappings",
+                batch_size=settings.WARMUP_BATCH_SIZE
+            ):
+                for record in records:
+                    key = record["guild_id"] or record["user_id"]
+
+                    if key != scope_id:
+                        if mappings:
+                            self._cmd_mapping_cache.set(scope_id, ScopeMappings(mappings))
+
+                        scope_id = key
+                        mappings = {} if key not in self._cmd_mapping_cache else None
+
+                    if mappings is not None:
+                        mappings[record["trigger"]] = record["command"]
+
+                count += len(records)
+
+        if mappings:
+            self._cmd_mapping_cache.set(scope_id, ScopeMappings(mappings))
 
-        return len(records)
+        return count
@@ -0,0 +1,289 @@
+from collections import OrderedDict
+from json import dumps, loads
+from logging import getLogger
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from kv.kvpostgres import KVDatabase
+
+from ..utils.remote_cache import RemoteCache
+
+__all__: Tuple[str, ...] = (
+    "CachedKV",
+)
+
+T = TypeVar("T")
+
+# Stored for the keys that have no value, so they aren't read again.
+_MISSING = object()
+
+# Stored in the remote cache for the keys that have no value.
+_REMOTE_MISSING = b""
+
+
+class _Entry:
+    __slots__: Tuple[str, ...] = (
+        "value",
+        "expires_at",
+        "parsed",
+    )
+
+    def __init__(self, value: Any, expires_at: float) -> None:
+        self.value: Any = value
+        self.expires_at: float = expires_at
+        # Parser: what it returned for the value.
+        self.parsed: Dict[Callable[[Any], Any], Any] = {}
+
+
+class CachedKV:
+    """A read-through cache in front of :class:`KVDatabase`.
+
+    Values are read from the database once and kept for ``ttl`` seconds.
+    Writes through :meth:`set` drop the written key together with the
+    keys above and below it (e.g. ``1.settings`` and ``1.settings.tickets.a``
+    for ``1.settings.tickets``). Writes made by something else than the
+    bot show up once the keys expire.
+
+    :meth:`get_parsed` also keeps what a parser made of a value, so
+    decoding and compiling it happens once per read from the database.
+    Cached values are shared, they must not be changed in place.
+
+    With a ``remote`` cache, keys missing here are read from it before
+    the database, and kept there ``ttl`` seconds too. Writes through
+    :meth:`set` drop the affected keys from it as well.
+
+    Everything else is passed through to the wrapped database.
+    """
+
+    __slots__: Tuple[str, ...] = (
+        "db",
+        "ttl",
+        "max_entries",
+        "remote",
+        "namespace",
+        "hits",
+        "misses",
+        "_entries",
+        "_generation",
+        "_failing",
+    )
+
+    def __init__(
+            self,
+            db: KVDatabase,
+            /,
+            *,
+            ttl: Optional[float] = None,
+            max_entries: Optional[int] = None,
+            remote: Optional[RemoteCache] = None,
+            namespace: str = "xynus:kv"
+    ) -> None:
+        """
+        :param db: The database to cache.
+        :type db: :class:`KVDatabase`
+        :param ttl: How many seconds a value stays cached.
+        :type ttl: Optional[float]
+        :param max_entries: The maximum amount of cached keys.
+        :type max_entries: Optional[int]
+        :param remote: The cache shared by every bot process, if any.
+        :type remote: Optional[:class:`RemoteCache`]
+        :param namespace: Prefixed to the keys in the remote cache.
+        :type namespace: str
+        """
+
+        self.db: KVDatabase = db
+        self.ttl: Optional[float] = ttl
+        self.max_entries: Optional[int] = max_entries
+        self.remote: Optional[RemoteCache] = remote
+        self.namespace: str = namespace
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Bumped by every invalidation, reads that started before it aren't cached.
+        self._generation: int = 0
+        self._failing: bool = False
+
+    def _lookup(self, key: str, /) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        if entry.expires_at <= monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    async def _fetch(self, key: str, /) -> _Entry:
+        entry = self._lookup(key)
+
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+
+        generation = self._generation
+        value = await self._read(key)
+
+        entry = _Entry(
+            _MISSING if value is None else value,
+            monotonic() + self.ttl if self.ttl is not None else float("inf")
+        )
+
+        # Written meanwhile, what was read may predate the write.
+        if generation == self._generation:
+            self._entries[key] = entry
+
+            if self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return entry
+
+    def _remote_key(self, key: str, /) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _on_error(self, action: str, err: Exception, /) -> None:
+        self.remote.errors += 1
+
+        # Logged once until the cache works again.
+        if not self._failing:
+            self._failing = True
+            getLogger("xynus.cache").warning(f"Failed to {action} the remote cache {err}")
+
+    async def _read(self, key: str, /) -> Any:
+        if self.remote is None:
+            return await self.db.get(key)
+
+        try:
+            raw = (await self.remote.get_many([self._remote_key(key)]))[0]
+            self._failing = False
+        except Exception as err:
+            self._on_error("read", err)
+            return await self.db.get(key)
+
+        if raw is not None:
+            self.remote.hits += 1
+            return None if raw == _REMOTE_MISSING else loads(raw)
+
+        self.remote.misses += 1
+        value = await self.db.get(key)
+
+        try:
+            await self.remote.set_many(
+                {self._remote_key(key): _REMOTE_MISSING if value is None else dumps(value).encode()},
+                ttl=self.ttl
+            )
+            self.remote.writes += 1
+        except Exception as err:
+            self._on_error("write", err)
+
+        return value
+
+    async def _invalidate_remote(self, key: str, /) -> None:
+        # The key, the keys above it and the ones below it, like :meth:`invalidate`.
+        parts = key.split(".")
+        keys: List[str] = [self._remote_key(".".join(parts[:i])) for i in range(1, len(parts) + 1)]
+
+        try:
+            async for batch in self.remote.scan(self._remote_key(key) + ".*"):
+                keys.extend(batch)
+
+            await self.remote.delete_many(keys)
+        except Exception as err:
+            self._on_error("invalidate", err)
+
+    async def get(self, key: str, /) -> Any:
+        """|coro|
+
+        Returns the value of a key, reading it if it isn't cached.
+
+        :param key: The key, its parts separated by dots.
+        :type key: str
+        :return: The value, ``None`` if the key has none.
+        """
+
+        value = (await self._fetch(key)).value
+        return None if value is _MISSING else value
+
+    async def get_parsed(self, key: str, parser: Callable[[Any], T], /) -> Optional[T]:
+        """|coro|
+
+        Returns what ``parser`` makes of the value of a key,
+        parsing it only once while the value is cached.
+
+        :param key: The key, its parts separated by dots.
+        :type key: str
+        :param parser: Turns the value into something else, e.g. a decoded object.
+        :type parser: Callable[[Any], T]
+        :return: The parsed value, ``None`` if the key has none.
+        :rtype: Optional[T]
+        """
+
+        entry = await self._fetch(key)
+
+        if entry.value is _MISSING:
+            return None
+
+        parsed = entry.parsed.get(parser, _MISSING)
+
+        if parsed is _MISSING:
+            parsed = entry.parsed[parser] = parser(entry.value)
+
+        return parsed
+
+    async def set(self, key: str, value: Any, /) -> None:
+        """|coro|
+
+        Writes the value of a key and drops the cached keys it affects.
+
+        :param key: The key, its parts separated by dots.
+        :type key: str
+        :param value: The new value.
+        :type value: Any
+        """
+
+        try:
+            await self.db.set(key, value)
+        finally:
+            self.invalidate(key)
+
+            if self.remote is not None:
+                await self._invalidate_remote(key)
+
+    def invalidate(self, key: Optional[str] = None, /) -> None:
+        """Drops a key, the keys above and below it from the cache of this process.
+
+        :param key: The changed key, every key when omitted.
+        :type key: Optional[str]
+        """
+
+        self._generation += 1
+
+        if key is None:
+            self._entries.clear()
+            return
+
+        for cached in list(self._entries):
+            if cached == key or cached.startswith(key + ".") or key.startswith(cached + "."):
+                del self._entries[cached]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of reads that didn't need the database."""
+
+        reads = self.hits + self.misses
+        return self.hits / reads if reads else 0.0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.db, name)
+
+    def __repr__(self) -> str:
+        return f"<CachedKV entries={len(self._entries)} hits={self.hits} misses={self.misses}>"
@@ -0,0 +1,241 @@
+from hashlib import sha256
+from logging import getLogger
+from os import listdir, path
+from re import compile as _compile
+from time import perf_counter, time
+from typing import Dict, List, Optional, Tuple
+
+from asyncpg import Connection
+from asyncpg.exceptions import UndefinedTableError
+
+from .pool import InstrumentedPool
+
+__all__: Tuple[str, ...] = (
+    "Migration",
+    "Migrator",
+)
+
+# Migration files are named like 0001_initial.sql or 0002_plain_text.py.
+MIGRATION_PATTERN = _compile(r"^(\d+)_(\w+)\.(sql|py)$")
+
+# Held while migrating, so only one process applies the migrations.
+ADVISORY_LOCK_KEY = 0x78796E7573  # "xynus"
+
+
+class Migration:
+    """A single schema change, read from ``migrations/``.
+
+    SQL files are executed as they are. Python files are for changes SQL
+    can't express well (e.g. rewriting rows in batches), they define an
+    ``async def upgrade(conn)`` that gets the migrating connection. Both
+    run inside the transaction :class:`Migrator` opens for the migration,
+    batches don't commit on their own.
+    """
+
+    __slots__: Tuple[str, ...] = (
+        "version",
+        "name",
+        "path",
+        "source",
+        "checksum",
+    )
+
+    def __init__(self, version: int, name: str, path: str, source: str) -> None:
+        """
+        :param version: The order of the migration, taken from the file name.
+        :type version: int
+        :param name: The name of the migration.
+        :type name: str
+        :param path: The path of the migration file.
+        :type path: str
+        :param source: The content of the migration file.
+        :type source: str
+        """
+
+        self.version: int = version
+        self.name: str = name
+        self.path: str = path
+        self.source: str = source
+        self.checksum: str = sha256(source.encode()).hexdigest()
+
+    async def apply(self, conn: Connection, /) -> None:
+        """|coro|
+
+        Runs the migration, the caller takes care of the transaction.
+
+        :param conn: The connection to run the migration on.
+        :type conn: :class:`asyncpg.Connection`
+        :raises ValueError: A Python migration has no ``upgrade`` function.
+        """
+
+        if not self.path.endswith(".py"):
+            await conn.execute(self.source)
+            return
+
+        namespace = {"__name__": f"migrations.{self.name}", "__file__": self.path}
+        exec(compile(self.source, self.path, "exec"), namespace)
+
+        upgrade = namespace.get("upgrade")
+
+        if upgrade is None:
+            raise ValueError(f"Migration {self.path} has no upgrade function")
+
+        await upgrade(conn)
+
+    def __repr__(self) -> str:
+        return f"<Migration version={self.version} name={self.name!r}>"
+
+
+class Migrator:
+    """Applies the pending migrations of ``migrations/`` in order.
+
+    Applied versions are kept in the ``schema_migrations`` table, every
+    migration runs in its own transaction together with its bookkeeping.
+    When nothing is pending, :meth:`migrate` only reads that table,
+    in a single query.
+    """
+
+    __slots__: Tuple[str, ...] = (
+        "pool",
+        "directory",
+        "_migrations",
+    )
+
+    def __init__(self, pool: InstrumentedPool, directory: str = "./migrations") -> None:
+        """
+        :param pool: The pool to migrate the database of.
+        :type pool: :class:`InstrumentedPool`
+        :param directory: The directory containing the migration files.
+        :type directory: str
+        """
+
+        self.pool: InstrumentedPool = pool
+        self.directory: str = directory
+        self._migrations: Optional[List[Migration]] = None
+
+    @property
+    def migrations(self) -> List[Migration]:
+        """Every migration file, ordered by version."""
+
+        if self._migrations is None:
+            self._migrations = self._discover()
+
+        return self._migrations
+
+    def _discover(self) -> List[Migration]:
+        migrations = {}
+
+        for filename in listdir(self.directory):
+            match = MIGRATION_PATTERN.match(filename)
+
+            if match is None:
+                continue
+
+            version = int(match.group(1))
+
+            if version in migrations:
+                raise ValueError(
+                    f"Migration {filename} uses the version of {migrations[version].name}"
+                )
+
+            file_path = path.join(self.directory, filename)
+
+            with open(file_path, "r", encoding="utf-8") as fp:
+                migrations[version] = Migration(version, match.group(2), file_path, fp.read().strip())
+
+        return [migrations[version] for version in sorted(migrations)]
+
+    async def get_applied(self, conn: Connection, /) -> Dict[int, str]:
+        """|coro|
+
+        Returns the versions of the applied migrations mapped to their checksums.
+
+        :param conn: The connection to read them with.
+        :type conn: :class:`asyncpg.Connection`
+        :rtype: Dict[int, str]
+        """
+
+        try:
+            records = await conn.fetch("SELECT version, checksum FROM schema_migrations;")
+        except UndefinedTableError:
+            return {}
+
+        return {record["version"]: record["checksum"] for record in records}
+
+    def _get_pending(self, applied: Dict[int, str], /) -> List[Migration]:
+        log = getLogger("xynus.db")
+        pending = []
+
+        for migration in self.migrations:
+            checksum = applied.get(migration.version)
+
+            if checksum is None:
+                pending.append(migration)
+            elif checksum != migration.checksum:
+                log.warning(
+                    f"Migration {migration.version:04d}_{migration.name} changed after it was applied."
+                )
+
+        return pending
+
+    async def migrate(self) -> List[Migration]:
+        """|coro|
+
+        Applies the pending migrations.
+
+        :raises asyncpg.PostgresError: A migration failed, it was rolled back
+            and the ones after it weren't applied.
+        :return: The applied migrations.
+        :rtype: List[:class:`Migration`]
+        """
+
+        log = getLogger("xynus.db")
+
+        # Migrations can take long, their connection is never reclaimed.
+        async with self.pool.acquire(pinned=True) as conn:
+            if not self._get_pending(await self.get_applied(conn)):
+                return []
+
+            await conn.execute("SELECT pg_advisory_lock($1);", ADVISORY_LOCK_KEY)
+
+            try:
+                await conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS schema_migrations(
+                        version INTEGER PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        checksum TEXT NOT NULL,
+                        applied_at BIGINT NOT NULL
+                    );
+                    """
+                )
+
+                # Another process may have migrated while we waited for the lock.
+                pending = self._get_pending(await self.get_applied(conn))
+
+                for migration in pending:
+                    start_time = perf_counter()
+
+                    async with conn.transaction():
+                        await migration.apply(conn)
+                        await conn.execute(
+                            """
+                            INSERT INTO schema_migrations(version, name, checksum, applied_at)
+                            VALUES ($1, $2, $3, $4);
+                            """,
+                            migration.version,
+                            migration.name,
+                            migration.checksum,
+                            int(time())
+                        )
+
+                    taked_time = round((perf_counter() - start_time) * 1000, 3)
+                    log.info(f"Applied migration {migration.version:04d}_{migration.name} in {taked_time}ms")
+
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock($1);", ADVISORY_LOCK_KEY)
+
+        return pending
+
+    def __repr__(self) -> str:
+        return f"<Migrator directory={self.directory!r}>"
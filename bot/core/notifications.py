@@ -0,0 +1,200 @@
+from asyncio import (Event, Task, TimeoutError, get_running_loop, sleep,
+                     wait_for)
+from logging import getLogger
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from asyncpg import Connection, connect
+
+__all__: Tuple[str, ...] = (
+    "ScopeListener",
+)
+
+# The channel written to by the triggers of migrations/0004_scope_notifications.sql
+# and migrations/0005_ticket_notifications.sql.
+CHANNEL = "xynus_scopes"
+
+# Seconds between two checks of the listening connection.
+HEARTBEAT_INTERVAL = 30.0
+
+# Past this many missed changes, the caches are cleared instead.
+RESYNC_LIMIT = 10000
+
+# Versions are taken before their transaction commits, so a change can
+# commit after a later one was seen. On reconnect, this many versions
+# below the latest one seen are replayed too.
+RESYNC_WINDOW = 1000
+
+
+class ScopeListener:
+    """Listens for the changes of the mappings, prefixes and tickets of every process.
+
+    Uses a connection of its own, outside the pool, since pooled ones
+    stop listening once they're released. ``on_change`` gets the changed
+    table and scope (the channel, for tickets), or ``None`` as the scope
+    when everything has to be read again. When the connection is lost,
+    the listener reconnects and replays the changes it missed from the
+    ``scope_versions`` table.
+    """
+
+    __slots__: Tuple[str, ...] = (
+        "connect_kwargs",
+        "on_change",
+        "ignore_pid",
+        "version",
+        "notifications",
+        "reconnects",
+        "_connection",
+        "_lost",
+        "_task",
+    )
+
+    def __init__(
+            self,
+            connect_kwargs: Dict[str, Any],
+            on_change: Callable[[str, Optional[int]], None],
+            /,
+            *,
+            ignore_pid: Optional[Callable[[int], bool]] = None
+    ) -> None:
+        """
+        :param connect_kwargs: The arguments of :func:`asyncpg.connect`.
+        :type connect_kwargs: Dict[str, Any]
+        :param on_change: Called with the table and the scope that changed.
+        :type on_change: Callable[[str, Optional[int]], None]
+        :param ignore_pid: Whether the changes of a server process were already applied,
+            e.g. because they were made by this bot.
+        :type ignore_pid: Optional[Callable[[int], bool]]
+        """
+
+        self.connect_kwargs: Dict[str, Any] = connect_kwargs
+        self.on_change: Callable[[str, Optional[int]], None] = on_change
+        self.ignore_pid: Optional[Callable[[int], bool]] = ignore_pid
+
+        # The latest change seen.
+        self.version: Optional[int] = None
+        self.notifications: int = 0
+        self.reconnects: int = 0
+
+        self._connection: Optional[Connection] = None
+        self._lost: Event = Event()
+        self._task: Optional[Task] = None
+
+    async def start(self) -> None:
+        """|coro|
+
+        Starts listening, and reconnecting when the connection is lost.
+        """
+
+        await self._connect()
+        self._task = get_running_loop().create_task(self._keep_alive())
+
+    async def stop(self) -> None:
+        """|coro|
+
+        Stops listening and closes the connection.
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def _connect(self) -> None:
+        connection = await connect(**self.connect_kwargs)
+
+        try:
+            connection.add_termination_listener(self._on_terminated)
+
+            await connection.add_listener(CHANNEL, self._on_notification)
+
+            # Read after listening, so nothing falls in between.
+            version = await connection.fetchval("SELECT COALESCE(MAX(version), 0) FROM scope_versions;")
+
+            if self.version is not None:
+                await self._resync(connection, max(self.version - RESYNC_WINDOW, 0))
+
+        except BaseException:
+            # Otherwise every failed attempt of the reconnect loop leaks one.
+            connection.terminate()
+            raise
+
+        self.version = max(self.version or 0, version)
+
+        self._connection = connection
+        self._lost.clear()
+
+    def _on_terminated(self, connection: Connection) -> None:
+        # Replaced connections are closed on purpose.
+        if connection is self._connection:
+            self._lost.set()
+
+    async def _resync(self, connection: Connection, since: int, /) -> None:
+        log = getLogger("xynus.db")
+
+        records = await connection.fetch(
+            "SELECT scope_id, kind FROM scope_versions WHERE version > $1 ORDER BY version LIMIT $2;",
+            since,
+            RESYNC_LIMIT + 1
+        )
+
+        if len(records) > RESYNC_LIMIT:
+            log.warning("Missed too many scope changes, clearing the caches.")
+
+            for kind in ("mappings", "prefixes", "tickets"):
+                self.on_change(kind, None)
+
+            return
+
+        for record in records:
+            self.on_change(record["kind"], record["scope_id"])
+
+        log.info(f"Applied {len(records)} scope change(s) missed while disconnected.")
+
+    def _on_notification(self, connection: Connection, pid: int, channel: str, payload: str) -> None:
+        self.notifications += 1
+
+        kind, scope_id, version = payload.split(":")
+        self.version = max(self.version or 0, int(version))
+
+        if self.ignore_pid is not None and self.ignore_pid(pid):
+            return
+
+        self.on_change(kind, int(scope_id))
+
+    async def _keep_alive(self) -> None:
+        log = getLogger("xynus.db")
+
+        while True:
+            try:
+                await wait_for(self._lost.wait(), HEARTBEAT_INTERVAL)
+            except TimeoutError:
+                try:
+                    await self._connection.execute("SELECT 1;")
+                    continue
+                except Exception:
+                    pass
+
+            log.warning("Lost the connection listening for scope changes, reconnecting.")
+
+            if not self._connection.is_closed():
+                self._connection.terminate()
+
+            delay = 1.0
+
+            while True:
+                try:
+                    await self._connect()
+                    break
+                except Exception as err:
+                    log.warning(f"Failed to reconnect the scope listener {err}, retrying in {delay}s")
+
+                    await sleep(delay)
+                    delay = min(delay * 2, 60.0)
+
+            self.reconnects += 1
+
+    def __repr__(self) -> str:
+        return f"<ScopeListener version={self.version} notifications={self.notifications} reconnects={self.reconnects}>"
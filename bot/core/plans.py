@@ -0,0 +1,403 @@
+from argparse import ArgumentParser
+from asyncio import run
+from json import loads
+from logging import basicConfig, getLogger
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from asyncpg import Connection, PostgresError, create_pool
+
+from ..utils.assets import assets
+from .migrations import Migrator
+from .pool import InstrumentedPool
+from .queries import QueryRegistry
+
+__all__: Tuple[str, ...] = (
+    "FULL_SCAN_QUERIES",
+    "PlanChecker",
+    "PlanReport",
+    "seed_database",
+)
+
+# Queries reading whole tables on purpose, e.g. to warm up the caches.
+FULL_SCAN_QUERIES: Tuple[str, ...] = (
+    "mappings/get_all_mappings",
+    "prefixes/get_all_prefixes",
+)
+
+# Used for the parameters of the explained queries, by Postgres type.
+SAMPLE_VALUES: Dict[str, Any] = {
+    "int2": 1,
+    "int4": 1,
+    "int8": 1,
+    "bool": True,
+    "text": "trigger1",
+    "varchar": "trigger1",
+    "_int4": [1],
+    "_int8": [1, 2],
+    "_text": ["trigger1"],
+}
+
+
+class PlanReport:
+    """The plan of a query and what's wrong with it."""
+
+    __slots__: Tuple[str, ...] = (
+        "name",
+        "plan",
+        "seq_scans",
+        "execution_time",
+        "error",
+        "over_budget",
+    )
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.plan: Optional[Dict[str, Any]] = None
+        self.seq_scans: List[str] = []
+        # In milliseconds, only known with ANALYZE.
+        self.execution_time: Optional[float] = None
+        self.error: Optional[str] = None
+        self.over_budget: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.seq_scans and not self.over_budget
+
+    @property
+    def problems(self) -> List[str]:
+        """What's wrong with the plan, in words."""
+
+        problems = []
+
+        if self.error is not None:
+            problems.append(f"failed: {self.error}")
+
+        if self.seq_scans:
+            problems.append("sequential scan on {}".format(", ".join(self.seq_scans)))
+
+        if self.over_budget:
+            problems.append(f"took {self.execution_time}ms")
+
+        return problems
+
+    def __repr__(self) -> str:
+        return f"<PlanReport name={self.name!r} ok={self.ok} execution_time={self.execution_time}>"
+
+
+class _Rollback(Exception):
+    pass
+
+
+class PlanChecker:
+    """Explains the named queries and flags the ones that don't use an index.
+
+    A sequential scan is only flagged on tables with more than ``min_rows``
+    rows, Postgres rightly prefers them on small tables. With ``analyze``
+    the queries are run for real, in a transaction that is rolled back,
+    and the ones slower than ``budget`` milliseconds are flagged too.
+    """
+
+    __slots__: Tuple[str, ...] = (
+        "queries",
+        "budget",
+        "min_rows",
+        "full_scans",
+    )
+
+    def __init__(
+            self,
+            queries: QueryRegistry,
+            *,
+            budget: float = 50.0,
+            min_rows: int = 10000,
+            full_scans: Iterable[str] = FULL_SCAN_QUERIES
+    ) -> None:
+        """
+        :param queries: The queries to check.
+        :type queries: :class:`QueryRegistry`
+        :param budget: How many milliseconds a query may take with ``analyze``.
+        :type budget: float
+        :param min_rows: The size from which a table shouldn't be scanned anymore.
+        :type min_rows: int
+        :param full_scans: The queries allowed to scan whole tables.
+        :type full_scans: Iterable[str]
+        """
+
+        self.queries: QueryRegistry = queries
+        self.budget: float = budget
+        self.min_rows: int = min_rows
+        self.full_scans: Tuple[str, ...] = tuple(full_scans)
+
+    async def _get_table_sizes(self, conn: Connection, /) -> Dict[str, float]:
+        records = await conn.fetch(
+            "SELECT relname, reltuples FROM pg_class WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace;"
+        )
+
+        return {record["relname"]: record["reltuples"] for record in records}
+
+    def _find_seq_scans(self, node: Dict[str, Any], sizes: Dict[str, float], /) -> List[str]:
+        found = []
+
+        if node.get("Node Type") == "Seq Scan" and sizes.get(node.get("Relation Name"), 0) > self.min_rows:
+            found.append(node["Relation Name"])
+
+        for child in node.get("Plans", ()):
+            found.extend(self._find_seq_scans(child, sizes))
+
+        return found
+
+    async def check(
+            self,
+            conn: Connection,
+            name: str,
+            /,
+            *,
+            analyze: bool = False,
+            sizes: Optional[Dict[str, float]] = None
+    ) -> PlanReport:
+        """|coro|
+
+        Explains a query.
+
+        :param conn: The connection to explain the query on.
+        :type conn: :class:`asyncpg.Connection`
+        :param name: The name of the query.
+        :type name: str
+        :param analyze: Whether to run the query to time it.
+        :type analyze: bool
+        :param sizes: The estimated row counts of the tables, read when omitted.
+        :type sizes: Optional[Dict[str, float]]
+        :rtype: :class:`PlanReport`
+        """
+
+        report = PlanReport(name)
+        query = self.queries.get_query(name)
+
+        if sizes is None:
+            sizes = await self._get_table_sizes(conn)
+
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+
+        try:
+            statement = await conn.prepare(query)
+            args = [SAMPLE_VALUES.get(parameter.name) for parameter in statement.get_parameters()]
+
+            # Changes made by the explained query are rolled back.
+            async with conn.transaction():
+                result = await conn.fetchval(f"EXPLAIN ({options}) {query}", *args)
+                raise _Rollback
+
+        except _Rollback:
+            pass
+
+        except PostgresError as err:
+            report.error = str(err)
+            return report
+
+        explained = loads(result)[0] if isinstance(result, str) else result[0]
+
+        report.plan = explained["Plan"]
+
+        if name not in self.full_scans:
+            report.seq_scans = self._find_seq_scans(report.plan, sizes)
+
+        if analyze:
+            report.execution_time = round(explained["Execution Time"], 3)
+            report.over_budget = name not in self.full_scans and report.execution_time > self.budget
+
+        return report
+
+    async def check_all(self, conn: Connection, /, *, analyze: bool = False) -> List[PlanReport]:
+        """|coro|
+
+        Explains every query of the registry.
+
+        :param conn: The connection to explain the queries on.
+        :type conn: :class:`asyncpg.Connection`
+        :param analyze: Whether to run the queries to time them.
+        :type analyze: bool
+        :rtype: List[:class:`PlanReport`]
+        """
+
+        sizes = await self._get_table_sizes(conn)
+
+        return [
+            await self.check(conn, name, analyze=analyze, sizes=sizes)
+            for name in self.queries.names
+        ]
+
+    def __repr__(self) -> str:
+        return f"<PlanChecker budget={self.budget} min_rows={self.min_rows}>"
+
+
+async def seed_database(
+        conn: Connection,
+        /,
+        *,
+        mappings: int = 0,
+        tickets: int = 0,
+        prefixes: int = 0,
+        batch_size: int = 1000000
+) -> None:
+    """|coro|
+
+    Fills the empty tables of a local database with synthetic rows,
+    to check the plans at scale. Tables that already have rows are
+    never seeded, so a database in use is left as it is.
+
+    Scopes get ten mappings on average, one in four mappings belongs to a
+    guild, one in fifty is shared and one in ten tickets is open.
+
+    :param conn: The connection to seed the database with.
+    :type conn: :class:`asyncpg.Connection`
+    :param mappings: The amount of mappings to add.
+    :type mappings: int
+    :param tickets: The amount of tickets to add.
+    :type tickets: int
+    :param prefixes: The amount of prefix rows to add.
+    :type prefixes: int
+    :param batch_size: The amount of rows added at once.
+    :type batch_size: int
+    :raises ValueError: If a table to seed isn't empty.
+    """
+
+    log = getLogger("xynus.db")
+
+    statements = (
+        (
+            "mappings",
+            mappings,
+            """
+            INSERT INTO mappings (user_id, guild_id, trigger, command, created_at, share_code)
+            SELECT
+                CASE WHEN i % 4 = 0 THEN NULL ELSE i % $3 + 1 END,
+                CASE WHEN i % 4 = 0 THEN i % $3 + 1 END,
+                'trigger' || i,
+                'help ' || i,
+                EXTRACT(EPOCH FROM NOW())::BIGINT,
+                CASE WHEN i % 50 = 0 THEN MD5(i::TEXT) END
+            FROM generate_series($1::BIGINT, $2::BIGINT) AS i;
+            """,
+            (max(mappings // 10, 1),)
+        ),
+        (
+            "tickets",
+            tickets,
+            """
+            INSERT INTO tickets (guild_id, owner_id, channel_id, user_ids, is_open, is_valid, panel_id, original_name)
+            SELECT
+                i % 1000 + 1,
+                i % $3 + 1,
+                i,
+                ARRAY[]::INTEGER[],
+                i % 10 = 0,
+                TRUE,
+                'panel',
+                'ticket-' || i
+            FROM generate_series($1::BIGINT, $2::BIGINT) AS i;
+            """,
+            (max(tickets // 5, 1),)
+        ),
+        (
+            "prefixes",
+            prefixes,
+            """
+            INSERT INTO prefixes (user_id, guild_id, prefixes)
+            SELECT
+                CASE WHEN i % 2 = 1 THEN i END,
+                CASE WHEN i % 2 = 0 THEN i END,
+                ARRAY['!', '?']
+            FROM generate_series($1::BIGINT, $2::BIGINT) AS i;
+            """,
+            ()
+        ),
+    )
+
+    # Checked before adding anything, the generated rows would collide
+    # with the ones of a previous run (e.g. on tickets.channel_id).
+    for table, count, _, _ in statements:
+        if count and await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {table});"):
+            raise ValueError(f"Refusing to seed {table}, the table isn't empty")
+
+    # table, rows, statement, arguments after the range of the batch
+    for table, count, statement, args in statements:
+        if not count:
+            continue
+
+        start_time = perf_counter()
+
+        # The change notifications of synthetic rows are of no use, and the
+        # row level trigger of the tickets would slow the seeding down.
+        await conn.execute(f"ALTER TABLE {table} DISABLE TRIGGER USER;")
+
+        try:
+            for start in range(1, count + 1, batch_size):
+                await conn.execute(statement, start, min(start + batch_size - 1, count), *args)
+        finally:
+            await conn.execute(f"ALTER TABLE {table} ENABLE TRIGGER USER;")
+
+        await conn.execute(f"ANALYZE {table};")
+
+        taked_time = round((perf_counter() - start_time) * 1000, 3)
+        log.info(f"Seeded {count} row(s) into {table} in {taked_time}ms")
+
+
+async def _main() -> int:
+    parser = ArgumentParser(
+        description="Checks that every SQL query of the bot uses an index, on a local database."
+    )
+    parser.add_argument("--dsn", required=True, help="The local database to check, never taken from the settings.")
+    parser.add_argument("--mappings", type=int, default=0, help="Synthetic mappings to add first.")
+    parser.add_argument("--tickets", type=int, default=0, help="Synthetic tickets to add first.")
+    parser.add_argument("--prefixes", type=int, default=0, help="Synthetic prefix rows to add first.")
+    parser.add_argument("--budget", type=float, default=50.0, help="Milliseconds a query may take.")
+    parser.add_argument("--no-analyze", action="store_true", help="Only explain the queries, without running them.")
+
+    args = parser.parse_args()
+    basicConfig(level="INFO")
+
+    assets.load()
+    queries = QueryRegistry(assets)
+
+    pool = InstrumentedPool(
+        await create_pool(
+            dsn=args.dsn,
+            min_size=1,
+            max_size=1
+        )
+    )
+
+    try:
+        await Migrator(pool).migrate()
+
+        async with pool.acquire(pinned=True) as conn:
+            try:
+                await seed_database(
+                    conn,
+                    mappings=args.mappings,
+                    tickets=args.tickets,
+                    prefixes=args.prefixes
+                )
+            except ValueError as err:
+                parser.error(str(err))
+
+            reports = await PlanChecker(queries, budget=args.budget).check_all(
+                conn,
+                analyze=not args.no_analyze
+            )
+
+    finally:
+        await pool.close()
+
+    for report in reports:
+        timing = "" if report.execution_time is None else f" ({report.execution_time}ms)"
+        status = "ok" if report.ok else "; ".join(report.problems)
+
+        print(f"{report.name}{timing}: {status}")
+
+    return 0 if all(report.ok for report in reports) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(run(_main()))
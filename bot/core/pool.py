@@ -0,0 +1,463 @@
+from asyncio import Task, TimeoutError, get_running_loop, sleep
+from collections import Counter
+from logging import getLogger
+from sys import _getframe
+from time import perf_counter
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+from asyncpg import Pool
+from asyncpg.pool import PoolConnectionProxy
+
+__all__: Tuple[str, ...] = (
+    "CallerStats",
+    "HeldConnection",
+    "InstrumentedPool",
+    "PoolStats",
+)
+
+
+class PoolStats:
+    """How often connections were acquired and how long that took."""
+
+    __slots__: Tuple[str, ...] = (
+        "acquires",
+        "timeouts",
+        "total_wait",
+        "max_wait",
+    )
+
+    def __init__(self) -> None:
+        self.acquires: int = 0
+        self.timeouts: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        """The average time waited for a connection in seconds."""
+
+        return self.total_wait / self.acquires if self.acquires else 0.0
+
+    def __repr__(self) -> str:
+        return f"<PoolStats acquires={self.acquires} timeouts={self.timeouts} total_wait={self.total_wait:.6f}>"
+
+
+class CallerStats:
+    """How long the connections acquired by a function were held."""
+
+    __slots__: Tuple[str, ...] = (
+        "acquires",
+        "held",
+        "total_hold",
+        "max_hold",
+    )
+
+    def __init__(self) -> None:
+        self.acquires: int = 0
+        self.held: int = 0
+        self.total_hold: float = 0.0
+        self.max_hold: float = 0.0
+
+    @property
+    def average_hold(self) -> float:
+        """The average time a released connection was held in seconds."""
+
+        released = self.acquires - self.held
+        return self.total_hold / released if released else 0.0
+
+    def __repr__(self) -> str:
+        return f"<CallerStats acquires={self.acquires} held={self.held} total_hold={self.total_hold:.6f}>"
+
+
+class HeldConnection:
+    """A connection that was acquired and not released yet."""
+
+    __slots__: Tuple[str, ...] = (
+        "caller",
+        "location",
+        "acquired_at",
+        "pinned",
+        "warned",
+        "busy",
+    )
+
+    def __init__(self, caller: str, location: str, pinned: bool) -> None:
+        self.caller: str = caller
+        self.location: str = location
+        self.acquired_at: float = perf_counter()
+        self.pinned: bool = pinned
+        self.warned: bool = False
+        # Whether it was found in use when it was due to be reclaimed.
+        self.busy: bool = False
+
+    @property
+    def held_for(self) -> float:
+        """How many seconds the connection has been held."""
+
+        return perf_counter() - self.acquired_at
+
+    def __repr__(self) -> str:
+        return f"<HeldConnection caller={self.caller!r} location={self.location!r} held_for={self.held_for:.3f}>"
+
+
+def _get_caller(depth: int, /) -> Tuple[str, str]:
+    frame = _getframe(depth + 1)
+    module = frame.f_globals.get("__name__", "?")
+
+    return (
+        f"{module}.{frame.f_code.co_qualname}",
+        f"{module}:{frame.f_lineno}"
+    )
+
+
+class _AcquireContext:
+    # Like the one of asyncpg, it can be awaited or used with ``async with``.
+
+    __slots__: Tuple[str, ...] = (
+        "pool",
+        "caller",
+        "location",
+        "timeout",
+        "pinned",
+        "connection",
+    )
+
+    def __init__(
+            self,
+            pool: "InstrumentedPool",
+            caller: Tuple[str, str],
+            timeout: Optional[float],
+            pinned: bool
+    ) -> None:
+        self.pool: "InstrumentedPool" = pool
+        self.caller, self.location = caller
+        self.timeout: Optional[float] = timeout
+        self.pinned: bool = pinned
+        self.connection: Optional[PoolConnectionProxy] = None
+
+    def __await__(self) -> Generator[Any, None, PoolConnectionProxy]:
+        return self.pool._acquire(self).__await__()
+
+    async def __aenter__(self) -> PoolConnectionProxy:
+        self.connection = await self.pool._acquire(self)
+        return self.connection
+
+    async def __aexit__(self, *args: Any) -> None:
+        connection, self.connection = self.connection, None
+        await self.pool.release(connection)
+
+
+class InstrumentedPool:
+    """An asyncpg pool that keeps track of how its connections are used.
+
+    Records how long acquiring a connection took and how long every
+    function held the connections it acquired. Everything else is
+    passed through to the wrapped :class:`asyncpg.Pool`.
+
+    Once :meth:`start_leak_detector` was called, connections held longer
+    than ``leak_threshold`` seconds are logged with the line that acquired
+    them, and released by force after ``reclaim_after`` seconds if they
+    are idle. Connections acquired with ``pinned=True`` are meant to be kept.
+    """
+
+    __slots__: Tuple[str, ...] = (
+        "pool",
+        "acquire_timeout",
+        "leak_threshold",
+        "reclaim_after",
+        "stats",
+        "callers",
+        "waiting",
+        "leaks",
+        "reclaimed",
+        "_held",
+        "_leak_detector",
+    )
+
+    def __init__(
+            self,
+            pool: Pool,
+            /,
+            *,
+            acquire_timeout: Optional[float] = None,
+            leak_threshold: Optional[float] = None,
+            reclaim_after: Optional[float] = None
+    ) -> None:
+        """
+        :param pool: The pool to wrap.
+        :type pool: :class:`asyncpg.Pool`
+        :param acquire_timeout: How many seconds to wait for a connection by default.
+        :type acquire_timeout: Optional[float]
+        :param leak_threshold: After how many seconds a held connection is reported as leaked.
+        :type leak_threshold: Optional[float]
+        :param reclaim_after: After how many seconds a held connection is released by force.
+        :type reclaim_after: Optional[float]
+        """
+
+        self.pool: Pool = pool
+        self.acquire_timeout: Optional[float] = acquire_timeout
+        self.leak_threshold: Optional[float] = leak_threshold
+        self.reclaim_after: Optional[float] = reclaim_after
+
+        self.stats: PoolStats = PoolStats()
+        self.callers: Dict[str, CallerStats] = {}
+        self.waiting: int = 0
+
+        # The lines that acquired the reported connections, and how often.
+        self.leaks: Counter[str] = Counter()
+        self.reclaimed: int = 0
+
+        self._held: Dict[PoolConnectionProxy, HeldConnection] = {}
+        self._leak_detector: Optional[Task] = None
+
+    def acquire(self, *, timeout: Optional[float] = None, pinned: bool = False) -> _AcquireContext:
+        """Acquires a connection, the same way as :meth:`asyncpg.Pool.acquire`.
+
+        :param timeout: How many seconds to wait for a connection,
+            ``acquire_timeout`` by default.
+        :type timeout: Optional[float]
+        :param pinned: Whether the connection is kept on purpose (e.g. by the KV store or a migration),
+            it's never reported as leaked nor reclaimed.
+        :type pinned: bool
+        """
+
+        return _AcquireContext(self, _get_caller(1), timeout, pinned)
+
+    async def _acquire(self, context: _AcquireContext, /) -> PoolConnectionProxy:
+        start_time = perf_counter()
+        self.waiting += 1
+
+        try:
+            connection = await self.pool.acquire(
+                timeout=self.acquire_timeout if context.timeout is None else context.timeout
+            )
+        except TimeoutError:
+            self.stats.timeouts += 1
+            raise
+
+        finally:
+            self.waiting -= 1
+
+        elapsed = perf_counter() - start_time
+
+        self.stats.acquires += 1
+        self.stats.total_wait += elapsed
+        self.stats.max_wait = max(self.stats.max_wait, elapsed)
+
+        caller_stats = self.callers.get(context.caller)
+
+        if caller_stats is None:
+            caller_stats = self.callers[context.caller] = CallerStats()
+
+        caller_stats.acquires += 1
+        caller_stats.held += 1
+
+        self._held[connection] = HeldConnection(context.caller, context.location, context.pinned)
+
+        return connection
+
+    async def release(self, connection: PoolConnectionProxy, *, timeout: Optional[float] = None) -> None:
+        """|coro|
+
+        Releases a connection back to the pool.
+
+        :param connection: The connection to release.
+        :type connection: :class:`asyncpg.pool.PoolConnectionProxy`
+        :param timeout: How many seconds to wait for the release.
+        :type timeout: Optional[float]
+        """
+
+        held = self._held.pop(connection, None)
+
+        if held is not None:
+            elapsed = held.held_for
+
+            caller_stats = self.callers[held.caller]
+            caller_stats.held -= 1
+            caller_stats.total_hold += elapsed
+            caller_stats.max_hold = max(caller_stats.max_hold, elapsed)
+
+        await self.pool.release(connection, timeout=timeout)
+
+    def get_held(self) -> List[HeldConnection]:
+        """Returns the connections that are held right now, the longest held first.
+
+        :rtype: List[:class:`HeldConnection`]
+        """
+
+        return sorted(self._held.values(), key=lambda held: held.acquired_at)
+
+    async def check_leaks(self) -> List[HeldConnection]:
+        """|coro|
+
+        Reports the connections held past ``leak_threshold`` and
+        releases the ones held past ``reclaim_after`` if they are idle.
+        Connections in a transaction or running a query are only reported.
+
+        :return: The connections held past ``leak_threshold``.
+        :rtype: List[:class:`HeldConnection`]
+        """
+
+        log = getLogger("xynus.db")
+        leaked = []
+
+        if self.leak_threshold is None:
+            return leaked
+
+        for connection, held in list(self._held.items()):
+            if held.pinned:
+                continue
+
+            held_for = held.held_for
+
+            if held_for < self.leak_threshold:
+                continue
+
+            leaked.append(held)
+
+            if not held.warned:
+                held.warned = True
+                self.leaks[held.location] += 1
+
+                log.warning(
+                    f"A connection acquired by {held.caller} ({held.location})"
+                    f" has been held for {round(held_for, 3)}s"
+                )
+
+            if self.reclaim_after is not None and held_for >= self.reclaim_after:
+                if not await self._is_idle(connection):
+                    # Releasing it would hand its transaction or query to another caller.
+                    if not held.busy:
+                        held.busy = True
+
+                        log.warning(
+                            f"Not reclaiming the connection acquired by {held.caller} ({held.location}),"
+                            f" it's still in use"
+                        )
+
+                    continue
+
+                try:
+                    await self.release(connection)
+                except Exception as err:
+                    # The connection is terminated instead.
+                    log.warning(f"Failed to reset a reclaimed connection: {err}")
+
+                self.reclaimed += 1
+                log.warning(f"Reclaimed the connection acquired by {held.caller} ({held.location})")
+
+        return leaked
+
+    async def _is_idle(self, connection: PoolConnectionProxy, /) -> bool:
+        if connection.is_closed():
+            return True
+
+        if connection.is_in_transaction():
+            return False
+
+        # asyncpg doesn't tell whether a query is running, Postgres does.
+        try:
+            async with self.acquire(timeout=5.0) as conn:
+                state = await conn.fetchval(
+                    "SELECT state FROM pg_stat_activity WHERE pid = $1;",
+                    connection.get_server_pid()
+                )
+        except Exception as err:
+            getLogger("xynus.db").warning(f"Failed to check whether a held connection is idle: {err}")
+            return False
+
+        return state == "idle"
+
+    async def _detect_leaks(self) -> None:
+        log = getLogger("xynus.db")
+
+        while True:
+            await sleep(max(self.leak_threshold / 2, 1.0))
+
+            try:
+                await self.check_leaks()
+            except Exception as err:
+                log.error(f"Failed to check for leaked connections: {err}")
+
+    def start_leak_detector(self) -> None:
+        """Checks for leaked connections in the background, if a ``leak_threshold`` is set."""
+
+        if self.leak_threshold is None or self._leak_detector is not None:
+            return
+
+        self._leak_detector = get_running_loop().create_task(self._detect_leaks())
+
+    def stop_leak_detector(self) -> None:
+        """Stops checking for leaked connections."""
+
+        if self._leak_detector is not None:
+            self._leak_detector.cancel()
+            self._leak_detector = None
+
+    async def close(self) -> None:
+        """|coro|
+
+        Stops the leak detector, releases the pinned connections and closes the pool.
+        """
+
+        self.stop_leak_detector()
+
+        # The pool waits for every connection to be released before closing.
+        for connection, held in list(self._held.items()):
+            if held.pinned:
+                await self.release(connection)
+
+        await self.pool.close()
+
+    @property
+    def size(self) -> int:
+        """The amount of open connections."""
+
+        return self.pool.get_size()
+
+    @property
+    def idle(self) -> int:
+        """The amount of open connections nobody uses."""
+
+        return self.pool.get_idle_size()
+
+    @property
+    def in_use(self) -> int:
+        """The amount of acquired connections."""
+
+        return self.pool.get_size() - self.pool.get_idle_size()
+
+    @property
+    def min_size(self) -> int:
+        return self.pool.get_min_size()
+
+    @property
+    def max_size(self) -> int:
+        return self.pool.get_max_size()
+
+    def reset_stats(self) -> None:
+        """Resets the statistics, the connections held right now are kept."""
+
+        self.stats = PoolStats()
+
+        callers: Dict[str, CallerStats] = {}
+
+        for held in self._held.values():
+            caller_stats = callers.get(held.caller)
+
+            if caller_stats is None:
+                caller_stats = callers[held.caller] = CallerStats()
+
+            caller_stats.acquires += 1
+            caller_stats.held += 1
+
+        self.callers = callers
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pool, name)
+
+    def __repr__(self) -> str:
+        return (
+            f"<InstrumentedPool size={self.size} in_use={self.in_use} "
+            f"waiting={self.waiting} acquires={self.stats.acquires}>"
+        )
@@ -0,0 +1,335 @@
+from logging import getLogger
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from asyncpg import Connection, PostgresError, Record
+from asyncpg.exceptions import InvalidCachedStatementError
+from asyncpg.prepared_stmt import PreparedStatement
+
+from ..utils.assets import AssetRegistry, SQLQuery
+
+__all__: Tuple[str, ...] = (
+    "QueryRegistry",
+    "QueryStats",
+)
+
+# Directories of ``sql/`` holding the queries prepared on every connection.
+PREPARED_DIRECTORIES: Tuple[str, ...] = (
+    "mappings",
+    "prefixes",
+    "tickets",
+)
+
+
+class QueryStats:
+    """How often a query was run and how long it took."""
+
+    __slots__: Tuple[str, ...] = (
+        "calls",
+        "errors",
+        "total_time",
+        "max_time",
+    )
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.errors: int = 0
+        self.total_time: float = 0.0
+        self.max_time: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        """The average duration of a call in seconds."""
+
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def __repr__(self) -> str:
+        return f"<QueryStats calls={self.calls} errors={self.errors} total_time={self.total_time:.6f}>"
+
+
+class QueryRegistry:
+    """The named SQL queries of the bot, prepared on each pool connection.
+
+    Queries are the ``.sql`` files of the asset registry and are called
+    by their path relative to ``sql/`` without the extension, e.g.
+    ``"mappings/get_user_mapping"``.
+
+    :meth:`prepare` is meant to be the ``init`` hook of the pool, so every
+    connection parses the queries once when it's opened. Connections that
+    missed it (e.g. opened before the schema existed) prepare a query the
+    first time it's used on them.
+    """
+
+    __slots__: Tuple[str, ...] = (
+        "assets",
+        "names",
+        "stats",
+        "_statements",
+    )
+
+    def __init__(
+            self,
+            assets: AssetRegistry,
+            directories: Iterable[str] = PREPARED_DIRECTORIES
+    ) -> None:
+        """
+        :param assets: The asset registry holding the SQL files.
+        :type assets: :class:`AssetRegistry`
+        :param directories: The directories of ``sql/`` whose queries are prepared.
+        :type directories: Iterable[str]
+        """
+
+        self.assets: AssetRegistry = assets
+
+        prefixes = tuple(f"{directory}/" for directory in directories)
+
+        self.names: Tuple[str, ...] = tuple(
+            name[:-len(".sql")]
+            for name in sorted(assets.queries)
+            if name.startswith(prefixes)
+        )
+        self.stats: Dict[str, QueryStats] = {name: QueryStats() for name in self.names}
+
+        # Server PIDs of the connections mapped to their prepared statements.
+        self._statements: Dict[int, Dict[str, PreparedStatement]] = {}
+
+    def has_connection(self, pid: int, /) -> bool:
+        """Whether a server process is one of the connections the queries were prepared on.
+
+        :param pid: The PID of the server process.
+        :type pid: int
+        :rtype: bool
+        """
+
+        return pid in self._statements
+
+    def get_query(self, name: str, /) -> SQLQuery:
+        """Returns the text of a query.
+
+        :param name: The name of the query.
+        :type name: str
+        :raises AssetError: There is no such query.
+        :rtype: :class:`SQLQuery`
+        """
+
+        return self.assets.get_query(f"{name}.sql")
+
+    async def prepare(self, conn: Connection, /) -> None:
+        """|coro|
+
+        Prepares every query on a connection, used as the ``init`` hook of the pool.
+
+        Queries that can't be prepared yet are skipped
+        and prepared again on their first use.
+
+        :param conn: The connection to prepare the queries on.
+        :type conn: :class:`asyncpg.Connection`
+        """
+
+        log = getLogger("xynus.db")
+        start_time = perf_counter()
+
+        pid = conn.get_server_pid()
+        statements = self._get_statements(conn)
+
+        failed = []
+
+        for name in self.names:
+            try:
+                statements[name] = await conn.prepare(self.get_query(name))
+            except PostgresError:
+                failed.append(name)
+
+        taked_time = round((perf_counter() - start_time) * 1000, 3)
+
+        log.debug(f"Prepared {len(statements)} queries on connection {pid} in {taked_time}ms")
+
+        if failed:
+            log.debug("Could not prepare {} on connection {} yet".format(", ".join(failed), pid))
+
+    def _get_statements(self, conn: Connection, /) -> Dict[str, PreparedStatement]:
+        pid = conn.get_server_pid()
+        statements = self._statements.get(pid)
+
+        if statements is None:
+            statements = self._statements[pid] = {}
+
+            # The PID can't be read anymore once the connection is gone.
+            conn.add_termination_listener(lambda _: self._statements.pop(pid, None))
+
+        return statements
+
+    async def _get_statement(self, conn: Connection, name: str, /) -> PreparedStatement:
+        statements = self._get_statements(conn)
+        statement = statements.get(name)
+
+        if statement is None:
+            statement = statements[name] = await conn.prepare(self.get_query(name))
+
+        return statement
+
+    @staticmethod
+    async def _call(statement: PreparedStatement, method: str, args: Tuple[Any, ...]) -> Any:
+        if method == "execute":
+            # Prepared statements have no ``execute``, the status is kept after a fetch.
+            await statement.fetch(*args)
+            return statement.get_statusmsg()
+
+        if method == "cursor":
+            return await statement.cursor(*args)
+
+        return await getattr(statement, method)(*args)
+
+    async def _run(self, method: str, conn: Connection, name: str, args: Tuple[Any, ...]) -> Any:
+        if name not in self.stats:
+            raise KeyError(f"Unknown query {name!r}")
+
+        expected = self.get_query(name).parameters
+
+        if len(args) != expected:
+            raise TypeError(f"Query {name!r} takes {expected} argument(s) but {len(args)} were given")
+
+        stats = self.stats[name]
+        start_time = perf_counter()
+
+        try:
+            statement = await self._get_statement(conn, name)
+
+            try:
+                result = await self._call(statement, method, args)
+            except InvalidCachedStatementError:
+                # The schema changed under the statement, prepare it again.
+                self._get_statements(conn).pop(name, None)
+
+                statement = await self._get_statement(conn, name)
+                result = await self._call(statement, method, args)
+
+        except Exception:
+            stats.errors += 1
+            raise
+
+        finally:
+            elapsed = perf_counter() - start_time
+
+            stats.calls += 1
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+
+        return result
+
+    async def fetch(self, conn: Connection, name: str, /, *args: Any) -> List[Record]:
+        """|coro|
+
+        Runs a query and returns all the rows.
+
+        :param conn: The connection to run the query on.
+        :type conn: :class:`asyncpg.Connection`
+        :param name: The name of the query.
+        :type name: str
+        :param args: The query arguments.
+        :rtype: List[:class:`asyncpg.Record`]
+        """
+
+        return await self._run("fetch", conn, name, args)
+
+    async def fetchrow(self, conn: Connection, name: str, /, *args: Any) -> Optional[Record]:
+        """|coro|
+
+        Runs a query and returns the first row.
+
+        :param conn: The connection to run the query on.
+        :type conn: :class:`asyncpg.Connection`
+        :param name: The name of the query.
+        :type name: str
+        :param args: The query arguments.
+        :rtype: Optional[:class:`asyncpg.Record`]
+        """
+
+        return await self._run("fetchrow", conn, name, args)
+
+    async def fetchval(self, conn: Connection, name: str, /, *args: Any) -> Any:
+        """|coro|
+
+        Runs a query and returns the first column of the first row.
+
+        :param conn: The connection to run the query on.
+        :type conn: :class:`asyncpg.Connection`
+        :param name: The name of the query.
+        :type name: str
+        :param args: The query arguments.
+        :rtype: Any
+        """
+
+        return await self._run("fetchval", conn, name, args)
+
+    async def execute(self, conn: Connection, name: str, /, *args: Any) -> str:
+        """|coro|
+
+        Runs a query and returns its status, e.g. ``"DELETE 1"``.
+
+        :param conn: The connection to run the query on.
+        :type conn: :class:`asyncpg.Connection`
+        :param name: The name of the query.
+        :type name: str
+        :param args: The query arguments.
+        :rtype: str
+        """
+
+        return await self._run("execute", conn, name, args)
+
+    async def stream(
+            self,
+            conn: Connection,
+            name: str,
+            /,
+            *args: Any,
+            batch_size: int = 1000
+    ) -> AsyncIterator[List[Record]]:
+        """Runs a query through a server-side cursor and yields its rows in batches.
+
+        Cursors only live in transactions, the caller has to open one::
+
+            async with pool.acquire() as conn, conn.transaction():
+                async for records in queries.stream(conn, "prefixes/get_all_prefixes"):
+                    ...
+
+        :param conn: The connection to run the query on.
+        :type conn: :class:`asyncpg.Connection`
+        :param name: The name of the query.
+        :type name: str
+        :param args: The query arguments.
+        :param batch_size: The amount of rows fetched at once.
+        :type batch_size: int
+        :rtype: AsyncIterator[List[:class:`asyncpg.Record`]]
+        """
+
+        stats = self.stats[name]
+        cursor = await self._run("cursor", conn, name, args)
+
+        while True:
+            start_time = perf_counter()
+
+            try:
+                records = await cursor.fetch(batch_size)
+            except Exception:
+                stats.errors += 1
+                raise
+
+            finally:
+                elapsed = perf_counter() - start_time
+
+                stats.total_time += elapsed
+                stats.max_time = max(stats.max_time, elapsed)
+
+            if not records:
+                return
+
+            yield records
+
+    def reset_stats(self) -> None:
+        """Resets the statistics of every query."""
+
+        self.stats = {name: QueryStats() for name in self.names}
+
+    def __repr__(self) -> str:
+        return f"<QueryRegistry queries={len(self.names)} connections={len(self._statements)}>"
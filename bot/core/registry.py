@@ -0,0 +1,311 @@
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from discord.ext import commands as _commands
+
+from ..templates.embeds import CommandInfoEmbed, CommandsEmbed
+from ..utils.completion import CompletionIndex
+from ..utils.functions import chunker, get_all_commands
+from ..utils.fuzzy import FuzzyIndex
+
+if TYPE_CHECKING:
+    from .client import Xynus
+
+
+__all__: Tuple[str, ...] = (
+    "CommandRegistry",
+)
+
+# Commands listed on a single help page.
+HELP_PAGE_SIZE = 10
+
+
+class CommandRegistry:
+    """An index of the bot's prefixed commands.
+
+    The index is built lazily from the loaded cogs and dropped by
+    :meth:`invalidate` whenever cogs or commands are added or removed,
+    so help menus and autocompletes don't have to walk every cog.
+
+    Help pages and command info embeds are rendered once and kept as
+    embed dicts until the next invalidation.
+    """
+
+    __slots__: Tuple[str, ...] = (
+        "client",
+        "_built",
+        "_commands",
+        "_cogs",
+        "_by_name",
+        "_by_alias",
+        "_by_cog",
+        "_by_parent",
+        "_fuzzy",
+        "_completions",
+        "_help_pages",
+        "_command_infos",
+    )
+
+    def __init__(self, client: "Xynus") -> None:
+        """
+        :param client: The bot client instance.
+        :type client: :class:`Xynus`
+        """
+
+        self.client: "Xynus" = client
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drops the index, it will be rebuilt on the next lookup."""
+
+        self._built: bool = False
+
+        self._commands: Tuple[_commands.Command, ...] = tuple()
+        self._cogs: Dict[str, _commands.Cog] = {}
+        self._by_name: Dict[str, _commands.Command] = {}
+        self._by_alias: Dict[str, _commands.Command] = {}
+        self._by_cog: Dict[str, Tuple[_commands.Command, ...]] = {}
+        self._by_parent: Dict[Optional[str], Tuple[_commands.Command, ...]] = {}
+        self._fuzzy: FuzzyIndex = FuzzyIndex()
+        self._completions: CompletionIndex = CompletionIndex(())
+        self._help_pages: Dict[Tuple[str, int, str], Tuple[Dict[str, Any], int]] = {}
+        self._command_infos: Dict[str, Dict[str, Any]] = {}
+
+    def build(self) -> None:
+        """Builds the index from the currently loaded cogs."""
+
+        self.invalidate()
+
+        all_commands = []
+        children: Dict[Optional[str], list] = {}
+
+        for cog_name, cog in self.client.cogs.items():
+            cog_commands = get_all_commands(cog=cog)
+
+            if not cog_commands:
+                continue
+
+            self._cogs[cog_name] = cog
+            self._by_cog[cog_name] = tuple(cog_commands)
+            all_commands += cog_commands
+
+        for command in self.client.walk_commands():
+            qualified_name = command.qualified_name.lower()
+            parent_name = command.full_parent_name.lower()
+
+            self._by_name[qualified_name] = command
+            self._fuzzy.add(qualified_name)
+            children.setdefault(parent_name or None, []).append(command)
+
+            for alias in command.aliases:
+                alias_name = f"{parent_name} {alias}".strip().lower()
+
+                self._by_alias[alias_name] = command
+                self._fuzzy.add(alias_name, qualified_name)
+
+        self._commands = tuple(all_commands)
+        self._completions = CompletionIndex(
+            (command.qualified_name, command.aliases)
+            for command in self._commands
+        )
+        self._by_parent = {
+            parent: tuple(cmds) for parent, cmds in children.items()
+        }
+        self._built = True
+
+    def _ensure_built(self) -> None:
+        if not self._built:
+            self.build()
+
+    @property
+    def commands(self) -> Tuple[_commands.Command, ...]:
+        """All commands of the cogs, in the order help menus display them."""
+
+        self._ensure_built()
+        return self._commands
+
+    @property
+    def cogs(self) -> Dict[str, _commands.Cog]:
+        """The cogs that have at least one command."""
+
+        self._ensure_built()
+        return self._cogs
+
+    @property
+    def names(self) -> Dict[str, _commands.Command]:
+        """Commands keyed by their lowercased qualified name."""
+
+        self._ensure_built()
+        return self._by_name
+
+    def get(self, name: str, /) -> Optional[_commands.Command]:
+        """Looks up a command by its qualified name or one of its aliases.
+
+        :param name: The command name, e.g. ``mappings guild set``.
+        :type name: str
+        :rtype: Optional[:class:`discord.ext.commands.Command`]
+        """
+
+        self._ensure_built()
+
+        name = " ".join(name.split()).lower()
+        command = self._by_name.get(name) or self._by_alias.get(name)
+
+        if command is None and " " in name:
+            # Aliases of parent groups, e.g. ``maps g set``.
+            command = self.client.get_command(name)
+
+        return command
+
+    def suggest(
+            self,
+            name: str,
+            /,
+            n: int = 3,
+            cutoff: float = 0.6
+    ) -> List[_commands.Command]:
+        """Returns the commands whose name or alias is the closest to ``name``.
+
+        :param name: The misspelled command name.
+        :type name: str
+        :param n: The maximum amount of commands to return.
+        :type n: int
+        :param cutoff: The minimum similarity, from ``0.0`` to ``1.0``.
+        :type cutoff: float
+        :rtype: List[:class:`discord.ext.commands.Command`]
+        """
+
+        self._ensure_built()
+
+        return [
+            self._by_name[qualified_name]
+            for qualified_name in self._fuzzy.search(
+                " ".join(name.split()), n=n, cutoff=cutoff
+            )
+        ]
+
+    def complete(
+            self,
+            current: str,
+            /,
+            user_id: Optional[int] = None,
+            limit: int = 25
+    ) -> List[str]:
+        """Returns the qualified names of the commands matching what is being typed.
+
+        :param current: The text typed so far.
+        :type current: str
+        :param user_id: The ID of the typing user, to refine their previous query.
+        :type user_id: Optional[int]
+        :param limit: The maximum amount of names, Discord accepts 25 choices at most.
+        :type limit: int
+        :rtype: List[str]
+        """
+
+        self._ensure_built()
+        return self._completions.complete(current, owner=user_id, limit=limit)
+
+    def get_help_page(
+            self,
+            cog_name: str,
+            index: int,
+            prefix: str
+    ) -> Tuple[Dict[str, Any], int]:
+        """Returns a page of a cog's help menu.
+
+        :param cog_name: The qualified name of the cog.
+        :type cog_name: str
+        :param index: The page index.
+        :type index: int
+        :param prefix: The prefix shown before the command names.
+        :type prefix: str
+        :return: The embed as a dict and the total amount of pages.
+        :rtype: Tuple[Dict[str, Any], int]
+        """
+
+        self._ensure_built()
+
+        key = (cog_name, index, prefix)
+        page = self._help_pages.get(key)
+
+        if page is None:
+            cog_commands = self._by_cog.get(cog_name, tuple())
+            chunks = chunker(cog_commands, HELP_PAGE_SIZE)
+
+            embed = CommandsEmbed(
+                commands=chunks[index],
+                title=f"Category: {cog_name}",
+                prefix=prefix,
+                total_commands=len(cog_commands)
+            )
+
+            # Every page gets stamped when it is sent.
+            embed.timestamp = None
+
+            page = self._help_pages[key] = (embed.to_dict(), len(chunks))
+
+        return page
+
+    def get_command_info(self, command: _commands.Command, /) -> Dict[str, Any]:
+        """Returns the info embed of a command as a dict.
+
+        :param command: The command to describe.
+        :type command: :class:`discord.ext.commands.Command`
+        :rtype: Dict[str, Any]
+        """
+
+        self._ensure_built()
+
+        info = self._command_infos.get(command.qualified_name)
+
+        if info is None:
+            embed = CommandInfoEmbed(
+                client=self.client,
+                command=command,
+                full_name=command.qualified_name
+            )
+            embed.timestamp = None
+
+            info = self._command_infos[command.qualified_name] = embed.to_dict()
+
+        return info
+
+    def prerender(self, prefixes: Iterable[str], /) -> None:
+        """Renders every help page and command info embed ahead of time.
+
+        :param prefixes: The prefixes to render the help pages for.
+        :type prefixes: Iterable[str]
+        """
+
+        self._ensure_built()
+
+        for prefix in prefixes:
+            for cog_name, cog_commands in self._by_cog.items():
+                for index in range(len(chunker(cog_commands, HELP_PAGE_SIZE))):
+                    self.get_help_page(cog_name, index, prefix)
+
+        for command in self._commands:
+            self.get_command_info(command)
+
+    def get_cog_commands(self, cog_name: str, /) -> Tuple[_commands.Command, ...]:
+        """Returns every command of a cog, subcommands included.
+
+        :param cog_name: The qualified name of the cog.
+        :type cog_name: str
+        """
+
+        self._ensure_built()
+        return self._by_cog.get(cog_name, tuple())
+
+    def get_subcommands(self, parent: Optional[str] = None, /) -> Tuple[_commands.Command, ...]:
+        """Returns the direct subcommands of a group.
+
+        :param parent: The qualified name of the group, ``None`` for top level commands.
+        :type parent: Optional[str]
+        """
+
+        self._ensure_built()
+
+        if parent is not None:
+            parent = parent.lower() or None
+
+        return self._by_parent.get(parent, tuple())
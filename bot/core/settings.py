@@ -23,6 +23,62 @@ class Settings(BaseSettings):
     STRIP_AFTER_PREFIX: Optional[bool] = True
     DEV_LOGS_CHANNEL: int
 
+    # Replies with the closest commands when an unknown one is used,
+    # at most once per SUGGEST_COOLDOWN seconds for each user.
+    SUGGEST_COMMANDS: Optional[bool] = False
+    SUGGEST_COOLDOWN: Optional[float] = 30.0
+
+    # With --profile-startup, warns when importing the bot takes longer (ms).
+    IMPORT_BUDGET: Optional[float] = 1500.0
+
+    # Rows fetched at once while warming up the prefix and mapping caches.
+    # With WARMUP_IN_BACKGROUND, commands are handled during the warm-up
+    # and the scopes that aren't cached yet are read on their own.
+    WARMUP_BATCH_SIZE: Optional[int] = 1000
+    WARMUP_IN_BACKGROUND: Optional[bool] = False
+
+    # Limits of the prefix and mapping caches, each: the amount of cached
+    # guilds and users, their estimated memory (MiB) and lifetime (seconds).
+    # Scopes that aren't cached are read from the database when used.
+    SCOPE_CACHE_SIZE: Optional[int] = 100000
+    SCOPE_CACHE_MEMORY: Optional[int] = 64
+    SCOPE_CACHE_TTL: Optional[float] = 21600.0
+
+    # Drops the scopes other bot processes changed from the caches, and
+    # reads the tickets they changed again, through Postgres LISTEN/NOTIFY
+    # on a connection of its own. Turning it off is only safe when a
+    # single process serves each guild, the open tickets are kept in memory.
+    SCOPE_NOTIFICATIONS: Optional[bool] = True
+
+    # Keeps the prefixes and mappings in Redis too, shared by every bot
+    # process: scopes missing from a process are read from Redis before
+    # the database, and restarts warm up from it. The KV values are kept
+    # there for KV_CACHE_TTL seconds as well. "memory://" keeps them in
+    # the process instead, for development. Unset disables it.
+    REDIS_URL: Optional[str] = None
+    REDIS_CACHE_TTL: Optional[float] = 86400.0
+
+    # Values read from the KV store (e.g. the ticket panels) are kept
+    # KV_CACHE_TTL seconds. Writes made by the bot are seen right away,
+    # the ones made by anything else once the value expires.
+    KV_CACHE_SIZE: Optional[int] = 10000
+    KV_CACHE_TTL: Optional[float] = 300.0
+
+    # Connections of the database pool. The KV store keeps one of them
+    # checked out for good, commands share the others. Acquiring waits
+    # at most POOL_ACQUIRE_TIMEOUT seconds, or forever if it's unset.
+    POOL_MIN_SIZE: Optional[int] = 10
+    POOL_MAX_SIZE: Optional[int] = 10
+    POOL_MAX_QUERIES: Optional[int] = 50000
+    POOL_MAX_INACTIVE_LIFETIME: Optional[float] = 300.0
+    POOL_ACQUIRE_TIMEOUT: Optional[float] = None
+
+    # Connections held longer than POOL_LEAK_THRESHOLD seconds are logged
+    # with the line that acquired them, and released by force after
+    # POOL_RECLAIM_AFTER seconds. Unset either to turn it off.
+    POOL_LEAK_THRESHOLD: Optional[float] = 60.0
+    POOL_RECLAIM_AFTER: Optional[float] = 600.0
+
     DSN: Optional[str] = None
 
     DATABASE_NAME: Optional[str] = None
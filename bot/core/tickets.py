@@ -0,0 +1,337 @@
+from logging import getLogger
+from time import perf_counter
+from typing import Dict, Optional, Sequence, Set, Tuple
+
+from asyncpg import Record
+
+from .pool import InstrumentedPool
+from .queries import QueryRegistry
+
+__all__: Tuple[str, ...] = (
+    "TicketIndex",
+    "TicketState",
+)
+
+
+class TicketState:
+    """A row of the ``tickets`` table."""
+
+    __slots__: Tuple[str, ...] = (
+        "guild_id",
+        "owner_id",
+        "channel_id",
+        "user_ids",
+        "is_open",
+        "is_valid",
+        "panel_id",
+        "original_name",
+    )
+
+    def __init__(
+            self,
+            guild_id: int,
+            owner_id: int,
+            channel_id: int,
+            user_ids: Sequence[int],
+            is_open: bool,
+            is_valid: bool,
+            panel_id: str,
+            original_name: str
+    ) -> None:
+        self.guild_id: int = guild_id
+        self.owner_id: int = owner_id
+        self.channel_id: int = channel_id
+        self.user_ids: Tuple[int, ...] = tuple(user_ids)
+        self.is_open: bool = is_open
+        # Whether the ticket keeps its owner from opening another one.
+        self.is_valid: bool = is_valid
+        self.panel_id: str = panel_id
+        # Encrypted, see :func:`bot.utils.functions.encrypt`.
+        self.original_name: str = original_name
+
+    @classmethod
+    def from_record(cls, record: Record, /) -> "TicketState":
+        return cls(
+            record["guild_id"],
+            record["owner_id"],
+            record["channel_id"],
+            record["user_ids"],
+            record["is_open"],
+            record["is_valid"],
+            record["panel_id"],
+            record["original_name"]
+        )
+
+    @property
+    def counts(self) -> bool:
+        """Whether the ticket counts as the open ticket of its owner."""
+
+        return self.is_open and self.is_valid
+
+    def __repr__(self) -> str:
+        return (
+            f"<TicketState channel_id={self.channel_id} owner_id={self.owner_id} "
+            f"is_open={self.is_open} is_valid={self.is_valid}>"
+        )
+
+
+class TicketIndex:
+    """The open tickets known to the bot, by channel and by owner.
+
+    :meth:`load` reads every open and valid ticket at boot, the other open
+    tickets are read by channel on their first use. Closed tickets aren't
+    kept, they are read from the database every time. Every write of the
+    ``tickets`` table by the bot goes through :meth:`set` and :meth:`delete`,
+    which update the index right after the write, so the ticket buttons
+    are answered from memory.
+
+    Writes of other processes serving the same guilds reach it through
+    the :class:`ScopeListener`, see :meth:`refresh`. Without the listener,
+    a single process has to serve each guild. Until :meth:`load` succeeded,
+    whether a member has an open ticket is still read from the database.
+    """
+
+    __slots__: Tuple[str, ...] = (
+        "pool",
+        "queries",
+        "hits",
+        "misses",
+        "loaded",
+        "_tickets",
+        "_owners",
+        "_generation",
+    )
+
+    def __init__(self, pool: InstrumentedPool, queries: QueryRegistry) -> None:
+        """
+        :param pool: The pool to read and write the tickets with.
+        :type pool: :class:`InstrumentedPool`
+        :param queries: The queries of the bot.
+        :type queries: :class:`QueryRegistry`
+        """
+
+        self.pool: InstrumentedPool = pool
+        self.queries: QueryRegistry = queries
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.loaded: bool = False
+
+        self._tickets: Dict[int, TicketState] = {}
+        # (guild id, owner id): channels of the tickets counted against the owner.
+        self._owners: Dict[Tuple[int, int], Set[int]] = {}
+        # Bumped by every write, refreshes that started before it are dropped.
+        self._generation: int = 0
+
+    def _add(self, ticket: TicketState, /) -> None:
+        self._remove(ticket.channel_id)
+
+        if not ticket.is_open:
+            return
+
+        self._tickets[ticket.channel_id] = ticket
+
+        if ticket.counts:
+            self._owners.setdefault((ticket.guild_id, ticket.owner_id), set()).add(ticket.channel_id)
+
+    def _remove(self, channel_id: int, /) -> None:
+        ticket = self._tickets.pop(channel_id, None)
+
+        if ticket is None or not ticket.counts:
+            return
+
+        key = (ticket.guild_id, ticket.owner_id)
+        channels = self._owners.get(key)
+
+        if channels is not None:
+            channels.discard(channel_id)
+
+            if not channels:
+                del self._owners[key]
+
+    async def load(self) -> int:
+        """|coro|
+
+        Reads every open and valid ticket.
+
+        :return: The amount of loaded tickets.
+        :rtype: int
+        """
+
+        log = getLogger("xynus.db")
+        start_time = perf_counter()
+
+        async with self.pool.acquire() as conn:
+            records = await self.queries.fetch(conn, "tickets/get_open_tickets")
+
+        for record in records:
+            # Written meanwhile, the index is newer.
+            if record["channel_id"] not in self._tickets:
+                self._add(TicketState.from_record(record))
+
+        self.loaded = True
+
+        taked_time = round((perf_counter() - start_time) * 1000, 3)
+        log.info(f"Indexed {len(records)} open ticket(s) in {taked_time}ms")
+
+        return len(records)
+
+    async def get(self, channel_id: int, /) -> Optional[TicketState]:
+        """|coro|
+
+        Returns the ticket of a channel, reading it if it isn't indexed.
+
+        :param channel_id: The id of the ticket channel.
+        :type channel_id: int
+        :return: The ticket, ``None`` if the channel isn't one.
+        :rtype: Optional[:class:`TicketState`]
+        """
+
+        ticket = self._tickets.get(channel_id)
+
+        if ticket is not None:
+            self.hits += 1
+            return ticket
+
+        self.misses += 1
+
+        async with self.pool.acquire() as conn:
+            record = await self.queries.fetchrow(conn, "tickets/get_ticket", channel_id)
+
+        if record is None:
+            return None
+
+        ticket = TicketState.from_record(record)
+
+        # Written meanwhile, the index is newer.
+        if channel_id in self._tickets:
+            return self._tickets[channel_id]
+
+        self._add(ticket)
+        return ticket
+
+    async def has_open_ticket(self, guild_id: int, owner_id: int, /) -> bool:
+        """|coro|
+
+        Returns whether a member has a ticket counted against them in a guild.
+
+        :param guild_id: The id of the guild.
+        :type guild_id: int
+        :param owner_id: The id of the member.
+        :type owner_id: int
+        :rtype: bool
+        """
+
+        if self.loaded:
+            self.hits += 1
+            return (guild_id, owner_id) in self._owners
+
+        self.misses += 1
+
+        async with self.pool.acquire() as conn:
+            records = await self.queries.fetch(conn, "tickets/get_open_tickets_of_owner", owner_id, guild_id)
+
+        return bool(records)
+
+    async def set(
+            self,
+            guild_id: int,
+            owner_id: int,
+            channel_id: int,
+            user_ids: Sequence[int],
+            is_open: bool,
+            is_valid: bool,
+            panel_id: str,
+            original_name: str
+    ) -> TicketState:
+        """|coro|
+
+        Creates a ticket or updates an existing one, in the database and the index.
+
+        Takes the parameters of ``tickets/set_ticket``, in the same order.
+
+        :rtype: :class:`TicketState`
+        """
+
+        ticket = TicketState(guild_id, owner_id, channel_id, user_ids, is_open, is_valid, panel_id, original_name)
+        self._generation += 1
+
+        async with self.pool.acquire() as conn:
+            await self.queries.execute(
+                conn,
+                "tickets/set_ticket",
+                guild_id,
+                owner_id,
+                channel_id,
+                list(ticket.user_ids),
+                is_open,
+                is_valid,
+                panel_id,
+                original_name
+            )
+
+        self._add(ticket)
+        return ticket
+
+    async def delete(self, channel_id: int, guild_id: int, /) -> None:
+        """|coro|
+
+        Deletes a ticket from the database and the index.
+
+        :param channel_id: The id of the ticket channel.
+        :type channel_id: int
+        :param guild_id: The id of the guild of the ticket.
+        :type guild_id: int
+        """
+
+        self._generation += 1
+
+        async with self.pool.acquire() as conn:
+            await self.queries.execute(conn, "tickets/delete_ticket", channel_id, guild_id)
+
+        self._remove(channel_id)
+
+    async def refresh(self, channel_id: Optional[int] = None, /) -> None:
+        """|coro|
+
+        Reads a ticket another process changed again.
+
+        :param channel_id: The id of the ticket channel, every ticket is read again when omitted.
+        :type channel_id: Optional[int]
+        """
+
+        if channel_id is None:
+            self._tickets.clear()
+            self._owners.clear()
+            self.loaded = False
+
+            await self.load()
+            return
+
+        while True:
+            generation = self._generation
+
+            async with self.pool.acquire() as conn:
+                record = await self.queries.fetchrow(conn, "tickets/get_ticket", channel_id)
+
+            # Written by the bot meanwhile, what was read may predate it.
+            if generation == self._generation:
+                break
+
+        if record is None:
+            self._remove(channel_id)
+        else:
+            self._add(TicketState.from_record(record))
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of lookups answered from memory."""
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self) -> str:
+        return f"<TicketIndex tickets={len(self._tickets)} owners={len(self._owners)} loaded={self.loaded}>"
@@ -13,8 +13,12 @@ from discord.sticker import GuildSticker, StickerItem
 from discord.ui import View
 from discord.utils import cached_property
 
+from ..utils.lazy import lazy_import
 from .embeds import ConfirmationEmbed
-from .views import ConfirmationView, ViewWithDeleteButton
+
+# The views pull in the modals and the KV layer,
+# they are only loaded once a context replies with one.
+_views = lazy_import(".views", __package__)
 
 if TYPE_CHECKING:
     from ..core import Xynus
@@ -172,11 +176,11 @@ class XynusContext(commands.Context):
             if kwargs.get("view"):
                 raise ValueError("'delete_button' and 'view' cannot be passed together.")
             
-            kwargs["view"] = ViewWithDeleteButton(self.author)
+            kwargs["view"] = _views.ViewWithDeleteButton(self.author)
             del kwargs["delete_button"]
 
         try:
-            if isinstance(kwargs.get("view"), ViewWithDeleteButton):
+            if isinstance(kwargs.get("view"), _views.ViewWithDeleteButton):
                 msg = await super().send(content, **kwargs)
                 kwargs["view"].message = msg
                 return msg
@@ -356,7 +360,7 @@ class XynusContext(commands.Context):
         """
 
         embed = ConfirmationEmbed(text, timeout)
-        view = ConfirmationView(ctx=self, owner_id=owner, timeout=timeout)
+        view = _views.ConfirmationView(ctx=self, owner_id=owner, timeout=timeout)
         try:
             view.message = await self.send(
                 embed=embed,
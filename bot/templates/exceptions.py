@@ -12,6 +12,12 @@ class XynusException(ClientException):
     __slots__: Tuple[str, ...] = tuple()
 
 
+class AssetError(XynusException):
+    """Raised when an asset file is missing or invalid."""
+
+    __slots__: Tuple[str, ...] = tuple()
+
+
 class XynusTracebackOptional(TypedDict, total=False):
     author: int
     guild: Optional[int]
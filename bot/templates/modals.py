@@ -7,7 +7,7 @@ from discord import (Color, Embed, Forbidden, HTTPException, Interaction,
 from discord.ui import Modal, TextInput, View
 
 from ..utils.config import Emojis
-from ..utils.functions import encrypt, find_command_name, to_boolean
+from ..utils.functions import find_command_name, to_boolean
 from .embeds import MappingInfoEmbed
 from .exceptions import InvalidModalField
 
@@ -83,7 +83,7 @@ class CommandEditModal(Modal, title="Edit the command"):
         command_name = find_command_name(self.command.value)
 
         
-        if not interaction.client.get_command(command_name):
+        if not interaction.client.command_registry.get(command_name):
             return await interaction.response.send_message(
                 f"Cannot map `{command_name[:20:]}` as it is not a valid command.",
                 ephemeral=True
@@ -121,7 +121,7 @@ class TriggerEditModal(Modal, title="Edit the trigger"):
     async def on_submit(self, interaction: Interaction) -> None:
         trigger = self.trigger.value.lower().replace(" ", "")
 
-        sticked_command = interaction.client.get_command(trigger)
+        sticked_command = interaction.client.command_registry.get(trigger)
         original_message = None
 
         if self.mode == "user":
@@ -130,11 +130,7 @@ class TriggerEditModal(Modal, title="Edit the trigger"):
             target_id = interaction.guild.id
 
 
-        data = interaction.client.db._traverse_dict(
-            interaction.client._cmd_mapping_cache,
-            [target_id, trigger],
-            True
-        ).get(trigger, None)
+        data = (await interaction.client.get_mappings(target_id)).get(trigger, None)
 
         if data:
             return await interaction.response.send_message(
@@ -664,53 +660,17 @@ class CustomTriggerModal(Modal, title=""):
 
         if self.import_type == "user":
             target_id = interaction.user.id
-            query = """
-            INSERT INTO mappings(
-                user_id,
-                trigger,
-                command,
-                created_at
-            )
-            SELECT 
-                $1,
-                $2,
-                command,
-                $3
-            
-            FROM mappings 
-            WHERE 
-                share_code = $4; 
-            """
+            query = "mappings/import_user_mapping"
         elif self.import_type == "guild":
             target_id = interaction.guild.id
-            query = """
-            INSERT INTO mappings(
-                guild_id,
-                trigger,
-                command,
-                created_at
-            )
-            SELECT 
-                $1,
-                $2,
-                command,
-                $3
-            
-            FROM mappings 
-            WHERE 
-                share_code = $4; 
-            """
+            query = "mappings/import_guild_mapping"
             
 
         new_trigger = self.new_trigger.value
         new_trigger = new_trigger.lower().replace(" ", "")[:20:]
         
 
-        data = interaction.client.db._traverse_dict(
-            interaction.client._cmd_mapping_cache,
-            [target_id ,new_trigger],
-            True
-        )
+        data = await interaction.client.get_mappings(target_id)
 
         
         if data.get(new_trigger):
@@ -720,15 +680,16 @@ class CustomTriggerModal(Modal, title=""):
             )
 
         async with interaction.client.pool.acquire() as conn:
-            await conn.fetch(
+            await interaction.client.queries.fetch(
+                conn,
                 query,
                 target_id,
-                encrypt(new_trigger),
+                new_trigger,
                 int(time()),
                 self.share_code
             )
         
-        interaction.client._cmd_mapping_cache[target_id][new_trigger] = self.command
+        interaction.client._cache_mapping(target_id, new_trigger, self.command)
 
         embed = Embed(
             color=interaction.client.color,
@@ -1,5 +1,6 @@
 from asyncio import sleep
 from copy import deepcopy
+from datetime import datetime
 from re import search as _search
 from string import Template
 from time import time
@@ -22,21 +23,17 @@ from discord.ui import Select as _Select
 from discord.ui import View as _View
 from discord.ui import button, select
 from discord.ui.item import Item
-from kv.kvpostgres import KVDatabase
 
 from bot import __version__ as version
 
 from ..utils.config import Emojis
-from ..utils.functions import chunker as _chunker
 from ..utils.functions import decrypt
 from ..utils.functions import disable_all_items as _disable_all_items
-from ..utils.functions import encrypt
-from ..utils.functions import get_all_commands as _get_all_commands
-from ..utils.functions import random_string
+from ..utils.functions import encrypt, random_string
+from ..utils.panels import TicketPanel
 from .buttons import DeleteButton, EditWithModalButton
 from .cooldowns import ticket_edit_cooldown
-from .embeds import (CommandsEmbed, DynamicHelpEmbed, ErrorEmbed,
-                     MappingInfoEmbed)
+from .embeds import DynamicHelpEmbed, ErrorEmbed, MappingInfoEmbed
 from .exceptions import CustomOnCooldownException
 from .modals import (AddFieldModal, CommandEditModal, CustomTriggerModal,
                      EditAuthorModal, EditEmbedModal, EditFieldModal,
@@ -45,6 +42,7 @@ from .modals import (AddFieldModal, CommandEditModal, CustomTriggerModal,
 if TYPE_CHECKING:
 
     from ..core import Xynus
+    from ..core.kvcache import CachedKV
     from .cogs import XynusCog
     from .context import XynusContext
 
@@ -369,60 +367,30 @@ class DuplicatedMappingView(BaseView):
                 )
             )
 
-        encrypted_trigger = encrypt(trigger+random_string(5))
+        trigger = trigger + random_string(5)
         if import_type == "user":
             target_id = inter.user.id
-            insertion_query = """
-            INSERT INTO mappings(
-                user_id,
-                trigger,
-                command,
-                created_at
-            )
-            SELECT 
-                $1,
-                $2,
-                command,
-                $3
-            FROM mappings 
-            WHERE 
-                share_code = $4; 
-            """
+            insertion_query = "mappings/import_user_mapping"
         elif import_type == "guild":
             target_id = inter.guild.id
-            insertion_query = """
-            INSERT INTO mappings(
-                guild_id,
-                trigger,
-                command,
-                created_at
-            )
-            SELECT 
-                $1,
-                $2,
-                command,
-                $3
-            FROM mappings 
-            WHERE 
-                share_code = $4; 
-            """
+            insertion_query = "mappings/import_guild_mapping"
 
         async with inter.client.pool.acquire() as conn:
-            await conn.fetch(
+            await inter.client.queries.fetch(
+                conn,
                 insertion_query,
                 target_id,
-                encrypted_trigger,
+                trigger,
                 int(time()),
                 share_code
             )
-        
-        decrypted_trigger = decrypt(encrypted_trigger)
-        inter.client._cmd_mapping_cache[target_id][decrypted_trigger] = command
+
+        inter.client._cache_mapping(target_id, trigger, command)
 
 
         embed = Embed(
             color=inter.client.color,
-            description=f"**Added {decrypted_trigger!r} to your mappings**"
+            description=f"**Added {trigger!r} to your mappings**"
         )
 
         await inter.response.edit_message(
@@ -471,41 +439,31 @@ class MappingsImportView(BaseView):
                 ephemeral=True
             )
         
-        conn = await inter.client.pool.acquire()
-
-        selection_query = """
-        SELECT * 
-        FROM mappings
-        WHERE share_code = $1;
-        """
-
-        record = await conn.fetchrow(
-            selection_query,
-            share_code
-        )
+        async with inter.client.pool.acquire() as conn:
+            record = await inter.client.queries.fetchrow(
+                conn,
+                "mappings/get_shared_mapping",
+                share_code
+            )
 
         if not record:
-            await inter.client.pool.release(conn)
             return await inter.response.send_message(
                 "Didn't find any mapping",
                 ephemeral=True
             )
         
-        trigger = decrypt(record["trigger"])
-        command = decrypt(record["command"])
+        trigger = record["trigger"]
+        command = record["command"]
 
-        data = inter.client.db._traverse_dict(
-            inter.client._cmd_mapping_cache,
-            [inter.user.id ,trigger],
-            True
-        )
+        data = await inter.client.get_mappings(inter.user.id)
 
         if data.get(trigger):
             view = DuplicatedMappingView(
                 share_code=share_code,
                 command=command,
                 trigger=trigger,
-                author=inter.user
+                author=inter.user,
+                import_type="user"
             )
 
             return await inter.response.send_message(
@@ -514,42 +472,20 @@ class MappingsImportView(BaseView):
                 ephemeral=True
             )
 
-        encrypted_trigger =  encrypt(trigger)
-
-        
-        insertion_query = """
-        INSERT INTO mappings(
-            user_id,
-            trigger,
-            command,
-            created_at
-        )
-        SELECT 
-            $1,
-            $2,
-            command,
-            $3
-        
-        FROM mappings 
-        WHERE 
-            share_code = $4; 
-        """
-
-        await conn.fetch(
-            insertion_query,
-            inter.user.id,
-            encrypted_trigger,
-            int(time()),
-            share_code
-        )
-
-        await inter.client.pool.release(conn)
+        async with inter.client.pool.acquire() as conn:
+            await inter.client.queries.fetch(
+                conn,
+                "mappings/import_user_mapping",
+                inter.user.id,
+                trigger,
+                int(time()),
+                share_code
+            )
         
-        decrypted_trigger = decrypt(encrypted_trigger)
-        inter.client._cmd_mapping_cache[inter.user.id][decrypted_trigger] = command
+        inter.client._cache_mapping(inter.user.id, trigger, command)
     
         await inter.response.send_message(
-            f"**Added {decrypted_trigger!r} to your mappings**",
+            f"**Added {trigger!r} to your mappings**",
             ephemeral=True
         )
 
@@ -583,35 +519,24 @@ class MappingImportSelectView(BaseView):
         value      = select.values[0]
         share_code = self.share_code
 
-        conn = await inter.client.pool.acquire()
         if value == "user":
-
-            selection_query = """
-            SELECT * 
-            FROM mappings
-            WHERE share_code = $1;
-            """
-
-            record = await conn.fetchrow(
-                selection_query,
-                share_code
-            )
+            async with inter.client.pool.acquire() as conn:
+                record = await inter.client.queries.fetchrow(
+                    conn,
+                    "mappings/get_shared_mapping",
+                    share_code
+                )
 
             if not record:
-                await inter.client.pool.release(conn)
                 return await inter.response.send_message(
                     "Didn't find any mapping",
                     ephemeral=True
                 )
             
-            trigger = decrypt(record["trigger"])
-            command = decrypt(record["command"])
+            trigger = record["trigger"]
+            command = record["command"]
 
-            data = inter.client.db._traverse_dict(
-                inter.client._cmd_mapping_cache,
-                [inter.user.id ,trigger],
-                True
-            )
+            data = await inter.client.get_mappings(inter.user.id)
 
             if data.get(trigger):
                 view = DuplicatedMappingView(
@@ -621,75 +546,44 @@ class MappingImportSelectView(BaseView):
                     author=inter.user,
                     import_type=value
                 )
-                await inter.client.pool.release(conn)
                 return await inter.response.edit_message(
                     content=f"Trigger {trigger!r} already exists, so choose an option:",
                     view=view,
                 )
 
-            encrypted_trigger = encrypt(trigger)
-
-            
-            insertion_query = """
-            INSERT INTO mappings(
-                user_id,
-                trigger,
-                command,
-                created_at
-            )
-            SELECT 
-                $1,
-                $2,
-                command,
-                $3
-            
-            FROM mappings 
-            WHERE 
-                share_code = $4; 
-            """
-
-            await conn.fetch(
-                insertion_query,
-                inter.user.id,
-                encrypted_trigger,
-                int(time()),
-                share_code
-            )
+            async with inter.client.pool.acquire() as conn:
+                await inter.client.queries.fetch(
+                    conn,
+                    "mappings/import_user_mapping",
+                    inter.user.id,
+                    trigger,
+                    int(time()),
+                    share_code
+                )
 
-            
-            decrypted_trigger = decrypt(encrypted_trigger)
-            inter.client._cmd_mapping_cache[inter.user.id][decrypted_trigger] = command
+            inter.client._cache_mapping(inter.user.id, trigger, command)
         
             await inter.response.edit_message(
-                content=f"**Added {decrypted_trigger!r} to your mappings**",
+                content=f"**Added {trigger!r} to your mappings**",
             )
         elif inter.guild and value == "guild" and inter.user.guild_permissions.manage_guild:
-            selection_query = """
-            SELECT * 
-            FROM mappings
-            WHERE share_code = $1;
-            """
-
-            record = await conn.fetchrow(
-                selection_query,
-                share_code
-            )
+            async with inter.client.pool.acquire() as conn:
+                record = await inter.client.queries.fetchrow(
+                    conn,
+                    "mappings/get_shared_mapping",
+                    share_code
+                )
 
             if not record:
-                await inter.client.pool.release(conn)
                 return await inter.response.send_message(
                     "Didn't find any mapping",
                     ephemeral=True
                 )
             
-            trigger = decrypt(record["trigger"])
-            command = decrypt(record["command"])
+            trigger = record["trigger"]
+            command = record["command"]
 
-            data = inter.client.db._traverse_dict(
-                inter.client._cmd_mapping_cache,
-                [inter.guild.id ,trigger],
-                True
-            )
+            data = await inter.client.get_mappings(inter.guild.id)
 
             if data.get(trigger):
                 view = DuplicatedMappingView(
@@ -699,50 +593,26 @@ class MappingImportSelectView(BaseView):
                     author=inter.user,
                     import_type=value
                 )
-                await inter.client.pool.release(conn)
                 return await inter.response.edit_message(
                     content=f"Trigger {trigger!r} already exists, so choose an option:",
                     view=view,
                 )
 
-            encrypted_trigger = encrypt(trigger)
-
-            
-            insertion_query = """
-            INSERT INTO mappings(
-                guild_id,
-                trigger,
-                command,
-                created_at
-            )
-            SELECT 
-                $1,
-                $2,
-                command,
-                $3
-            
-            FROM mappings 
-            WHERE 
-                share_code = $4; 
-            """
-
-            await conn.fetch(
-                insertion_query,
-                inter.guild.id,
-                encrypted_trigger,
-                int(time()),
-                share_code
-            )
+            async with inter.client.pool.acquire() as conn:
+                await inter.client.queries.fetch(
+                    conn,
+                    "mappings/import_guild_mapping",
+                    inter.guild.id,
+                    trigger,
+                    int(time()),
+                    share_code
+                )
 
-            
-            decrypted_trigger = decrypt(encrypted_trigger)
-            inter.client._cmd_mapping_cache[inter.guild.id][decrypted_trigger] = command
+            inter.client._cache_mapping(inter.guild.id, trigger, command)
         
             await inter.response.edit_message(
-                content=f"**Added {decrypted_trigger!r} to mappings**",
+                content=f"**Added {trigger!r} to mappings**",
             )
-        
-        await inter.client.pool.release(conn)
             
 
 class DynamicHelpView(Pagination):
@@ -787,22 +657,16 @@ class DynamicHelpView(Pagination):
                 index: int,
                 cog: commands.Cog
         ): 
-            _commands = _get_all_commands(cog=cog)
-            name = cog.__cog_name__
-
-            chunks = _chunker(_commands, 10)
-
-            embed = CommandsEmbed(
-                commands=chunks[index],
-                title=f"Category: {name}",
-                prefix=prefix[0],
-                total_commands=len(_commands)
+            page, total_pages = client.command_registry.get_help_page(
+                cog.__cog_name__, index, prefix[0]
             )
 
+            embed = Embed.from_dict(page)
+            embed.timestamp = datetime.now()
+
             kwrgs = {
                 "embed": embed
             }
-            total_pages = len(chunks)
             if self.home:
 
                 kwrgs = {
@@ -1197,34 +1061,12 @@ class MappingEditView(BaseView):
         
         if self.mode == "user":
             target_id = inter.user.id
-            query = """
-            UPDATE mappings
-            SET 
-                trigger = $1,
-                command = $2
-            WHERE 
-                user_id = $3
-            AND 
-                trigger = $4;
-            """
+            query = "mappings/edit_user_mapping"
         elif self.mode == "guild":
             target_id = inter.guild.id
-            query = """
-            UPDATE mappings
-            SET 
-                trigger = $1,
-                command = $2
-            WHERE 
-                guild_id = $3
-            AND 
-                trigger = $4;
-            """
-
-        cached_maps: Dict[str, Any] = inter.client.db._traverse_dict(
-            inter.client._cmd_mapping_cache,
-            keys=[target_id],
-            create_missing=True
-        ).get(target_id)
+            query = "mappings/edit_guild_mapping"
+
+        cached_maps: Dict[str, Any] = await inter.client.get_mappings(target_id)
 
         if len(tuple(cached_maps.items())) > 30 and \
                 not await inter.client.is_owner(inter.user):
@@ -1237,20 +1079,21 @@ class MappingEditView(BaseView):
                 delete_button=True
             )
 
-        del inter.client._cmd_mapping_cache[target_id][self.prev_view.trigger]
+        inter.client._cache_mapping(target_id, self.prev_view.trigger, None)
         prev_trigger = self.prev_view.trigger
         self.prev_view.trigger = self.trigger
         self.prev_view.command = self.command
-        inter.client._cmd_mapping_cache[target_id][self.trigger] = self.command
+        inter.client._cache_mapping(target_id, self.trigger, self.command)
 
 
         async with inter.client.pool.acquire() as conn:
-            await conn.execute(
+            await inter.client.queries.execute(
+                conn,
                 query, 
-                encrypt(self.trigger),
-                encrypt(self.command),
+                self.trigger,
+                self.command,
                 target_id,
-                encrypt(prev_trigger)
+                prev_trigger
             )
 
         return await inter.response.edit_message(
@@ -1631,17 +1474,17 @@ class TicketOpenView(BaseView):
 
     def __init__(
             self,
-            data: Dict[str, Any],
+            data: Dict[str, TicketPanel],
     ):
         
         options = [
             SelectOption(
-                label=decrypt(value.get("panel_name")),
+                label=panel.name,
                 value=name,
-                emoji=value.get("emoji")
+                emoji=panel.emoji
             )
 
-            for name, value in data.items()
+            for name, panel in data.items()
             
         ]
 
@@ -1678,28 +1521,27 @@ class TicketOpenView(BaseView):
 
             uuid = self.values[0]
 
-            pool: Pool = inter.client.pool
-            db: KVDatabase = inter.client.db
+            db: "CachedKV" = inter.client.db
 
-            data: Optional[Dict[str, Any]] = await db.get(f"{inter.guild.id}.settings.tickets.{uuid}")
+            panel: Optional[TicketPanel] = await db.get_parsed(f"{inter.guild.id}.settings.tickets.{uuid}", TicketPanel)
 
             kwrgs = {
                 "username": inter.user.name,
                 "userid": inter.user.id,
                 "usermention": inter.user.mention,
-                "panelname": decrypt(data.get("panel_name")),
-                "panelemoji": data.get("emoji") or ""
+                "panelname": panel.name,
+                "panelemoji": panel.emoji or ""
             }
 
 
 
 
-            decrypted_opened_name_format = decrypt(data.get("opened_name_format"))
-            name = Template(decrypted_opened_name_format).safe_substitute(
+            # Formats saved empty are ``None``, they substitute to nothing.
+            name = panel.opened_name.safe_substitute(
                 **kwrgs   
-            )
+            ) if panel.opened_name else ""
 
-            category = inter.client.get_channel(data.get("opened_category_id"))
+            category = inter.client.get_channel(panel.opened_category_id)
 
             if category and not category.permissions_for(inter.guild.me).manage_channels:
                 category = None
@@ -1716,7 +1558,7 @@ class TicketOpenView(BaseView):
                 )
             }
 
-            for role_id in data.get("supporter_roles"):
+            for role_id in panel.supporter_roles:
                 
                 role = inter.guild.get_role(role_id)
 
@@ -1734,23 +1576,21 @@ class TicketOpenView(BaseView):
                 category=category
             )
 
-            decrypted_closed_name_format = decrypt(data.get("closed_name_format")) or ticket.name + "-closed"
+            closed_name_format = panel.closed_name or Template(ticket.name + "-closed")
 
 
             kwrgs = {
                 "username": inter.user.name,
                 "userid": inter.user.id,
                 "usermention": inter.user.mention,
-                "panelname": decrypt(data.get("panel_name")),
+                "panelname": panel.name,
                 "lastname": ticket.name,
             }
 
-            decrypted_closed_name = Template(decrypted_closed_name_format).safe_substitute(
+            decrypted_closed_name = closed_name_format.safe_substitute(
                 **kwrgs
             )
 
-            query = inter.client._load_query("set_ticket.sql")
-
             args = (
                 inter.guild.id,
                 inter.user.id,
@@ -1763,8 +1603,7 @@ class TicketOpenView(BaseView):
             )
 
 
-            async with pool.acquire() as conn:
-                await conn.execute(query, *args)
+            await inter.client.tickets.set(*args)
             await inter.edit_original_response(
                 content=f"Created your ticket {ticket.mention}",
                 view=None
@@ -1773,11 +1612,9 @@ class TicketOpenView(BaseView):
             kwrgs["channelname"] = ticket.name
             kwrgs["channelmention"] = ticket.mention
 
-            decrypted_message = decrypt(data.get("opened_message_content"))
-
-            content = Template(decrypted_message).safe_substitute(
+            content = panel.opened_message.safe_substitute(
                 **kwrgs
-            )
+            ) if panel.opened_message else ""
 
             await ticket.send(
                 content=content,
@@ -1796,25 +1633,15 @@ class TicketOpenView(BaseView):
                 ephemeral=True,
             )
         
-            query = """
-            SELECT channel_id 
-            FROM tickets 
-            WHERE owner_id = $1 
-            AND guild_id = $2
-            AND is_open = TRUE 
-            AND is_valid = TRUE;
-            """
     
 
-            async with interaction.client.pool.acquire() as conn:
-                results = await conn.fetch(
-                    query, 
-                    interaction.user.id, 
-                    interaction.guild.id
-                )
+            has_ticket = await interaction.client.tickets.has_open_ticket(
+                interaction.guild.id,
+                interaction.user.id
+            )
 
 
-            if results:
+            if has_ticket:
                 await interaction.edit_original_response(
                     content="You aleardy have a ticket",
                     view=None
@@ -1988,7 +1815,7 @@ class PersistentViews:
             inter: Interaction,
             btn: Button
         ):
-            data = await self.client.db.get(f"{inter.guild.id}.settings.tickets")
+            data = await self.client.db.get_parsed(f"{inter.guild.id}.settings.tickets", TicketPanel.from_panels)
             
             if not data:
                 return await inter.edit_original_response(
@@ -2011,25 +1838,15 @@ class PersistentViews:
                 thinking=True
             )
         
-            query = """
-            SELECT channel_id 
-            FROM tickets 
-            WHERE owner_id = $1 
-            AND guild_id = $2
-            AND is_open = TRUE 
-            AND is_valid = TRUE;
-            """
     
 
-            async with self.pool.acquire() as conn:
-                results = await conn.fetch(
-                    query, 
-                    interaction.user.id, 
-                    interaction.guild.id
-                )
+            has_ticket = await interaction.client.tickets.has_open_ticket(
+                interaction.guild.id,
+                interaction.user.id
+            )
 
 
-            if results:
+            if has_ticket:
                 await interaction.edit_original_response(
                     content="You already have a ticket"
                 )
@@ -2069,29 +1886,21 @@ class PersistentViews:
                     content="I don't have permission to do that."
                 )
 
-            query = """
-            SELECT *
-            FROM tickets
-            WHERE channel_id = $1
-            AND is_open = TRUE;
-            """
-            async with self.pool.acquire() as conn:
-                results = await conn.fetch(
-                    query,
-                    ticket.id
-                )
-
+            result = await inter.client.tickets.get(ticket.id)
 
-            result = results[0]
+            if result is None or not result.is_open:
+                return await inter.edit_original_response(
+                    content="This ticket is already closed."
+                )
 
 
-            owner_id = result["owner_id"]
-            user_ids = result["user_ids"]
-            panel_id = result["panel_id"]
-            encrypted_original_name = result["original_name"]
+            owner_id = result.owner_id
+            user_ids = result.user_ids
+            panel_id = result.panel_id
+            encrypted_original_name = result.original_name
             original_name = decrypt(encrypted_original_name)
 
-            data = await inter.client.db.get(f"{inter.guild.id}.settings.tickets.{panel_id}")
+            panel = await inter.client.db.get_parsed(f"{inter.guild.id}.settings.tickets.{panel_id}", TicketPanel)
 
             
 
@@ -2118,9 +1927,7 @@ class PersistentViews:
                 )
                 
 
-            data = await inter.client.db.get(f"{inter.guild_id}.settings.tickets.{panel_id}")
-
-            category = inter.client.get_channel(data.get("closed_category_id"))
+            category = inter.client.get_channel(panel.closed_category_id)
 
             if category and not category.permissions_for(inter.guild.me).manage_channels:
                 category = None
@@ -2143,12 +1950,7 @@ class PersistentViews:
                 encrypted_original_name
             )
 
-            query = self.client._load_query("set_ticket.sql")
-            async with self.pool.acquire() as conn:
-                await conn.execute(
-                    query,
-                    *args
-                )
+            await inter.client.tickets.set(*args)
 
 
             await inter.edit_original_response(
@@ -2171,20 +1973,10 @@ class PersistentViews:
                 ephemeral=True
             )
 
-            query = """
-            SELECT *
-            FROM tickets
-            WHERE channel_id = $1
-            AND is_open = TRUE;
-            """
 
-            async with self.pool.acquire() as conn:
-                results = await conn.fetch(
-                    query,
-                    interaction.channel.id
-                )
+            result = await interaction.client.tickets.get(interaction.channel.id)
 
-            if not results:
+            if result is None or not result.is_open:
                 await interaction.edit_original_response(
                     content="This ticket is already closed."
                 )
@@ -2261,18 +2053,11 @@ class PersistentViews:
             except (HTTPException, Forbidden):
                 pass
 
-            query = """
-            DELETE FROM tickets
-            WHERE channel_id = $1
-            AND guild_id = $2;
-            """
-
-            async with self.pool.acquire() as conn:
-                await conn.execute(
-                    query,
-                    inter.channel_id,
-                    inter.guild_id
-                )
+
+            await inter.client.tickets.delete(
+                inter.channel_id,
+                inter.guild_id
+            )
 
 
             
@@ -2294,27 +2079,19 @@ class PersistentViews:
                     content="I don't have permission to do that."
                 )
 
-            query = """
-            SELECT *
-            FROM tickets
-            WHERE channel_id = $1
-            AND is_open = FALSE;
-            """
-            async with self.pool.acquire() as conn:
-                results = await conn.fetch(
-                    query,
-                    ticket.id
-                )
-
+            result = await inter.client.tickets.get(ticket.id)
 
-            result = results[0]
+            if result is None or result.is_open:
+                return await inter.edit_original_response(
+                    content="This ticket is not closed"
+                )
 
 
-            owner_id = result["owner_id"]
-            user_ids = result["user_ids"]
-            panel_id = result["panel_id"]
+            owner_id = result.owner_id
+            user_ids = result.user_ids
+            panel_id = result.panel_id
 
-            data = await inter.client.db.get(f"{inter.guild.id}.settings.tickets.{panel_id}")
+            panel = await inter.client.db.get_parsed(f"{inter.guild.id}.settings.tickets.{panel_id}", TicketPanel)
 
             
 
@@ -2341,14 +2118,12 @@ class PersistentViews:
                 )
                 
 
-            data = await inter.client.db.get(f"{inter.guild_id}.settings.tickets.{panel_id}")
-
-            category = inter.client.get_channel(data.get("opened_category_id"))
+            category = inter.client.get_channel(panel.opened_category_id)
 
             if category and not category.permissions_for(inter.guild.me).manage_channels:
                 category = None
 
-            decrypted_opened_name = decrypt(data.get("opened_name_format")) or ticket.name
+            opened_name = panel.opened_name or Template(ticket.name)
             
             
             user = await inter.client.fetch_user(owner_id)
@@ -2356,12 +2131,12 @@ class PersistentViews:
                 "username": user.name,
                 "userid": user.id,
                 "usermention": user.mention,
-                "panelname": decrypt(data.get("panel_name")),
+                "panelname": panel.name,
                 "lastname": ticket.name,
-                "panelemoji": data.get("emoji") or ""
+                "panelemoji": panel.emoji or ""
             }
 
-            opened_name_format = Template(decrypted_opened_name).safe_substitute(
+            opened_name_format = opened_name.safe_substitute(
                 **kwrgs
             )
 
@@ -2382,12 +2157,7 @@ class PersistentViews:
                 encrypt(opened_name_format)
             )
 
-            query = self.client._load_query("set_ticket.sql")
-            async with self.pool.acquire() as conn:
-                await conn.execute(
-                    query,
-                    *args
-                )
+            await inter.client.tickets.set(*args)
 
             self.message = inter.message
             await _disable_all_items(self)
@@ -2407,18 +2177,8 @@ class PersistentViews:
             
             await interaction.response.defer()
 
-            query = """
-            SELECT * 
-            FROM tickets
-            WHERE channel_id = $1
-            AND is_open = FALSE;
-            """
             
-            async with self.pool.acquire() as conn:
-                results = await conn.fetch(
-                    query,
-                    interaction.channel_id
-                )
+            result = await interaction.client.tickets.get(interaction.channel_id)
 
             if not interaction.channel.permissions_for(interaction.guild.me).manage_channels:
 
@@ -2428,7 +2188,7 @@ class PersistentViews:
                 )
 
 
-            if not results:
+            if result is None or result.is_open:
                 await interaction.edit_original_response(
                     view=None,
                     content="This ticket is not closed"
@@ -0,0 +1,202 @@
+from hashlib import sha256 as _sha256
+from os import path as _path
+from os import walk as _walk
+from re import compile as _compile
+from typing import Dict as _Dict
+from typing import Iterable as _Iterable
+from typing import Optional as _Optional
+from typing import Tuple as _Tuple
+
+from discord import PartialEmoji as _PartialEmoji
+from yaml import SafeLoader as _SafeLoader
+from yaml import YAMLError as _YAMLError
+from yaml import load as _load
+
+from ..templates.exceptions import AssetError
+
+__all__: _Tuple[str, ...] = (
+    "AssetRegistry",
+    "SQLQuery",
+    "assets",
+)
+
+_PARAMETER_PATTERN = _compile(r"\$([1-9][0-9]*)")
+
+
+class SQLQuery(str):
+    """The text of a SQL file, along with where it came from.
+
+    It is a plain :class:`str`, so it can be passed to asyncpg as is.
+    """
+
+    name: str
+    parameters: int
+
+    def __new__(cls, text: str, name: str, /) -> "SQLQuery":
+        query = super().__new__(cls, text)
+
+        query.name = name
+        query.parameters = max(
+            (int(number) for number in _PARAMETER_PATTERN.findall(text)),
+            default=0
+        )
+
+        return query
+
+
+class AssetRegistry:
+    """The static files of the bot, read once and kept in memory.
+
+    Holds the emojis of ``data/emojis.yml`` as :class:`discord.PartialEmoji`
+    and every ``.sql`` file under ``sql/``, queries are looked up by their
+    path relative to ``sql/`` or by their file name alone.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "root",
+        "emojis",
+        "queries",
+        "fingerprint",
+        "_aliases",
+        "_loaded",
+    )
+
+    def __init__(self, root: str = ".", /) -> None:
+        """
+        :param root: The directory containing ``data/`` and ``sql/``.
+        :type root: str
+        """
+
+        self.root: str = root
+        self.emojis: _Dict[str, _PartialEmoji] = {}
+        self.queries: _Dict[str, SQLQuery] = {}
+        self.fingerprint: _Optional[str] = None
+
+        # File names mapped to the path of the only file with that name.
+        self._aliases: _Dict[str, str] = {}
+        self._loaded: bool = False
+
+    def load(self) -> str:
+        """Reads every asset, even if they were loaded already.
+
+        :raises AssetError: An asset is missing or invalid.
+        :return: The fingerprint of the assets.
+        :rtype: str
+        """
+
+        digest = _sha256()
+
+        emojis_path = _path.join(self.root, "data", "emojis.yml")
+        emojis_data = self._read(emojis_path)
+        digest.update(b"data/emojis.yml\0" + emojis_data)
+
+        try:
+            raw_emojis = _load(emojis_data, Loader=_SafeLoader) or {}
+        except _YAMLError as err:
+            raise AssetError(f"Invalid emoji file {emojis_path}: {err}") from err
+
+        emojis = {
+            key: _PartialEmoji.from_str(str(value))
+            for key, value in raw_emojis.items()
+        }
+
+        queries: _Dict[str, SQLQuery] = {}
+        aliases: _Dict[str, _Optional[str]] = {}
+        sql_root = _path.join(self.root, "sql")
+
+        for dirpath, dirnames, filenames in _walk(sql_root):
+            dirnames.sort()
+
+            for filename in sorted(filenames):
+                if not filename.endswith(".sql"):
+                    continue
+
+                file_path = _path.join(dirpath, filename)
+                name = _path.relpath(file_path, sql_root).replace(_path.sep, "/")
+                data = self._read(file_path)
+
+                digest.update(f"sql/{name}\0".encode() + data)
+
+                text = data.decode().strip()
+
+                if not text:
+                    raise AssetError(f"Empty SQL file {file_path}")
+
+                queries[name] = SQLQuery(text, name)
+
+                # Names shared by several files can only be used with their path.
+                aliases[filename] = None if filename in aliases else name
+
+        self.emojis = emojis
+        self.queries = queries
+        self._aliases = {
+            filename: name
+            for filename, name in aliases.items()
+            if name is not None
+        }
+        self.fingerprint = digest.hexdigest()
+        self._loaded = True
+
+        return self.fingerprint
+
+    def _read(self, file_path: str, /) -> bytes:
+        try:
+            with open(file_path, "rb") as fp:
+                return fp.read()
+        except OSError as err:
+            raise AssetError(f"Failed to read asset {file_path}: {err}") from err
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def get_emoji(self, key: str, /) -> _Optional[_PartialEmoji]:
+        """Returns an emoji of ``data/emojis.yml``.
+
+        :param key: The key of the emoji.
+        :type key: str
+        :rtype: Optional[:class:`discord.PartialEmoji`]
+        """
+
+        self._ensure_loaded()
+        return self.emojis.get(key)
+
+    def get_query(self, name: str, /) -> SQLQuery:
+        """Returns the text of a SQL file.
+
+        :param name: The file name or the path relative to ``sql/``.
+        :type name: str
+        :raises AssetError: There is no such SQL file.
+        :rtype: :class:`SQLQuery`
+        """
+
+        self._ensure_loaded()
+
+        try:
+            return self.queries[self._aliases.get(name, name)]
+        except KeyError:
+            raise AssetError(f"Unknown SQL file {name!r}") from None
+
+    def require_queries(self, names: _Iterable[str], /) -> None:
+        """Makes sure that the given SQL files exist.
+
+        :param names: The file names or paths relative to ``sql/``.
+        :type names: Iterable[str]
+        :raises AssetError: Some of the files are missing.
+        """
+
+        self._ensure_loaded()
+
+        missing = [
+            name for name in names
+            if self._aliases.get(name, name) not in self.queries
+        ]
+
+        if missing:
+            raise AssetError("Missing SQL files: {}".format(", ".join(missing)))
+
+    def __repr__(self) -> str:
+        return f"<AssetRegistry emojis={len(self.emojis)} queries={len(self.queries)} fingerprint={self.fingerprint!r}>"
+
+
+assets = AssetRegistry()
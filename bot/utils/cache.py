@@ -0,0 +1,385 @@
+from asyncio import Future as _Future
+from asyncio import get_running_loop as _get_running_loop
+from collections import OrderedDict as _OrderedDict
+from sys import getrefcount as _getrefcount
+from sys import getsizeof as _getsizeof
+from sys import intern as _intern
+from time import monotonic as _monotonic
+from typing import Any as _Any
+from typing import Awaitable as _Awaitable
+from typing import Callable as _Callable
+from typing import Dict as _Dict
+from typing import Generic as _Generic
+from typing import Hashable as _Hashable
+from typing import Iterable as _Iterable
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Set as _Set
+from typing import Tuple as _Tuple
+from typing import TypeVar as _TypeVar
+
+__all__: _Tuple[str, ...] = (
+    "Interner",
+    "ScopedCache",
+    "sizeof",
+)
+
+K = _TypeVar("K", bound=_Hashable)
+V = _TypeVar("V")
+
+# Stored for the scopes that have nothing, so they aren't looked up again.
+_NEGATIVE = object()
+
+
+def sizeof(value: _Any, /) -> int:
+    """Roughly estimates the memory used by a value and the containers in it.
+
+    :param value: The value to measure.
+    :type value: Any
+    :rtype: int
+    """
+
+    size = _getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(sizeof(key) + sizeof(item) for key, item in value.items())
+    elif isinstance(value, (tuple, list, set, frozenset)):
+        size += sum(sizeof(item) for item in value)
+
+    return size
+
+
+class Interner:
+    """Shares equal tuples of strings, e.g. the prefixes of many scopes.
+
+    Most scopes use one of a handful of prefix tuples, every scope gets
+    the same tuple instead of its own copy. Tuples nothing else uses
+    anymore are dropped once the table has doubled in size.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "_values",
+        "_prune_at",
+    )
+
+    def __init__(self) -> None:
+        self._values: _Dict[_Tuple[str, ...], _Tuple[str, ...]] = {}
+        self._prune_at: int = 1024
+
+    def intern(self, value: _Tuple[str, ...], /) -> _Tuple[str, ...]:
+        """Returns the shared tuple equal to ``value``.
+
+        :param value: The tuple of strings.
+        :type value: Tuple[str, ...]
+        :rtype: Tuple[str, ...]
+        """
+
+        shared = self._values.get(value)
+
+        if shared is None:
+            shared = tuple(_intern(item) for item in value)
+            self._values[shared] = shared
+
+            if len(self._values) >= self._prune_at:
+                self.prune()
+
+        return shared
+
+    def prune(self) -> None:
+        """Drops the tuples that are only referenced by the interner."""
+
+        # Held twice by the dict, once by the loop and once by getrefcount's argument.
+        self._values = {
+            value: value for value in self._values.values()
+            if _getrefcount(value) > 4
+        }
+        self._prune_at = max(1024, len(self._values) * 2)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class ScopedCache(_Generic[K, V]):
+    """An LRU cache of per-scope settings (e.g. the prefixes of a guild or user).
+
+    Scopes that aren't cached are read through ``loader`` on :meth:`fetch`,
+    scopes the loader has nothing for are cached as empty too. Entries
+    expire after ``ttl`` seconds and the least recently used ones are
+    evicted past ``max_entries`` or ``max_bytes``.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "loader",
+        "max_entries",
+        "max_bytes",
+        "ttl",
+        "hits",
+        "misses",
+        "loads",
+        "evictions",
+        "_sizeof",
+        "_entries",
+        "_size",
+        "_pending",
+        "_stale",
+    )
+
+    def __init__(
+            self,
+            loader: _Callable[[_List[K]], _Awaitable[_Dict[K, V]]],
+            /,
+            *,
+            max_entries: _Optional[int] = None,
+            max_bytes: _Optional[int] = None,
+            ttl: _Optional[float] = None,
+            sizeof: _Callable[[_Any], int] = sizeof
+    ) -> None:
+        """
+        :param loader: Reads the given scopes, the ones it leaves out have nothing.
+        :type loader: Callable[[List[K]], Awaitable[Dict[K, V]]]
+        :param max_entries: The maximum amount of cached scopes.
+        :type max_entries: Optional[int]
+        :param max_bytes: The estimated memory the cached values may use.
+        :type max_bytes: Optional[int]
+        :param ttl: How many seconds a scope stays cached.
+        :type ttl: Optional[float]
+        :param sizeof: Estimates the memory used by a value.
+        :type sizeof: Callable[[Any], int]
+        """
+
+        self.loader: _Callable[[_List[K]], _Awaitable[_Dict[K, V]]] = loader
+        self.max_entries: _Optional[int] = max_entries
+        self.max_bytes: _Optional[int] = max_bytes
+        self.ttl: _Optional[float] = ttl
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.loads: int = 0
+        self.evictions: int = 0
+
+        self._sizeof: _Callable[[_Any], int] = sizeof
+        # key: (value, expires at, size)
+        self._entries: _OrderedDict[K, _Tuple[_Any, float, int]] = _OrderedDict()
+        self._size: int = 0
+        self._pending: _Dict[K, _Future] = {}
+        # Scopes written to while they were being loaded.
+        self._stale: _Set[K] = set()
+
+    def _lookup(self, key: K, /) -> _Any:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        if entry[1] <= _monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _remove(self, key: K, /) -> None:
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self._size -= entry[2]
+
+    def _evict(self) -> None:
+        while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and self._size > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def get(self, key: K, default: _Any = None, /) -> _Any:
+        """Returns the cached value of a scope without loading it.
+
+        :param key: The scope.
+        :param default: Returned for scopes that aren't cached or have nothing.
+        """
+
+        value = self._lookup(key)
+
+        if value is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        return default if value is _NEGATIVE else value
+
+    def set(self, key: K, value: _Optional[V], /) -> None:
+        """Caches the value of a scope.
+
+        :param key: The scope.
+        :param value: The value, ``None`` if the scope has nothing.
+        """
+
+        stored = _NEGATIVE if value is None else value
+        size = 0 if value is None else self._sizeof(value)
+        expires_at = _monotonic() + self.ttl if self.ttl is not None else float("inf")
+
+        self._remove(key)
+        self._entries[key] = (stored, expires_at, size)
+        self._size += size
+
+        self._evict()
+
+    def update(self, key: K, value: _Optional[V], /) -> bool:
+        """Caches the new value of a scope only if the scope is cached already.
+
+        Writes to scopes that aren't cached can be skipped,
+        they will be read as they are on their next use.
+
+        :param key: The scope.
+        :param value: The value, ``None`` if the scope has nothing.
+        :return: Whether the value was cached.
+        :rtype: bool
+        """
+
+        if self._lookup(key) is None:
+            if key in self._pending:
+                self._stale.add(key)
+
+            return False
+
+        self.set(key, value)
+        return True
+
+    def discard(self, key: K, /) -> None:
+        """Removes a scope from the cache.
+
+        :param key: The scope.
+        """
+
+        self._remove(key)
+
+        if key in self._pending:
+            self._stale.add(key)
+
+    def clear(self) -> None:
+        """Removes every scope from the cache."""
+
+        self._entries.clear()
+        self._size = 0
+        self._stale.update(self._pending)
+
+    async def fetch(self, key: K, /) -> _Optional[V]:
+        """|coro|
+
+        Returns the value of a scope, loading it if it isn't cached.
+
+        :param key: The scope.
+        :return: The value, ``None`` if the scope has nothing.
+        """
+
+        return (await self.fetch_many((key,)))[key]
+
+    async def fetch_many(self, keys: _Iterable[K], /) -> _Dict[K, _Optional[V]]:
+        """|coro|
+
+        Returns the values of several scopes, loading the missing ones at once.
+
+        Scopes that are already being loaded aren't loaded twice.
+
+        :param keys: The scopes.
+        :return: The scopes mapped to their values, ``None`` for the ones that have nothing.
+        """
+
+        results: _Dict[K, _Optional[V]] = {}
+        missing: _List[K] = []
+        pending: _Dict[K, _Future] = {}
+
+        for key in keys:
+            value = self._lookup(key)
+
+            if value is not None:
+                self.hits += 1
+                results[key] = None if value is _NEGATIVE else value
+            elif key in self._pending:
+                self.hits += 1
+                pending[key] = self._pending[key]
+            elif key not in missing:
+                self.misses += 1
+                missing.append(key)
+
+        if missing:
+            future = _get_running_loop().create_future()
+
+            for key in missing:
+                self._pending[key] = future
+
+            try:
+                loaded = await self.loader(missing)
+                self.loads += 1
+
+                for key in missing:
+                    value = loaded.get(key)
+                    results[key] = value
+
+                    # What was loaded may predate the write, the next use reads it again.
+                    if key not in self._stale and key not in self._entries:
+                        self.set(key, value)
+
+                future.set_result(loaded)
+
+            except Exception as err:
+                future.set_exception(err)
+                # Only raised by the ones waiting for it.
+                future.exception()
+                raise
+
+            except BaseException:
+                future.cancel()
+                raise
+
+            finally:
+                for key in missing:
+                    self._pending.pop(key, None)
+                    self._stale.discard(key)
+
+        for key, future in pending.items():
+            results[key] = (await future).get(key)
+
+        return results
+
+    def items(self) -> _List[_Tuple[K, _Optional[V]]]:
+        """Returns the cached scopes with their values, ``None`` for the ones that have nothing.
+
+        :rtype: List[Tuple[K, Optional[V]]]
+        """
+
+        now = _monotonic()
+
+        return [
+            (key, None if entry[0] is _NEGATIVE else entry[0])
+            for key, entry in self._entries.items()
+            if entry[1] > now
+        ]
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] > _monotonic()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """The estimated memory used by the cached values."""
+
+        return self._size
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of lookups that didn't need to load anything."""
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<ScopedCache entries={len(self._entries)} size={self._size} "
+            f"hits={self.hits} misses={self.misses} evictions={self.evictions}>"
+        )
@@ -0,0 +1,153 @@
+from heapq import nsmallest as _nsmallest
+from typing import Dict as _Dict
+from typing import FrozenSet as _FrozenSet
+from typing import Hashable as _Hashable
+from typing import Iterable as _Iterable
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Sequence as _Sequence
+from typing import Tuple as _Tuple
+
+__all__: _Tuple[str, ...] = (
+    "CompletionIndex",
+)
+
+# Substrings up to this length are indexed, longer queries
+# are looked up by their head and filtered afterwards.
+_INDEXED_LENGTH = 3
+
+# How many users keep their last query around.
+_MAX_SESSIONS = 512
+
+
+class CompletionIndex:
+    """An index answering autocompletes over a fixed list of names.
+
+    Each name is matched with its own keys (e.g. a command's name and aliases),
+    matches are ranked from exact matches down to substrings of an alias.
+    The last query of every user is kept, so typing one more character
+    only filters the previous candidates.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "_names",
+        "_keys",
+        "_substrings",
+        "_sessions",
+    )
+
+    def __init__(self, entries: _Iterable[_Tuple[str, _Sequence[str]]], /) -> None:
+        """
+        :param entries: ``(name, keys)`` pairs in their default order, the name is matched too.
+        :type entries: Iterable[Tuple[str, Sequence[str]]]
+        """
+
+        self._names: _Tuple[str, ...] = tuple()
+        self._keys: _List[_Tuple[str, ...]] = []
+        self._substrings: _Dict[str, _FrozenSet[int]] = {}
+        self._sessions: _Dict[_Hashable, _Tuple[str, _FrozenSet[int]]] = {}
+
+        names = []
+        substrings: _Dict[str, set] = {}
+
+        for index, (name, keys) in enumerate(entries):
+            keys = tuple(dict.fromkeys(key.lower() for key in (name, *keys)))
+
+            names.append(name)
+            self._keys.append(keys)
+
+            for key in keys:
+                for start in range(len(key)):
+                    for end in range(start + 1, min(start + _INDEXED_LENGTH, len(key)) + 1):
+                        substrings.setdefault(key[start:end], set()).add(index)
+
+        self._names = tuple(names)
+        self._substrings = {
+            substring: frozenset(indexes)
+            for substring, indexes in substrings.items()
+        }
+
+    def _candidates(self, query: str, owner: _Optional[_Hashable]) -> _FrozenSet[int]:
+        candidates = self._substrings.get(query[:_INDEXED_LENGTH], frozenset())
+
+        if len(query) > _INDEXED_LENGTH:
+            last_query, last_candidates = self._sessions.get(owner, ("", None))
+
+            # Whatever contains the new query contains the old one too.
+            if last_candidates is not None and len(last_query) > _INDEXED_LENGTH \
+                    and query.startswith(last_query):
+                candidates = last_candidates
+
+            candidates = frozenset(
+                index for index in candidates
+                if any(query in key for key in self._keys[index])
+            )
+
+        if owner is not None:
+            self._sessions.pop(owner, None)
+
+            if len(self._sessions) >= _MAX_SESSIONS:
+                del self._sessions[next(iter(self._sessions))]
+
+            self._sessions[owner] = (query, candidates)
+
+        return candidates
+
+    def _rank(self, index: int, query: str) -> _Tuple[int, int, int]:
+        name, *aliases = self._keys[index]
+        last_word = name.rsplit(" ", 1)[-1]
+
+        if query in (name, last_word):
+            tier = 0
+        elif last_word.startswith(query) or name.startswith(query):
+            tier = 1
+        elif any(alias == query or alias.startswith(query) for alias in aliases):
+            tier = 2
+        elif f" {query}" in name:
+            tier = 3
+        elif query in name:
+            tier = 4
+        else:
+            tier = 5
+
+        return tier, len(name), index
+
+    def complete(
+            self,
+            query: str,
+            /,
+            owner: _Optional[_Hashable] = None,
+            limit: int = 25
+    ) -> _List[str]:
+        """Returns the names matching ``query``, the most relevant first.
+
+        :param query: What has been typed so far.
+        :type query: str
+        :param owner: Who is typing, their last query is used to narrow this one down.
+        :type owner: Optional[Hashable]
+        :param limit: The maximum amount of names to return.
+        :type limit: int
+        :rtype: List[str]
+        """
+
+        query = " ".join(query.split()).lower()
+
+        if not query:
+            if owner is not None:
+                self._sessions.pop(owner, None)
+
+            return [*self._names[:limit]]
+
+        ranked = _nsmallest(
+            limit,
+            self._candidates(query, owner),
+            key=lambda index: self._rank(index, query)
+        )
+
+        return [self._names[index] for index in ranked]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"<CompletionIndex names={len(self._names)}>"
@@ -1,19 +1,21 @@
-from typing import Any, Dict, Optional, Union
+from typing import Optional
 
+from discord import PartialEmoji
+
+from .assets import assets
 
-class Emojis:
 
-    def __init__(self) -> None:
-        from .functions import load_yaml
+class Emojis:
+    """The emojis of ``data/emojis.yml``.
 
+    Every instance reads from the asset registry,
+    so the file is only parsed once per process.
+    """
 
-        self._config = load_yaml("./data/emojis.yml")
-    
     def get(
             self,
             key: str, 
             /
-    ) -> Union[None, Any]:
-
-        return self._config.get(key)
+    ) -> Optional[PartialEmoji]:
 
+        return assets.get_emoji(key)
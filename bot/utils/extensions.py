@@ -0,0 +1,88 @@
+from ast import Assign as _Assign
+from ast import literal_eval as _literal_eval
+from ast import parse as _parse
+from importlib.util import find_spec as _find_spec
+from typing import Dict as _Dict
+from typing import Iterable as _Iterable
+from typing import List as _List
+from typing import Tuple as _Tuple
+
+__all__: _Tuple[str, ...] = (
+    "get_requirements",
+    "load_order",
+)
+
+
+def get_requirements(name: str, /) -> _Tuple[str, ...]:
+    """Reads the ``__requires__`` of an extension without importing it.
+
+    Extensions can declare the extensions they have to be loaded after::
+
+        __requires__ = ("extensions.messages.tools",)
+
+    :param name: The dotted name of the extension.
+    :type name: str
+    :return: The names of the required extensions.
+    :rtype: Tuple[str, ...]
+    """
+
+    spec = _find_spec(name)
+
+    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+        return tuple()
+
+    with open(spec.origin, "r", encoding="utf-8") as fp:
+        tree = _parse(fp.read(), filename=spec.origin)
+
+    for node in tree.body:
+        if not isinstance(node, _Assign):
+            continue
+
+        if any(getattr(target, "id", None) == "__requires__" for target in node.targets):
+            requires = _literal_eval(node.value)
+
+            if isinstance(requires, str):
+                return (requires,)
+
+            return tuple(requires)
+
+    return tuple()
+
+
+def load_order(requirements: _Dict[str, _Iterable[str]], /) -> _List[_Tuple[str, ...]]:
+    """Groups extensions into waves that can be loaded concurrently.
+
+    Every extension comes after the extensions it requires,
+    requirements that are not part of ``requirements`` are ignored.
+
+    :param requirements: The extension names mapped to the names they require.
+    :type requirements: Dict[str, Iterable[str]]
+    :raises ValueError: The requirements are circular.
+    :return: The waves, in loading order.
+    :rtype: List[Tuple[str, ...]]
+    """
+
+    pending = {
+        name: {required for required in requires if required in requirements and required != name}
+        for name, requires in requirements.items()
+    }
+
+    waves = []
+
+    while pending:
+        wave = tuple(name for name, requires in pending.items() if not requires)
+
+        if not wave:
+            raise ValueError(
+                "Circular extension requirements: {}".format(", ".join(pending))
+            )
+
+        for name in wave:
+            del pending[name]
+
+        for requires in pending.values():
+            requires.difference_update(wave)
+
+        waves.append(wave)
+
+    return waves
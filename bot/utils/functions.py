@@ -6,7 +6,7 @@ from base64 import b64decode as _b64decode
 from base64 import b64encode as _b64encode
 from binascii import hexlify as _hexlify
 from datetime import timedelta as _timedelta
-from difflib import get_close_matches as _get_close_matches
+from functools import lru_cache as _lru_cache
 from inspect import Parameter
 from inspect import Parameter as _Parameter
 from os import urandom as _urandom
@@ -14,9 +14,9 @@ from re import fullmatch as _fullmatch
 from typing import Any as _Any
 from typing import Dict as _Dict
 from typing import Iterator as _Iterator
-from typing import List as _List
 from typing import Optional as _Optional
 from typing import Sequence as _Sequence
+from typing import Tuple as _Tuple
 from typing import Union as _Union
 
 from discord import Forbidden as _Forbidden
@@ -31,6 +31,7 @@ from yaml import SafeLoader as _SafeLoader
 from yaml import load as _load
 
 from ..templates.exceptions import InvalidModalField
+from .fuzzy import FuzzyIndex as _FuzzyIndex
 
 
 def chunker(text, chunk_size: int) -> list:
@@ -260,9 +261,13 @@ def suggest_similar_strings(
 ) -> _Union[str, _Sequence[str]]:
     
     
-    close_matches = _get_close_matches(target, string_list, n=n, cutoff=cutoff)
+    close_matches = _fuzzy_index(tuple(string_list)).search(target, n=n, cutoff=cutoff)
     return close_matches
 
+@_lru_cache(maxsize=32)
+def _fuzzy_index(strings: _Tuple[str, ...]) -> _FuzzyIndex:
+    return _FuzzyIndex.from_strings(strings)
+
 def insert_returns(body):
     # insert return stmt if the last expression is an expression statement
     if isinstance(body[-1], Expr):
@@ -325,38 +330,6 @@ def to_boolean(argument: str) -> bool:
     else:
         raise InvalidModalField(f'{argument} is not a valid boolean value.')
 
-def match_and_remove_prefix(prefixes: _Sequence[str], text: str, /) -> _Optional[str]:
-    prefix_pattern = _re.compile(r"^(?:" + "|".join(_re.escape(prefix) for prefix in prefixes) + ")")
-    rematch = prefix_pattern.match(text)
-    
-    if rematch:
-        content_without_prefix = text[rematch.end():]
-        return content_without_prefix
-
-
-
-def find_command_args_list(text: str, prefixes: _Sequence[str], command_name: str, /) -> _List[str]:
-    text = match_and_remove_prefix(prefixes, text) or text
-    text = text.strip()
-    
-    if text.lower().startswith(command_name.lower()):
-        text = text[len(command_name):].strip()
-    
-    args_list = _re.findall(r'\'[^\']*\'|\"[^\"]*\"|\S+', text)
-    
-    args_list = [arg[1:-1] if (arg.startswith("'") and arg.endswith("'")) or 
-                 (arg.startswith('"') and arg.endswith('"')) else arg for arg in args_list]
-    
-    return args_list
-
-def find_command_args(text: str, prefixes: _Sequence[str], command_name: str, /) -> str:
-    
-    text = match_and_remove_prefix(prefixes, text) or text
-    text = text.strip()
-    if text.lower().startswith(command_name.lower()):
-        text = text[len(command_name):].strip()
-    return text
-
 def generate_usage(
     command: commands.Command[_Any, _Any, _Any],
     flag_converter: type[commands.FlagConverter],
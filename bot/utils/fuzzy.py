@@ -0,0 +1,241 @@
+from typing import Dict as _Dict
+from typing import Iterable as _Iterable
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Set as _Set
+from typing import Tuple as _Tuple
+
+__all__: _Tuple[str, ...] = (
+    "FuzzyIndex",
+    "similarity",
+)
+
+
+def _trigrams(text: str, /) -> _Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _pattern_masks(pattern: str, /) -> _Dict[str, int]:
+    masks: _Dict[str, int] = {}
+
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+
+    return masks
+
+
+def _distance(masks: _Dict[str, int], length: int, text: str, /) -> int:
+    """Optimal string alignment distance between a pattern and ``text``.
+
+    That is the Levenshtein distance with adjacent transpositions counted
+    as a single edit, computed with Hyyrö's bit-vector algorithm so a whole
+    column of the distance matrix costs a handful of integer operations.
+
+    :param masks: The character masks of the pattern, see :func:`_pattern_masks`.
+    :param length: The length of the pattern.
+    :param text: The text to compare the pattern with.
+    """
+
+    if not length:
+        return len(text)
+
+    full = (1 << length) - 1
+    high = 1 << (length - 1)
+
+    # Vertical positive/negative deltas and the diagonal zero deltas.
+    vp, vn, d0 = full, 0, 0
+    previous_equal = 0
+    score = length
+
+    for char in text:
+        equal = masks.get(char, 0)
+        transposed = (((~d0) & equal) << 1) & previous_equal
+
+        d0 = ((((equal & vp) + vp) ^ vp) | equal | vn | transposed) & full
+        hp = vn | ~(d0 | vp)
+        hn = vp & d0
+
+        if hp & high:
+            score += 1
+        elif hn & high:
+            score -= 1
+
+        hp = (hp << 1) | 1
+        hn <<= 1
+
+        vp = (hn | ~(d0 | hp)) & full
+        vn = hp & d0
+        previous_equal = equal
+
+    return score
+
+
+def similarity(a: str, b: str, /) -> float:
+    """Returns how similar two strings are, from ``0.0`` to ``1.0``.
+
+    :param a: The first string.
+    :type a: str
+    :param b: The second string.
+    :type b: str
+    :rtype: float
+    """
+
+    longest = max(len(a), len(b))
+
+    if not longest:
+        return 1.0
+
+    return 1 - _distance(_pattern_masks(a), len(a), b) / longest
+
+
+class FuzzyIndex:
+    """A trigram index for fuzzy lookups over a fixed set of names.
+
+    Trigrams narrow the lookup down to the names sharing a part with the
+    query, only those are ranked by their edit distance to it. Keys
+    sharing none can still be close to a long query, the ones of a length
+    that allows it are ranked as well, so no key within the cutoff is missed.
+    Keys can point to another name, e.g. an alias to its command,
+    so a lookup returns each name once.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "_keys",
+        "_trigrams",
+        "_lengths",
+    )
+
+    def __init__(self, names: _Iterable[_Tuple[str, str]] = (), /) -> None:
+        """
+        :param names: ``(key, name)`` pairs, the key is what gets matched and the name what gets returned.
+        :type names: Iterable[Tuple[str, str]]
+        """
+
+        self._keys: _Dict[str, str] = {}
+        self._trigrams: _Dict[str, _List[str]] = {}
+        self._lengths: _Dict[int, _List[str]] = {}
+
+        for key, name in names:
+            self.add(key, name)
+
+    @classmethod
+    def from_strings(cls, strings: _Iterable[str], /) -> "FuzzyIndex":
+        """Builds an index where every string is its own name.
+
+        :param strings: The strings to index.
+        :type strings: Iterable[str]
+        :rtype: :class:`FuzzyIndex`
+        """
+
+        return cls((string, string) for string in strings)
+
+    def add(self, key: str, name: _Optional[str] = None, /) -> None:
+        """Adds a key to the index.
+
+        :param key: The string to match against.
+        :type key: str
+        :param name: What a match on ``key`` returns, defaults to ``key``.
+        :type name: Optional[str]
+        """
+
+        key_lower = key.lower()
+
+        if key_lower in self._keys:
+            return
+
+        self._keys[key_lower] = key if name is None else name
+
+        for trigram in _trigrams(key_lower):
+            self._trigrams.setdefault(trigram, []).append(key_lower)
+
+        self._lengths.setdefault(len(key_lower), []).append(key_lower)
+
+    def search(
+            self,
+            query: str,
+            /,
+            n: int = 3,
+            cutoff: float = 0.6
+    ) -> _List[str]:
+        """Returns the names closest to ``query``, best first.
+
+        :param query: The string to look up.
+        :type query: str
+        :param n: The maximum amount of names to return.
+        :type n: int
+        :param cutoff: The minimum :func:`similarity` a key needs to match.
+        :type cutoff: float
+        :rtype: List[str]
+        """
+
+        query = query.lower()
+
+        if n <= 0 or not query:
+            return []
+
+        masks = _pattern_masks(query)
+        query_trigrams = _trigrams(query)
+        counts: _Dict[str, int] = {}
+
+        for trigram in query_trigrams:
+            for key in self._trigrams.get(trigram, ()):
+                counts[key] = counts.get(key, 0) + 1
+
+        scored: _Dict[str, float] = {}
+        floor = cutoff
+
+        def rank(keys: _Iterable[str]) -> None:
+            nonlocal floor
+
+            for key in keys:
+                longest = max(len(key), len(query))
+
+                # The largest distance that still scores ``floor``.
+                limit = int(longest * (1 - floor) + 1e-9)
+
+                # Every edit breaks at most four trigrams of the query (a swap
+                # of two characters does), keys sharing fewer are too far off.
+                if counts.get(key, 0) < len(query_trigrams) - 4 * limit:
+                    continue
+
+                if abs(len(key) - len(query)) > limit:
+                    continue
+
+                distance = _distance(masks, len(query), key)
+
+                if distance > limit:
+                    continue
+
+                score = 1 - distance / longest
+                name = self._keys[key]
+
+                if score > scored.get(name, -1.0):
+                    scored[name] = score
+
+                    if len(scored) >= n:
+                        floor = max(floor, sorted(scored.values(), reverse=True)[n - 1])
+
+        # Short queries may not share a single trigram with a close name.
+        candidates = self._keys if len(query) <= 3 else counts
+
+        # The keys sharing the most trigrams are likely the closest ones,
+        # once ``n`` names are found they raise the bar for the rest.
+        rank(sorted(candidates, key=lambda key: -counts.get(key, 0)))
+
+        if candidates is counts:
+            # A close key can still share no trigram with the query, e.g.
+            # "eaf" with "feabf", only the lengths it can have are scanned.
+            for length, keys in self._lengths.items():
+                limit = int(max(length, len(query)) * (1 - floor) + 1e-9)
+
+                if abs(length - len(query)) <= limit and len(query_trigrams) <= 4 * limit:
+                    rank(key for key in keys if key not in counts)
+
+        return sorted(scored, key=lambda name: (-scored[name], name))[:n]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"<FuzzyIndex keys={len(self._keys)}>"
@@ -0,0 +1,50 @@
+import sys as _sys
+from importlib.util import LazyLoader as _LazyLoader
+from importlib.util import find_spec as _find_spec
+from importlib.util import module_from_spec as _module_from_spec
+from importlib.util import resolve_name as _resolve_name
+from types import ModuleType as _ModuleType
+from typing import Optional as _Optional
+from typing import Tuple as _Tuple
+
+__all__: _Tuple[str, ...] = (
+    "lazy_import",
+)
+
+
+def lazy_import(name: str, package: _Optional[str] = None, /) -> _ModuleType:
+    """Imports a module that only gets executed on its first attribute access.
+
+    Names have to be looked up on the module when they are used,
+    ``from`` imports of a lazy module would load it right away.
+
+    :param name: The name of the module, relative names need ``package``.
+    :type name: str
+    :param package: The package to resolve a relative ``name`` from.
+    :type package: Optional[str]
+    :raises ModuleNotFoundError: The module does not exist.
+    :rtype: :class:`types.ModuleType`
+    """
+
+    name = _resolve_name(name, package)
+
+    if name in _sys.modules:
+        return _sys.modules[name]
+
+    spec = _find_spec(name)
+
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+
+    spec.loader = _LazyLoader(spec.loader)
+
+    module = _module_from_spec(spec)
+    _sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+    parent, _, child = name.rpartition(".")
+
+    if parent in _sys.modules:
+        setattr(_sys.modules[parent], child, module)
+
+    return module
@@ -0,0 +1,242 @@
+import re as _re
+from bisect import bisect_left as _bisect_left
+from collections.abc import Mapping as _Mapping
+from string import Template as _Template
+from sys import getsizeof as _getsizeof
+from sys import intern as _intern
+from typing import Dict as _Dict
+from typing import Iterable as _Iterable
+from typing import Iterator as _Iterator
+from typing import Optional as _Optional
+from typing import Tuple as _Tuple
+from typing import Union as _Union
+from weakref import WeakValueDictionary as _WeakValueDictionary
+
+__all__: _Tuple[str, ...] = (
+    "MappingTemplate",
+    "ScopeMappings",
+    "compile_mapping",
+    "split_invocation",
+)
+
+_ARGUMENT_PATTERN = _re.compile(r'\'[^\']*\'|\"[^\"]*\"|\S+')
+_ARGN_PATTERN = _re.compile(r"arg([1-9][0-9]*)")
+
+
+def split_invocation(text: str, /) -> _Tuple[str, str]:
+    """Splits a prefixless message into its command name and arguments.
+
+    :param text: The message content without its prefix.
+    :type text: str
+    :return: The lowercased command name and the stripped arguments.
+    :rtype: Tuple[str, str]
+    """
+
+    parts = text.split(None, 1)
+
+    if not parts:
+        return "", ""
+
+    if len(parts) == 1:
+        return parts[0].lower(), ""
+
+    return parts[0].lower(), parts[1].strip()
+
+
+class MappingTemplate:
+    """A custom command mapping compiled into a reusable template.
+
+    The placeholders are resolved once, so :meth:`expand` only
+    tokenizes the arguments when the command actually uses them.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "command",
+        "_template",
+        "_uses_args",
+        "_max_arg",
+        "__weakref__",
+    )
+
+    def __init__(self, command: str, /) -> None:
+        """
+        :param command: The mapped command text, e.g. ``ban $arg1 $args``.
+        :type command: str
+        """
+
+        self.command: str = command
+        self._template: _Template = _Template(command)
+
+        identifiers = self._template.get_identifiers()
+
+        self._uses_args: bool = "args" in identifiers
+        self._max_arg: int = max(
+            (
+                int(match.group(1))
+                for match in map(_ARGN_PATTERN.fullmatch, identifiers)
+                if match
+            ),
+            default=0
+        )
+
+    def expand(self, args: str, /) -> str:
+        """Substitutes ``$args`` and ``$argN`` with the invocation arguments.
+
+        :param args: The arguments passed after the trigger.
+        :type args: str
+        :return: The expanded command.
+        :rtype: str
+        """
+
+        if not self._uses_args and not self._max_arg:
+            return self.command
+
+        kwargs: _Dict[str, str] = {}
+
+        if self._uses_args:
+            kwargs["args"] = args
+
+        if self._max_arg:
+            for i, match in enumerate(_ARGUMENT_PATTERN.finditer(args), 1):
+                if i > self._max_arg:
+                    break
+
+                arg = match.group()
+
+                if (arg.startswith("'") and arg.endswith("'")) or \
+                        (arg.startswith('"') and arg.endswith('"')):
+                    arg = arg[1:-1]
+
+                kwargs[f"arg{i}"] = arg
+
+        return self._template.safe_substitute(kwargs)
+
+    def __repr__(self) -> str:
+        return f"<MappingTemplate command={self.command!r}>"
+
+
+_templates: "_WeakValueDictionary[str, MappingTemplate]" = _WeakValueDictionary()
+
+
+def compile_mapping(command: str, /) -> MappingTemplate:
+    """Returns the compiled template of a mapped command.
+
+    Templates are shared between every scope that maps the same command
+    text, for as long as one of them keeps it.
+
+    :param command: The mapped command text.
+    :type command: str
+    :rtype: :class:`MappingTemplate`
+    """
+
+    template = _templates.get(command)
+
+    if template is None:
+        template = _templates[command] = MappingTemplate(_intern(command))
+
+    return template
+
+
+class ScopeMappings(_Mapping):
+    """The command mappings of a single guild or user, stored compactly.
+
+    Triggers are interned and kept sorted in a tuple, next to a parallel
+    tuple of the compiled templates of their commands, instead of a dict
+    per scope. Lookups bisect the triggers, scopes rarely have more than
+    a few dozen mappings. The templates are compiled when the scope is
+    built, so invoking a mapping doesn't compile or look up anything else.
+
+    Instances are immutable, :meth:`replace` returns an updated copy.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "_triggers",
+        "_templates",
+    )
+
+    def __init__(
+            self,
+            mappings: _Union[_Mapping, _Iterable[_Tuple[str, str]]] = (),
+            /
+    ) -> None:
+        """
+        :param mappings: The triggers mapped to their commands, or ``(trigger, command)`` pairs.
+        :type mappings: Union[Mapping[str, str], Iterable[Tuple[str, str]]]
+        """
+
+        items = mappings.items() if isinstance(mappings, _Mapping) else mappings
+        pairs = sorted(
+            (trigger, command if isinstance(command, MappingTemplate) else compile_mapping(command))
+            for trigger, command in dict(items).items()
+        )
+
+        self._triggers: _Tuple[str, ...] = tuple(_intern(trigger) for trigger, _ in pairs)
+        self._templates: _Tuple[MappingTemplate, ...] = tuple(template for _, template in pairs)
+
+    def _index(self, trigger: str, /) -> int:
+        index = _bisect_left(self._triggers, trigger)
+
+        if index < len(self._triggers) and self._triggers[index] == trigger:
+            return index
+
+        return -1
+
+    def __getitem__(self, trigger: str) -> str:
+        index = self._index(trigger) if isinstance(trigger, str) else -1
+
+        if index < 0:
+            raise KeyError(trigger)
+
+        return self._templates[index].command
+
+    def get(self, trigger: str, default: _Optional[str] = None) -> _Optional[str]:
+        index = self._index(trigger) if isinstance(trigger, str) else -1
+        return default if index < 0 else self._templates[index].command
+
+    def get_template(self, trigger: str, /) -> _Optional[MappingTemplate]:
+        """Returns the compiled template of a mapping.
+
+        :param trigger: The trigger of the mapping.
+        :type trigger: str
+        :return: The template, ``None`` if the trigger isn't mapped.
+        :rtype: Optional[:class:`MappingTemplate`]
+        """
+
+        index = self._index(trigger)
+        return None if index < 0 else self._templates[index]
+
+    def __contains__(self, trigger: object) -> bool:
+        return isinstance(trigger, str) and self._index(trigger) >= 0
+
+    def __iter__(self) -> _Iterator[str]:
+        return iter(self._triggers)
+
+    def __len__(self) -> int:
+        return len(self._triggers)
+
+    def replace(self, trigger: str, command: _Optional[str], /) -> "ScopeMappings":
+        """Returns a copy with a mapping added, changed or removed.
+
+        :param trigger: The trigger of the mapping.
+        :type trigger: str
+        :param command: The mapped command, ``None`` to remove the mapping.
+        :type command: Optional[str]
+        :rtype: :class:`ScopeMappings`
+        """
+
+        # The templates of the other mappings are kept as they are.
+        mappings: _Dict[str, _Union[str, MappingTemplate]] = dict(zip(self._triggers, self._templates))
+
+        if command is None:
+            mappings.pop(trigger, None)
+        else:
+            mappings[trigger] = command
+
+        return ScopeMappings(mappings)
+
+    def __sizeof__(self) -> int:
+        # The interned triggers and the templates are shared, only the containers are counted.
+        return object.__sizeof__(self) + _getsizeof(self._triggers) + _getsizeof(self._templates)
+
+    def __repr__(self) -> str:
+        return f"<ScopeMappings mappings={len(self._triggers)}>"
@@ -0,0 +1,98 @@
+import re as _re
+from typing import FrozenSet as _FrozenSet
+from typing import Iterable as _Iterable
+from typing import Optional as _Optional
+from typing import Tuple as _Tuple
+
+__all__: _Tuple[str, ...] = (
+    "PrefixMatcher",
+)
+
+
+class PrefixMatcher:
+    """A precompiled prefix matcher for a single prefix scope.
+
+    Prefixes are tried longest first, so ``,,`` wins over ``,``
+    when both of them are set for the same scope.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "prefixes",
+        "_pattern",
+        "_first_chars",
+    )
+
+    def __init__(self, prefixes: _Iterable[str], /) -> None:
+        """
+        :param prefixes: The prefixes this matcher should listen for.
+        :type prefixes: Iterable[str]
+        """
+
+        # dict.fromkeys drops duplicates and keeps the order,
+        # sorted() is stable so same-length prefixes keep it too.
+        self.prefixes: _Tuple[str, ...] = tuple(
+            sorted(dict.fromkeys(prefixes), key=len, reverse=True)
+        )
+
+        self._pattern: _Optional[_re.Pattern] = None
+
+        # An empty prefix matches everything, so there is nothing to filter on.
+        self._first_chars: _Optional[_FrozenSet[str]] = None
+
+        if self.prefixes:
+            self._pattern = _re.compile(
+                "|".join(_re.escape(prefix) for prefix in self.prefixes)
+            )
+
+            if "" not in self.prefixes:
+                self._first_chars = frozenset(prefix[0] for prefix in self.prefixes)
+
+    def may_match(self, text: str, /) -> bool:
+        """A cheap check on the first character of ``text``.
+
+        ``False`` means that ``text`` can't start with any of the prefixes,
+        ``True`` means that :meth:`match` has to be used to know for sure.
+
+        :param text: The text to check.
+        :type text: str
+        :rtype: bool
+        """
+
+        if self._first_chars is None:
+            return self._pattern is not None
+
+        return bool(text) and text[0] in self._first_chars
+
+    def match(self, text: str, /) -> _Optional[str]:
+        """Returns the prefix that ``text`` starts with.
+
+        :param text: The text to match.
+        :type text: str
+        :return: The matched prefix or ``None``.
+        :rtype: Optional[str]
+        """
+
+        if self._pattern is None:
+            return None
+
+        rematch = self._pattern.match(text)
+
+        if rematch:
+            return rematch.group()
+
+    def remove(self, text: str, /) -> _Optional[str]:
+        """Strips the matched prefix from ``text``.
+
+        :param text: The text to remove the prefix from.
+        :type text: str
+        :return: The text without its prefix or ``None`` if there was no prefix.
+        :rtype: Optional[str]
+        """
+
+        prefix = self.match(text)
+
+        if prefix is not None:
+            return text[len(prefix):]
+
+    def __repr__(self) -> str:
+        return f"<PrefixMatcher prefixes={self.prefixes!r}>"
@@ -0,0 +1,68 @@
+from string import Template as _Template
+from typing import Any as _Any
+from typing import Dict as _Dict
+from typing import Optional as _Optional
+from typing import Tuple as _Tuple
+
+from .functions import decrypt as _decrypt
+
+__all__: _Tuple[str, ...] = (
+    "TicketPanel",
+)
+
+
+def _compile(text: _Optional[str], /) -> _Optional[_Template]:
+    text = _decrypt(text)
+    return _Template(text) if text else None
+
+
+class TicketPanel:
+    """The settings of a ticket panel, decoded and compiled once.
+
+    Built from the ``<guild>.settings.tickets.<panel>`` KV value through
+    :meth:`CachedKV.get_parsed`, so the handlers of the ticket buttons
+    don't decode the stored texts on every click. Texts that are missing
+    or empty are ``None``, callers fall back to what they'd substitute to.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "name",
+        "emoji",
+        "opened_name",
+        "closed_name",
+        "opened_message",
+        "opened_category_id",
+        "closed_category_id",
+        "supporter_roles",
+    )
+
+    def __init__(self, data: _Dict[str, _Any], /) -> None:
+        """
+        :param data: The stored settings of the panel.
+        :type data: Dict[str, Any]
+        """
+
+        self.name: _Optional[str] = _decrypt(data.get("panel_name"))
+        self.emoji: _Optional[str] = data.get("emoji")
+
+        self.opened_name: _Optional[_Template] = _compile(data.get("opened_name_format"))
+        self.closed_name: _Optional[_Template] = _compile(data.get("closed_name_format"))
+        self.opened_message: _Optional[_Template] = _compile(data.get("opened_message_content"))
+
+        self.opened_category_id: _Optional[int] = data.get("opened_category_id")
+        self.closed_category_id: _Optional[int] = data.get("closed_category_id")
+        self.supporter_roles: _Tuple[int, ...] = tuple(data.get("supporter_roles") or ())
+
+    @classmethod
+    def from_panels(cls, data: _Dict[str, _Dict[str, _Any]], /) -> _Dict[str, "TicketPanel"]:
+        """Builds every panel of a guild.
+
+        :param data: The ids of the panels mapped to their stored settings.
+        :type data: Dict[str, Dict[str, Any]]
+        :rtype: Dict[str, :class:`TicketPanel`]
+        """
+
+        return {panel_id: cls(settings) for panel_id, settings in data.items()}
+
+    def __repr__(self) -> str:
+        return f"<TicketPanel name={self.name!r}>"
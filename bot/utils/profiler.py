@@ -0,0 +1,225 @@
+import sys as _sys
+from contextlib import contextmanager as _contextmanager
+from datetime import datetime as _datetime
+from json import dump as _dump
+from os import makedirs as _makedirs
+from os import path as _path
+from time import perf_counter as _perf_counter
+from typing import Any as _Any
+from typing import Callable as _Callable
+from typing import Dict as _Dict
+from typing import Iterator as _Iterator
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Tuple as _Tuple
+
+__all__: _Tuple[str, ...] = (
+    "StartupProfiler",
+)
+
+
+def _ms(seconds: float, /) -> float:
+    return round(seconds * 1000, 3)
+
+
+class _ImportTimer:
+    """A meta path finder timing how long every module takes to execute.
+
+    It only wraps the ``exec_module`` of the loaders the other finders
+    return, so the imports themselves are left untouched.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "profiler",
+        "_stack",
+    )
+
+    def __init__(self, profiler: "StartupProfiler", /) -> None:
+        self.profiler: "StartupProfiler" = profiler
+        self._stack: _List[_List[float]] = []
+
+    def find_spec(self, fullname: str, path: _Any = None, target: _Any = None) -> _Any:
+        for finder in _sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+
+            if spec is not None:
+                break
+        else:
+            return None
+
+        loader = spec.loader
+
+        # Builtin and frozen importers are classes shared by every module.
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+            loader.exec_module = self._wrap(fullname, loader.exec_module)
+
+        return spec
+
+    def _wrap(self, fullname: str, exec_module: _Callable, /) -> _Callable:
+        def timed_exec_module(module):
+            # [start, time spent in nested imports]
+            frame = [_perf_counter(), 0.0]
+            self._stack.append(frame)
+
+            try:
+                exec_module(module)
+
+            finally:
+                self._stack.pop()
+                elapsed = _perf_counter() - frame[0]
+
+                if self._stack:
+                    self._stack[-1][1] += elapsed
+
+                self.profiler.imports[fullname] = (_ms(elapsed), _ms(elapsed - frame[1]))
+
+        return timed_exec_module
+
+
+class StartupProfiler:
+    """Times the startup phases and module imports of the bot.
+
+    A disabled profiler does nothing, so the phases can stay
+    wrapped in :meth:`phase` without costing anything.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "enabled",
+        "phases",
+        "imports",
+        "_origin",
+        "_timer",
+    )
+
+    def __init__(self, enabled: bool = True, /) -> None:
+        """
+        :param enabled: Whether to record anything at all.
+        :type enabled: bool
+        """
+
+        self.enabled: bool = enabled
+        self.phases: _List[_Tuple[str, float, float]] = []
+        self.imports: _Dict[str, _Tuple[float, float]] = {}
+
+        self._origin: float = _perf_counter()
+        self._timer: _Optional[_ImportTimer] = None
+
+    @_contextmanager
+    def phase(self, name: str, /) -> _Iterator[None]:
+        """Times the wrapped block as a startup phase.
+
+        :param name: The name of the phase.
+        :type name: str
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        start_time = _perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.phases.append(
+                (name, _ms(start_time - self._origin), _ms(_perf_counter() - start_time))
+            )
+
+    @_contextmanager
+    def track_imports(self) -> _Iterator[None]:
+        """Records the execution time of every module imported in the wrapped block."""
+
+        if not self.enabled:
+            yield
+            return
+
+        self._timer = _ImportTimer(self)
+        _sys.meta_path.insert(0, self._timer)
+
+        try:
+            yield
+
+        finally:
+            _sys.meta_path.remove(self._timer)
+            self._timer = None
+
+    def get_duration(self, name: str, /) -> _Optional[float]:
+        """Returns how long a phase took in milliseconds.
+
+        :param name: The name of the phase.
+        :type name: str
+        :return: The duration or ``None`` if the phase wasn't recorded.
+        :rtype: Optional[float]
+        """
+
+        for phase_name, _, duration in self.phases:
+            if phase_name == name:
+                return duration
+
+    def report(self, **extra: _Any) -> _Dict[str, _Any]:
+        """Builds the report of everything recorded so far.
+
+        :param extra: Additional fields for the report, e.g. the bot version.
+        :rtype: Dict[str, Any]
+        """
+
+        return {
+            **extra,
+            "created_at": _datetime.now().isoformat(),
+            "total_ms": _ms(_perf_counter() - self._origin),
+            "phases": [
+                {"name": name, "start_ms": start, "duration_ms": duration}
+                for name, start, duration in self.phases
+            ],
+            "imports": [
+                {"module": module, "cumulative_ms": cumulative, "self_ms": own}
+                for module, (cumulative, own) in sorted(
+                    self.imports.items(), key=lambda item: -item[1][0]
+                )
+            ],
+        }
+
+    def summary(self) -> str:
+        """Returns a one-line summary of the startup."""
+
+        phases = ", ".join(
+            f"{name} {duration}ms"
+            for name, _, duration in sorted(self.phases, key=lambda phase: -phase[2])
+        )
+
+        summary = f"Startup took {_ms(_perf_counter() - self._origin)}ms ({phases or 'no phases'})"
+
+        if self.imports:
+            module, (_, own) = max(self.imports.items(), key=lambda item: item[1][1])
+            summary += f", slowest import: {module} {own}ms"
+
+        return summary
+
+    def dump(self, directory: str, /, **extra: _Any) -> str:
+        """Writes the report as JSON into ``directory``.
+
+        :param directory: The directory to write the report to.
+        :type directory: str
+        :param extra: Additional fields for the report.
+        :return: The path of the written report.
+        :rtype: str
+        """
+
+        if not _path.exists(directory):
+            _makedirs(directory)
+
+        report = self.report(**extra)
+        filename = "startup-{}-{}.json".format(
+            extra.get("version", "unknown"),
+            _datetime.now().strftime("%Y%m%d-%H%M%S")
+        )
+        file_path = _path.join(directory, filename)
+
+        with open(file_path, "w") as fp:
+            _dump(report, fp, indent=2)
+
+        return file_path
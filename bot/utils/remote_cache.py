@@ -0,0 +1,446 @@
+from fnmatch import fnmatchcase as _fnmatchcase
+from logging import getLogger as _getLogger
+from time import monotonic as _monotonic
+from typing import AsyncIterator as _AsyncIterator
+from typing import Awaitable as _Awaitable
+from typing import Callable as _Callable
+from typing import Dict as _Dict
+from typing import Generic as _Generic
+from typing import Iterable as _Iterable
+from typing import List as _List
+from typing import Optional as _Optional
+from typing import Tuple as _Tuple
+from typing import TypeVar as _TypeVar
+
+from .cache import ScopedCache
+
+__all__: _Tuple[str, ...] = (
+    "MemoryCache",
+    "RedisCache",
+    "RemoteCache",
+    "TieredLoader",
+)
+
+V = _TypeVar("V")
+
+# Stored for the scopes that have nothing, so they aren't looked up again.
+_NEGATIVE = b""
+
+
+class RemoteCache:
+    """A cache shared by every bot process, in front of the database.
+
+    Values are bytes stored under string keys, each with its own lifetime.
+    Reads and writes of several keys take a single round trip. Failures
+    are counted in ``errors`` and raised, callers fall back to the database.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "hits",
+        "misses",
+        "writes",
+        "errors",
+    )
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0
+        self.writes: int = 0
+        self.errors: int = 0
+
+    @classmethod
+    def from_url(cls, url: str, /) -> "RemoteCache":
+        """Creates the cache of a URL, ``memory://`` for one kept in this process.
+
+        :param url: A Redis URL (e.g. ``redis://localhost:6379/0``) or ``memory://``.
+        :type url: str
+        :rtype: :class:`RemoteCache`
+        """
+
+        if url.startswith("memory://"):
+            return MemoryCache()
+
+        return RedisCache(url)
+
+    async def get_many(self, keys: _List[str], /) -> _List[_Optional[bytes]]:
+        """|coro|
+
+        Reads several keys at once.
+
+        :param keys: The keys to read.
+        :type keys: List[str]
+        :return: The values in the order of ``keys``, ``None`` for the missing ones.
+        :rtype: List[Optional[bytes]]
+        """
+
+        raise NotImplementedError
+
+    async def set_many(self, items: _Dict[str, bytes], /, *, ttl: _Optional[float] = None) -> None:
+        """|coro|
+
+        Writes several keys at once.
+
+        :param items: The keys mapped to their values.
+        :type items: Dict[str, bytes]
+        :param ttl: How many seconds the keys are kept.
+        :type ttl: Optional[float]
+        """
+
+        raise NotImplementedError
+
+    async def delete_many(self, keys: _List[str], /) -> None:
+        """|coro|
+
+        Removes several keys at once.
+
+        :param keys: The keys to remove.
+        :type keys: List[str]
+        """
+
+        raise NotImplementedError
+
+    def scan(self, pattern: str, /, *, count: int = 1000) -> _AsyncIterator[_List[str]]:
+        """Iterates over the keys matching a glob-style pattern, in batches.
+
+        :param pattern: The pattern of the keys, e.g. ``xynus:prefixes:*``.
+        :type pattern: str
+        :param count: The amount of keys per batch.
+        :type count: int
+        """
+
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """|coro|
+
+        Closes the connections of the cache.
+        """
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of read keys that were found."""
+
+        reads = self.hits + self.misses
+        return self.hits / reads if reads else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} hits={self.hits} misses={self.misses} "
+            f"writes={self.writes} errors={self.errors}>"
+        )
+
+
+class MemoryCache(RemoteCache):
+    """A :class:`RemoteCache` kept in this process, for development and tests."""
+
+    __slots__: _Tuple[str, ...] = (
+        "_values",
+    )
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        # key: (value, expires at)
+        self._values: _Dict[str, _Tuple[bytes, float]] = {}
+
+    def _get(self, key: str, /) -> _Optional[bytes]:
+        entry = self._values.get(key)
+
+        if entry is None:
+            return None
+
+        if entry[1] <= _monotonic():
+            del self._values[key]
+            return None
+
+        return entry[0]
+
+    async def get_many(self, keys: _List[str], /) -> _List[_Optional[bytes]]:
+        return [self._get(key) for key in keys]
+
+    async def set_many(self, items: _Dict[str, bytes], /, *, ttl: _Optional[float] = None) -> None:
+        expires_at = _monotonic() + ttl if ttl is not None else float("inf")
+
+        for key, value in items.items():
+            self._values[key] = (value, expires_at)
+
+    async def delete_many(self, keys: _List[str], /) -> None:
+        for key in keys:
+            self._values.pop(key, None)
+
+    async def scan(self, pattern: str, /, *, count: int = 1000) -> _AsyncIterator[_List[str]]:
+        keys = [key for key in list(self._values) if _fnmatchcase(key, pattern)]
+
+        for start in range(0, len(keys), count):
+            yield keys[start:start + count]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class RedisCache(RemoteCache):
+    """A :class:`RemoteCache` stored in Redis.
+
+    Several keys are read with a single ``MGET`` and written
+    with a pipeline of ``SET ... PX``, outside of a transaction.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "client",
+    )
+
+    def __init__(self, url: str, /) -> None:
+        """
+        :param url: The URL of the Redis server, e.g. ``redis://localhost:6379/0``.
+        :type url: str
+        """
+
+        # Only imported when a Redis server is used.
+        from redis.asyncio import Redis
+
+        super().__init__()
+
+        self.client: Redis = Redis.from_url(url)
+
+    async def get_many(self, keys: _List[str], /) -> _List[_Optional[bytes]]:
+        return await self.client.mget(keys)
+
+    async def set_many(self, items: _Dict[str, bytes], /, *, ttl: _Optional[float] = None) -> None:
+        px = int(ttl * 1000) if ttl is not None else None
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, value, px=px)
+
+            await pipe.execute()
+
+    async def delete_many(self, keys: _List[str], /) -> None:
+        await self.client.delete(*keys)
+
+    async def scan(self, pattern: str, /, *, count: int = 1000) -> _AsyncIterator[_List[str]]:
+        batch = []
+
+        async for key in self.client.scan_iter(match=pattern, count=count):
+            batch.append(key.decode())
+
+            if len(batch) >= count:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class TieredLoader(_Generic[V]):
+    """Reads scopes from a :class:`RemoteCache` before reading them from the database.
+
+    Used as the loader of a :class:`ScopedCache`, which makes the remote
+    cache its second tier. Scopes the remote cache doesn't have are read
+    through ``loader`` and written back, the empty ones too. When the
+    remote cache fails, everything is read through ``loader``.
+
+    Writes must call :meth:`invalidate` once they're committed.
+    """
+
+    __slots__: _Tuple[str, ...] = (
+        "remote",
+        "loader",
+        "namespace",
+        "encode",
+        "decode",
+        "ttl",
+        "_failing",
+    )
+
+    def __init__(
+            self,
+            remote: RemoteCache,
+            loader: _Callable[[_List[int]], _Awaitable[_Dict[int, V]]],
+            /,
+            *,
+            namespace: str,
+            encode: _Callable[[V], bytes],
+            decode: _Callable[[bytes], V],
+            ttl: _Optional[float] = None
+    ) -> None:
+        """
+        :param remote: The remote cache.
+        :type remote: :class:`RemoteCache`
+        :param loader: Reads the given scopes from the database.
+        :type loader: Callable[[List[int]], Awaitable[Dict[int, V]]]
+        :param namespace: Prefixed to the keys, e.g. ``xynus:prefixes``.
+        :type namespace: str
+        :param encode: Turns a value into bytes.
+        :type encode: Callable[[V], bytes]
+        :param decode: Turns the bytes back into a value.
+        :type decode: Callable[[bytes], V]
+        :param ttl: How many seconds the remote cache keeps a scope.
+        :type ttl: Optional[float]
+        """
+
+        self.remote: RemoteCache = remote
+        self.loader: _Callable[[_List[int]], _Awaitable[_Dict[int, V]]] = loader
+        self.namespace: str = namespace
+        self.encode: _Callable[[V], bytes] = encode
+        self.decode: _Callable[[bytes], V] = decode
+        self.ttl: _Optional[float] = ttl
+
+        self._failing: bool = False
+
+    def _key(self, scope_id: int, /) -> str:
+        return f"{self.namespace}:{scope_id}"
+
+    @property
+    def _warm_key(self) -> str:
+        # Set once every scope was written, see :meth:`publish`.
+        return f"{self.namespace}-warm"
+
+    def _on_error(self, action: str, err: Exception, /) -> None:
+        self.remote.errors += 1
+
+        # Logged once until the cache works again.
+        if not self._failing:
+            self._failing = True
+            _getLogger("xynus.cache").warning(f"Failed to {action} the remote cache {err}")
+
+    async def __call__(self, scope_ids: _List[int], /) -> _Dict[int, V]:
+        try:
+            raw = await self.remote.get_many([self._key(scope_id) for scope_id in scope_ids])
+            self._failing = False
+        except Exception as err:
+            self._on_error("read", err)
+            return await self.loader(scope_ids)
+
+        values: _Dict[int, V] = {}
+        missing: _List[int] = []
+
+        for scope_id, value in zip(scope_ids, raw):
+            if value is None:
+                missing.append(scope_id)
+            elif value != _NEGATIVE:
+                values[scope_id] = self.decode(value)
+
+        self.remote.hits += len(scope_ids) - len(missing)
+        self.remote.misses += len(missing)
+
+        if missing:
+            loaded = await self.loader(missing)
+            values.update(loaded)
+
+            await self.store({scope_id: loaded.get(scope_id) for scope_id in missing})
+
+        return values
+
+    async def store(self, values: _Dict[int, _Optional[V]], /) -> None:
+        """|coro|
+
+        Writes scopes to the remote cache, errors are only logged.
+
+        :param values: The scopes mapped to their values, ``None`` for the ones that have nothing.
+        :type values: Dict[int, Optional[V]]
+        """
+
+        if not values:
+            return
+
+        try:
+            await self.remote.set_many(
+                {
+                    self._key(scope_id): _NEGATIVE if value is None else self.encode(value)
+                    for scope_id, value in values.items()
+                },
+                ttl=self.ttl
+            )
+            self.remote.writes += len(values)
+        except Exception as err:
+            self._on_error("write", err)
+
+    async def invalidate(self, scope_ids: _Iterable[int], /) -> None:
+        """|coro|
+
+        Removes scopes from the remote cache, errors are only logged.
+
+        :param scope_ids: The changed scopes.
+        :type scope_ids: Iterable[int]
+        """
+
+        keys = [self._key(scope_id) for scope_id in scope_ids]
+
+        if not keys:
+            return
+
+        try:
+            await self.remote.delete_many(keys)
+        except Exception as err:
+            self._on_error("invalidate", err)
+
+    async def publish(self, cache: ScopedCache[int, V], /, *, batch_size: int = 1000) -> int:
+        """|coro|
+
+        Writes every scope of a cache filled from the database to the
+        remote cache, so other processes can warm up from it.
+
+        :param cache: The warmed up cache.
+        :type cache: :class:`ScopedCache`
+        :param batch_size: The amount of scopes written at once.
+        :type batch_size: int
+        :return: The amount of written scopes.
+        :rtype: int
+        """
+
+        items = cache.items()
+
+        for start in range(0, len(items), batch_size):
+            await self.store(dict(items[start:start + batch_size]))
+
+        try:
+            await self.remote.set_many({self._warm_key: b"1"}, ttl=self.ttl)
+        except Exception as err:
+            self._on_error("write", err)
+
+        return len(items)
+
+    async def warm_up(self, cache: ScopedCache[int, V], /, *, batch_size: int = 1000) -> _Optional[int]:
+        """|coro|
+
+        Fills a cache from the remote cache, if another process published every scope.
+
+        Scopes that are already cached are left as they are.
+
+        :param cache: The cache to fill.
+        :type cache: :class:`ScopedCache`
+        :param batch_size: The amount of scopes read at once.
+        :type batch_size: int
+        :return: The amount of cached scopes, ``None`` if the remote cache isn't warm.
+        :rtype: Optional[int]
+        """
+
+        try:
+            if (await self.remote.get_many([self._warm_key]))[0] is None:
+                return None
+
+            count = 0
+            offset = len(self.namespace) + 1
+
+            async for keys in self.remote.scan(f"{self.namespace}:*", count=batch_size):
+                for key, value in zip(keys, await self.remote.get_many(keys)):
+                    scope_id = int(key[offset:])
+
+                    # Expired or removed meanwhile, it's read on its next use.
+                    if value is None or scope_id in cache:
+                        continue
+
+                    cache.set(scope_id, None if value == _NEGATIVE else self.decode(value))
+                    count += 1
+
+        except Exception as err:
+            self._on_error("read", err)
+            return None
+
+        return count
+
+    def __repr__(self) -> str:
+        return f"<TieredLoader namespace={self.namespace!r} remote={self.remote!r}>"
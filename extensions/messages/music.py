@@ -1,3 +1,4 @@
+from asyncio import Task
 from logging import getLogger
 from typing import Any, Dict, List, Optional, Union
 
@@ -56,6 +57,11 @@ class Music(XynusCog, emoji=emojis.get("music_note")):
 
     log = getLogger("xynus.music")
     cache = dict()
+    connect_task: Optional[Task] = None
+
+    async def cog_unload(self) -> None:
+        if self.connect_task and not self.connect_task.done():
+            self.connect_task.cancel()
 
     # Listeners
     
@@ -678,6 +684,13 @@ class Music(XynusCog, emoji=emojis.get("music_note")):
         return total_milliseconds
 
 
+async def connect_nodes(c, nodes: List[Node]):
+    try:
+        await Pool.connect(nodes=nodes, client=c, cache_capacity=100,)
+    except Exception as err:
+        Music.log.error(f"Failed to connect to Lavalink: {err}")
+
+
 async def setup(c):
     nodes = [
         Node(
@@ -695,5 +708,9 @@ async def setup(c):
         for i in LAVALINKS
     ]
 
-    await Pool.connect(nodes=nodes, client=c, cache_capacity=100,)
-    await c.add_cog(Music(c))
+    cog = Music(c)
+    await c.add_cog(cog)
+
+    # Lavalink can be slow or down, the rest of the bot
+    # shouldn't wait for it, the commands check for a player anyway.
+    cog.connect_task = c.loop.create_task(connect_nodes(c, nodes))
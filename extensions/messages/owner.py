@@ -5,6 +5,7 @@ import discord
 from discord.ext import commands
 
 from bot.core import _settings
+from bot.core.plans import PlanChecker
 from bot.templates.buttons import DeleteButton
 from bot.templates.cogs import XynusCog
 from bot.templates.embeds import SimpleEmbed
@@ -106,6 +107,267 @@ class Owner(XynusCog, emoji=_emojis.get("crown")):
             view=view
         )
 
+    @commands.command(
+        name="prefilter",
+        description="Shows how many messages the command pre-filter rejected per shard."
+    )
+    @commands.is_owner()
+    async def prefilter(
+        self,
+        ctx: commands.Context
+    ):
+        stats = self.client._prefilter_stats
+
+        if not stats:
+            return await ctx.reply("No message has been processed yet.")
+
+        lines = []
+        for shard_id, counter in sorted(stats.items()):
+            filtered, passed = counter["filtered"], counter["passed"]
+            total = filtered + passed
+
+            lines.append(
+                f"**Shard {shard_id}**: `{filtered}` filtered | `{passed}` passed"
+                f" | `{round(filtered / total * 100, 2) if total else 0}%` rejected"
+            )
+
+        embed = SimpleEmbed(
+            client=self.client,
+            title="Pre-filter",
+            description="\n".join(lines)
+        )
+
+        view = ViewWithDeleteButton(ctx.author)
+        view.message = await ctx.reply(
+            embed=embed,
+            view=view
+        )
+
+    @commands.command(
+        name="queries",
+        description="Shows how often the named SQL queries were run and how long they took."
+    )
+    @commands.is_owner()
+    async def queries(
+        self,
+        ctx: commands.Context
+    ):
+        stats = [
+            (name, query_stats)
+            for name, query_stats in self.client.queries.stats.items()
+            if query_stats.calls
+        ]
+
+        if not stats:
+            return await ctx.reply("No query has been run yet.")
+
+        stats.sort(key=lambda item: -item[1].total_time)
+
+        lines = [
+            f"**{name}**: `{query_stats.calls}` calls | `{round(query_stats.average_time * 1000, 3)}ms` avg"
+            f" | `{round(query_stats.max_time * 1000, 3)}ms` max | `{query_stats.errors}` errors"
+            for name, query_stats in stats
+        ]
+
+        embed = SimpleEmbed(
+            client=self.client,
+            title="Queries",
+            description="\n".join(lines)[:4000]
+        )
+
+        view = ViewWithDeleteButton(ctx.author)
+        view.message = await ctx.reply(
+            embed=embed,
+            view=view
+        )
+
+    @commands.command(
+        name="cache",
+        description="Shows the hit rate and size of the prefix and mapping caches."
+    )
+    @commands.is_owner()
+    async def cache(
+        self,
+        ctx: commands.Context
+    ):
+        lines = []
+        for name, cache in (
+            ("Prefixes", self.client._prefix_cache),
+            ("Mappings", self.client._cmd_mapping_cache)
+        ):
+            lines.append(
+                f"**{name}**: `{len(cache)}` scopes | `{round(cache.size / 1024, 1)}KiB`"
+                f" | `{cache.hits}` hits | `{cache.misses}` misses"
+                f" | `{round(cache.hit_rate * 100, 2)}%` hit rate | `{cache.evictions}` evictions"
+            )
+
+        db = self.client.db
+        lines.append(
+            f"**KV**: `{len(db)}` keys | `{db.hits}` hits | `{db.misses}` misses"
+            f" | `{round(db.hit_rate * 100, 2)}%` hit rate"
+        )
+
+        tickets = self.client.tickets
+        lines.append(
+            f"**Tickets**: `{len(tickets)}` indexed | `{tickets.hits}` hits | `{tickets.misses}` misses"
+            f" | `{round(tickets.hit_rate * 100, 2)}%` hit rate"
+        )
+
+        remote = self.client.remote_cache
+
+        if remote is not None:
+            lines.append(
+                f"**Remote** (`{remote.__class__.__name__}`): `{remote.hits}` hits | `{remote.misses}` misses"
+                f" | `{round(remote.hit_rate * 100, 2)}%` hit rate | `{remote.writes}` writes"
+                f" | `{remote.errors}` errors"
+            )
+
+        listener = self.client.scope_listener
+
+        if listener is not None:
+            lines.append(
+                f"**Notifications**: `{listener.notifications}` received | version `{listener.version}`"
+                f" | `{listener.reconnects}` reconnects"
+            )
+
+        embed = SimpleEmbed(
+            client=self.client,
+            title="Cache",
+            description="\n".join(lines)
+        )
+
+        view = ViewWithDeleteButton(ctx.author)
+        view.message = await ctx.reply(
+            embed=embed,
+            view=view
+        )
+
+    @commands.command(
+        name="pool",
+        description="Shows how the database connections are used and who holds them."
+    )
+    @commands.is_owner()
+    async def pool(
+        self,
+        ctx: commands.Context
+    ):
+        pool = self.client.pool
+        stats = pool.stats
+
+        lines = [
+            f"**Connections**: `{pool.size}` open (`{pool.min_size}`-`{pool.max_size}`)"
+            f" | `{pool.in_use}` in use | `{pool.idle}` idle | `{pool.waiting}` waiting",
+            f"**Acquires**: `{stats.acquires}` | `{round(stats.average_wait * 1000, 3)}ms` avg wait"
+            f" | `{round(stats.max_wait * 1000, 3)}ms` max wait | `{stats.timeouts}` timeouts",
+            ""
+        ]
+
+        callers = sorted(
+            pool.callers.items(),
+            key=lambda item: -item[1].total_hold
+        )
+
+        lines.extend(
+            f"**{caller}**: `{caller_stats.acquires}` acquires | `{caller_stats.held}` held"
+            f" | `{round(caller_stats.average_hold * 1000, 3)}ms` avg hold"
+            f" | `{round(caller_stats.max_hold * 1000, 3)}ms` max hold"
+            for caller, caller_stats in callers
+        )
+
+        embed = SimpleEmbed(
+            client=self.client,
+            title="Pool",
+            description="\n".join(lines)[:4000]
+        )
+
+        view = ViewWithDeleteButton(ctx.author)
+        view.message = await ctx.reply(
+            embed=embed,
+            view=view
+        )
+
+    @commands.command(
+        name="leaks",
+        description="Shows the database connections held for too long and where they were acquired."
+    )
+    @commands.is_owner()
+    async def leaks(
+        self,
+        ctx: commands.Context
+    ):
+        pool = self.client.pool
+        leaked = await pool.check_leaks()
+
+        if not leaked and not pool.leaks:
+            return await ctx.reply("No connection has leaked.")
+
+        lines = [
+            f"**Held now**: `{len(leaked)}` | **Reported**: `{sum(pool.leaks.values())}`"
+            f" | **Reclaimed**: `{pool.reclaimed}`",
+            ""
+        ]
+
+        lines.extend(
+            f"`{held.location}` in **{held.caller}**: held for `{round(held.held_for, 1)}s`"
+            for held in leaked
+        )
+
+        if pool.leaks:
+            lines.append("")
+            lines.extend(
+                f"`{location}`: reported `{count}` times"
+                for location, count in pool.leaks.most_common()
+            )
+
+        embed = SimpleEmbed(
+            client=self.client,
+            title="Leaks",
+            description="\n".join(lines)[:4000]
+        )
+
+        view = ViewWithDeleteButton(ctx.author)
+        view.message = await ctx.reply(
+            embed=embed,
+            view=view
+        )
+
+    @commands.command(
+        name="plans",
+        description="Explains every named SQL query and shows the ones that don't use an index."
+    )
+    @commands.is_owner()
+    async def plans(
+        self,
+        ctx: commands.Context
+    ):
+        checker = PlanChecker(self.client.queries)
+
+        # Explaining every query can take long, the connection is never reclaimed.
+        async with self.client.pool.acquire(pinned=True) as conn:
+            reports = await checker.check_all(conn)
+
+        failed = [report for report in reports if not report.ok]
+
+        if not failed:
+            return await ctx.reply(f"All {len(reports)} queries use an index.")
+
+        lines = [
+            f"**{report.name}**: {'; '.join(report.problems)}"
+            for report in failed
+        ]
+
+        embed = SimpleEmbed(
+            client=self.client,
+            title="Plans",
+            description="\n".join(lines)[:4000]
+        )
+
+        view = ViewWithDeleteButton(ctx.author)
+        view.message = await ctx.reply(
+            embed=embed,
+            view=view
+        )
+
     @commands.Cog.listener(
         name="on_guild_join"
     )
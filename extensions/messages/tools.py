@@ -11,8 +11,7 @@ from discord.ext import commands
 from bot.templates.autocomplete import help_autocomplete
 from bot.templates.buttons import DeleteButton
 from bot.templates.cogs import XynusCog
-from bot.templates.embeds import (CommandInfoEmbed, CommandsEmbed,
-                                  MappingInfoEmbed, SimpleEmbed)
+from bot.templates.embeds import CommandsEmbed, MappingInfoEmbed, SimpleEmbed
 from bot.templates.flags import EmbedFlags
 from bot.templates.modals import WhisperModal
 from bot.templates.views import (DuplicatedMappingView, DynamicHelpView,
@@ -21,12 +20,11 @@ from bot.templates.views import (DuplicatedMappingView, DynamicHelpView,
                                  WhisperView)
 from bot.templates.wrappers import check_views, check_views_interaction
 from bot.utils.config import Emojis
-from bot.utils.functions import (chunker, decrypt, encrypt,
-                                 extract_emoji_info_from_text, filter_prefix,
-                                 find_command_name, generate_usage,
-                                 get_all_commands,
+from bot.utils.functions import (chunker, extract_emoji_info_from_text,
+                                 filter_prefix, find_command_name,
+                                 generate_usage, get_all_commands,
                                  remove_duplicates_preserve_order,
-                                 suggest_similar_strings, tuple_remove_item)
+                                 tuple_remove_item)
 
 if TYPE_CHECKING:
     from bot.core.client import Xynus
@@ -541,43 +539,26 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         prefix = filter_prefix(prefix)
 
 
-        cogs = [self.client.cogs[i] for i in self.client.cogs]
-
-
-        cogs = [*filter(lambda cog: cog.get_commands() and cog.get_commands() != [], cogs)]
-
-        cog_commands = [get_all_commands(cog=cog) for cog in cogs]
-        commands = []
-        commands_with_names = {}
-
-
-        for command in cog_commands: 
-            commands+=[*command]
-            for command in [*command]:
-                commands_with_names[command.qualified_name] = command
+        registry = self.client.command_registry
+        commands = [*registry.commands]
         
         if cmd:
-            similar_strings = suggest_similar_strings(
-                target=cmd,
-                string_list=[*commands_with_names],
+            similar_commands = registry.suggest(
+                cmd,
                 cutoff=0.6,
                 n=5
             )
 
-            if not similar_strings or similar_strings == []:
+            if not similar_commands:
                 return await ctx.reply("No matching command were found.")
 
             async def get_page(
                     index: int
             ):
-                name = similar_strings[index]
-                command = commands_with_names[name]
+                command = similar_commands[index]
                 
-                embed = CommandInfoEmbed(
-                    self.client,
-                    command=command,
-                    full_name=name,
-                )
+                embed = Embed.from_dict(registry.get_command_info(command))
+                embed.timestamp = utils.utcnow()
 
 
                 kwrgs = {
@@ -591,7 +572,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                     icon_url=ctx.author.avatar
                 )
 
-                return kwrgs, len(similar_strings)
+                return kwrgs, len(similar_commands)
             
 
             pagination_view = Pagination(
@@ -615,7 +596,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
             ctx=ctx,
             prefix=prefix,
             bot_commands=commands,
-            cogs=self.client.cogs,
+            cogs=registry.cogs,
         )
 
         dynamic_help_view.add_item(DeleteButton())
@@ -651,28 +632,19 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         
         prefix = ["/"]
 
-        if cmd:
-            bot_commands = {}
-            full_name = lambda command: "{}{}{}".format(
-                f"{command.root_parent} " if command.root_parent else "",
-                f"{command.parent} " if command.parent and command.parent != command.root_parent else "",
-                command.name,
-            )
+        registry = self.client.command_registry
 
-            for cog_name in inter.client.cogs:
-                cog = inter.client.cogs[cog_name]
+        if cmd:
+            command = registry.get(cmd)
 
-                for command in get_all_commands(cog):
-                    bot_commands[full_name(command)] = command
-            
-            command = bot_commands.get(cmd)
+            if not command:
+                return await inter.response.send_message(
+                    "No matching command were found.",
+                    ephemeral=True
+                )
 
-            embed = CommandInfoEmbed(
-                client=self.client,
-                command=command,
-                prefix=prefix,
-                full_name=cmd
-            )
+            embed = Embed.from_dict(registry.get_command_info(command))
+            embed.timestamp = utils.utcnow()
 
 
             embed.set_footer(
@@ -686,23 +658,14 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
             )
 
 
-        cogs = [self.client.cogs[i] for i in self.client.cogs]
-        cogs = [*filter(lambda cog: cog.get_commands() and cog.get_commands() != [], cogs)]
-
-        
-        cog_commands = [get_all_commands(cog=cog) for cog in cogs]
-        commands = []
-        for command in cog_commands: commands+=[*command]
-
-
-
+        commands = [*registry.commands]
 
         dynamic_help_view = DynamicHelpView(
             client=self.client,
             interaction=inter,
             prefix=prefix,
             bot_commands=commands,
-            cogs=self.client.cogs,
+            cogs=registry.cogs,
         )
 
         dynamic_help_view.add_item(DeleteButton())
@@ -840,18 +803,14 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         command_name = find_command_name(command)
 
         
-        if not ctx.client.get_command(command_name):
+        if not ctx.client.command_registry.get(command_name):
             return await ctx.reply(
                 f"Cannot map `{command_name[:20:]}` as it is not a valid command.",
                 allowed_mentions=AllowedMentions.none()
             )
         
 
-        user_cached_maps: Dict[str, Any] = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            keys=[ctx.author.id, trigger],
-            create_missing=True
-        )
+        user_cached_maps: Dict[str, Any] = await ctx.client.get_mappings(ctx.author.id)
 
 
         if len(tuple(user_cached_maps.items())) > 30 and \
@@ -865,7 +824,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 delete_button=True
             )
 
-        sticked_command = ctx.client.get_command(trigger)
+        sticked_command = ctx.client.command_registry.get(trigger)
 
         if sticked_command:
             if sticked_command.name == self.mappings.name:
@@ -880,34 +839,17 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
 
         existant = bool(user_cached_maps.get(trigger))
 
-        query = """
-        INSERT INTO mappings(
-            user_id,
-            trigger,
-            command,
-            created_at
-        )
-        VALUES (
-            $1,
-            $2,
-            $3,
-            $4
-        )
-        ON CONFLICT (user_id, trigger)
-        DO UPDATE
-            SET command = EXCLUDED.command,
-                created_at = EXCLUDED.created_at;
-        """
         async with ctx.pool.acquire() as conn:
-            await conn.fetch(
-                query, 
+            await ctx.client.queries.fetch(
+                conn,
+                "mappings/set_user_mapping",
                 ctx.author.id, 
-                encrypt(trigger), 
-                encrypt(command),
+                trigger, 
+                command,
                 int(time())
             )
 
-        ctx.client._cmd_mapping_cache[ctx.author.id][trigger.lower()] = command
+        ctx.client._cache_mapping(ctx.author.id, trigger.lower(), command)
 
         if existant:
             description = f"mapping **{trigger!r}** updated."
@@ -938,11 +880,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         ephemeral: Optional[bool] = False
     ):
 
-        cached_items = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.author.id],
-            True
-        ).get(ctx.author.id, {})
+        cached_items = await ctx.client.get_mappings(ctx.author.id)
 
 
         if not cached_items:
@@ -998,11 +936,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
     ):
         trigger = trigger.lower()
 
-        cached_command = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.author.id, trigger],
-            True
-        ).get(trigger, None)
+        cached_command = (await ctx.client.get_mappings(ctx.author.id)).get(trigger, None)
 
         if not cached_command:
             embed = Embed(
@@ -1014,22 +948,11 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 delete_button=True
             )
         
-        query = """
-        SELECT 
-            command, 
-            created_at
-        FROM 
-            mappings
-        WHERE 
-            trigger = $1
-        AND 
-            user_id = $2;
-        """
         async with ctx.pool.acquire() as conn:
-            record = await conn.fetchrow(query, encrypt(trigger), ctx.author.id)
+            record = await ctx.client.queries.fetchrow(conn, "mappings/get_user_mapping", trigger, ctx.author.id)
 
         created_at = record["created_at"]
-        command = decrypt(record["command"])
+        command = record["command"]
 
         embed = MappingInfoEmbed(
             ctx,
@@ -1069,11 +992,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
     ):
         trigger = trigger.lower()
 
-        data = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.author.id ,trigger],
-            True
-        )
+        data = await ctx.client.get_mappings(ctx.author.id)
 
 
         if not data.get(trigger):
@@ -1088,19 +1007,10 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         
         
 
-        query = """
-        DELETE FROM mappings
-        WHERE user_id = $1
-        AND trigger = $2;
-        """
         async with ctx.pool.acquire() as conn:
-            await conn.fetch(query, ctx.author.id, encrypt(trigger))
+            await ctx.client.queries.fetch(conn, "mappings/delete_user_mapping", ctx.author.id, trigger)
 
-        # To prevent the Runtime error here,
-        # I made a copy of mappings to iterate
-        for key in tuple(ctx.client._cmd_mapping_cache[ctx.author.id].keys()):
-            if key == trigger:
-                del ctx.client._cmd_mapping_cache[ctx.author.id][trigger]
+        ctx.client._cache_mapping(ctx.author.id, trigger, None)
 
         await ctx.reply(
             embed=Embed(
@@ -1120,11 +1030,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         ctx: "XynusContext",
     ):
 
-        data = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.author.id],
-            True
-        ).get(ctx.author.id)
+        data = await ctx.client.get_mappings(ctx.author.id)
 
 
         if not data:
@@ -1146,17 +1052,10 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
             return
         
 
-        query = """
-        DELETE FROM mappings
-        WHERE
-            user_id = $1;
-        """
         async with ctx.pool.acquire() as conn:
-            await conn.fetch(query, ctx.author.id)
+            await ctx.client.queries.fetch(conn, "mappings/clear_user_mappings", ctx.author.id)
 
-        # To prevent the Runtime error here,
-        # I made a copy of mappings to iterate
-        del ctx.client._cmd_mapping_cache[ctx.author.id]
+        ctx.client._cache_mappings(ctx.author.id, None)
 
         await ctx.reply(
             embed=Embed(
@@ -1185,11 +1084,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         trigger = trigger.lower()
         new_trigger = new_trigger.lower().replace(" ", "")[:20:]
 
-        data = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.author.id ,trigger],
-            True
-        )
+        data = await ctx.client.get_mappings(ctx.author.id)
 
 
         if not data.get(trigger):
@@ -1208,35 +1103,18 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 allowed_mentions=AllowedMentions.none()
             )
 
-        query = """
-        INSERT INTO mappings (
-            trigger,
-            command,
-            user_id,
-            created_at
-        )
-        SELECT 
-            $1, 
-            command, 
-            user_id, 
-            $2
-        FROM mappings
-        WHERE 
-            trigger = $3
-        AND 
-            user_id = $4;
-        """
 
         async with ctx.pool.acquire() as conn:
-            await conn.fetch(
-                query,
-                encrypt(new_trigger),
+            await ctx.client.queries.fetch(
+                conn,
+                "mappings/copy_user_mapping",
+                new_trigger,
                 int(time()),
-                encrypt(trigger),
+                trigger,
                 ctx.author.id
             )
         
-        ctx.client._cmd_mapping_cache[ctx.author.id][new_trigger] = data.get(trigger)
+        ctx.client._cache_mapping(ctx.author.id, new_trigger, data.get(trigger))
 
         embed = Embed(
             color=ctx.client.color,
@@ -1264,11 +1142,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         ctx: "XynusContext",
         trigger: str
     ):
-        data = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.author.id ,trigger],
-            True
-        )
+        data = await ctx.client.get_mappings(ctx.author.id)
 
         if not data.get(trigger):
             embed = Embed(
@@ -1279,48 +1153,27 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 embed=embed,
                 delete_button=True
             )
-        
-        conn = await ctx.pool.acquire()
-        encrypted_trigger = encrypt(trigger)
 
-        selection_query = """
-        SELECT id, share_code FROM mappings
-        WHERE 
-            user_id = $1
-        AND   
-            trigger = $2;
-        """
-
-
-        result = await conn.fetchrow(
-            selection_query,
-            ctx.author.id,
-            encrypted_trigger
-        )
-        
-        mapping_id = result["id"]
-        share_code = result["share_code"]
-        if not share_code:
-            share_code = md5(str(mapping_id).encode()).hexdigest()
-
-            insertion_query = """
-            UPDATE mappings
-            SET 
-                share_code = $1
-            WHERE
-                user_id = $2
-            AND 
-                trigger = $3
-            """
-
-            await conn.fetch(
-                insertion_query,
-                share_code,
+        async with ctx.pool.acquire() as conn:
+            result = await ctx.client.queries.fetchrow(
+                conn,
+                "mappings/get_user_share_code",
                 ctx.author.id,
-                encrypted_trigger
+                trigger
             )
 
-        await ctx.pool.release(conn)
+            mapping_id = result["id"]
+            share_code = result["share_code"]
+            if not share_code:
+                share_code = md5(str(mapping_id).encode()).hexdigest()
+
+                await ctx.client.queries.fetch(
+                    conn,
+                    "mappings/set_user_share_code",
+                    share_code,
+                    ctx.author.id,
+                    trigger
+                )
 
         embed = Embed(
             description=f"**Here is a share code of the mapping {trigger!r}:** `{share_code}`",
@@ -1356,31 +1209,20 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         share_code: str
     ):
         
-        conn = await ctx.pool.acquire()
-
-        selection_query = """
-        SELECT * 
-        FROM mappings
-        WHERE share_code = $1;
-        """
-
-        record = await conn.fetchrow(
-            selection_query,
-            share_code
-        )
+        async with ctx.pool.acquire() as conn:
+            record = await ctx.client.queries.fetchrow(
+                conn,
+                "mappings/get_shared_mapping",
+                share_code
+            )
 
         if not record:
-            await ctx.pool.release(conn)
             return await ctx.reply("Didn't find any mapping")
         
-        trigger = decrypt(record["trigger"])
-        command = decrypt(record["command"])
+        trigger = record["trigger"]
+        command = record["command"]
 
-        data = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.author.id ,trigger],
-            True
-        )
+        data = await ctx.client.get_mappings(ctx.author.id)
         if not await ctx.confirm(
             f"**Are you sure you want to import the mapping {trigger!r}?**"
         ):
@@ -1401,43 +1243,20 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 allowed_mentions=AllowedMentions.none()
             )
 
-        encrypted_trigger =  encrypt(trigger)
-
-
-        
-        insertion_query = """
-        INSERT INTO mappings(
-            user_id,
-            trigger,
-            command,
-            created_at
-        )
-        SELECT 
-            $1,
-            $2,
-            command,
-            $3
-        
-        FROM mappings 
-        WHERE 
-            share_code = $4; 
-        """
-
-        await conn.fetch(
-            insertion_query,
-            ctx.author.id,
-            encrypted_trigger,
-            int(time()),
-            share_code
-        )
-
-        await ctx.pool.release(conn)
+        async with ctx.pool.acquire() as conn:
+            await ctx.client.queries.fetch(
+                conn,
+                "mappings/import_user_mapping",
+                ctx.author.id,
+                trigger,
+                int(time()),
+                share_code
+            )
         
-        decrypted_trigger = decrypt(encrypted_trigger)
-        ctx.client._cmd_mapping_cache[ctx.author.id][decrypted_trigger] = command
+        ctx.client._cache_mapping(ctx.author.id, trigger, command)
         
         await ctx.reply(
-            f"**Added {decrypted_trigger!r} to your mappings**",
+            f"**Added {trigger!r} to your mappings**",
             allowed_mentions=AllowedMentions.none()
         )
 
@@ -1455,11 +1274,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         ctx: "XynusContext",
         ephemeral: Optional[bool] = False
     ):
-        cached_items = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.guild.id],
-            True
-        ).get(ctx.guild.id, {})
+        cached_items = await ctx.client.get_mappings(ctx.guild.id)
 
 
         if not cached_items:
@@ -1523,18 +1338,14 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         command_name = find_command_name(command)
 
         
-        if not ctx.client.get_command(command_name):
+        if not ctx.client.command_registry.get(command_name):
             return await ctx.reply(
                 f"Cannot map `{command_name[:20:]}` as it is not a valid command.",
                 allowed_mentions=AllowedMentions.none()
             )
         
 
-        user_cached_maps: Dict[str, Any] = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            keys=[ctx.guild.id, trigger],
-            create_missing=True
-        )
+        user_cached_maps: Dict[str, Any] = await ctx.client.get_mappings(ctx.guild.id)
 
 
         if len(tuple(user_cached_maps.items())) > 30 and \
@@ -1548,7 +1359,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 delete_button=True
             )
 
-        sticked_command = ctx.client.get_command(trigger)
+        sticked_command = ctx.client.command_registry.get(trigger)
 
         if sticked_command:
             if sticked_command.name == self.mappings.name:
@@ -1563,34 +1374,17 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
 
         existant = bool(user_cached_maps.get(trigger))
 
-        query = """
-        INSERT INTO mappings(
-            guild_id,
-            trigger,
-            command,
-            created_at
-        )
-        VALUES (
-            $1,
-            $2,
-            $3,
-            $4
-        )
-        ON CONFLICT (guild_id, trigger)
-        DO UPDATE
-            SET command = EXCLUDED.command,
-                created_at = EXCLUDED.created_at;
-        """
         async with ctx.pool.acquire() as conn:
-            await conn.fetch(
-                query, 
+            await ctx.client.queries.fetch(
+                conn,
+                "mappings/set_guild_mapping",
                 ctx.guild.id, 
-                encrypt(trigger), 
-                encrypt(command),
+                trigger, 
+                command,
                 int(time())
             )
 
-        ctx.client._cmd_mapping_cache[ctx.guild.id][trigger.lower()] = command
+        ctx.client._cache_mapping(ctx.guild.id, trigger.lower(), command)
 
         if existant:
             description = f"mapping **{trigger!r}** updated."
@@ -1622,11 +1416,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
     ):
         trigger = trigger.lower()
 
-        cached_command = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.guild.id, trigger],
-            True
-        ).get(trigger, None)
+        cached_command = (await ctx.client.get_mappings(ctx.guild.id)).get(trigger, None)
 
         if not cached_command:
             embed = Embed(
@@ -1638,22 +1428,11 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 delete_button=True
             )
         
-        query = """
-        SELECT 
-            command, 
-            created_at
-        FROM 
-            mappings
-        WHERE 
-            trigger = $1
-        AND 
-            guild_id = $2;
-        """
         async with ctx.pool.acquire() as conn:
-            record = await conn.fetchrow(query, encrypt(trigger), ctx.guild.id)
+            record = await ctx.client.queries.fetchrow(conn, "mappings/get_guild_mapping", trigger, ctx.guild.id)
 
         created_at = record["created_at"]
-        command = decrypt(record["command"])
+        command = record["command"]
 
         embed = MappingInfoEmbed(
             ctx,
@@ -1697,11 +1476,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
     ):
         trigger = trigger.lower()
 
-        data = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.guild.id ,trigger],
-            True
-        )
+        data = await ctx.client.get_mappings(ctx.guild.id)
     
 
         if not data.get(trigger):
@@ -1716,19 +1491,10 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         
         
 
-        query = """
-        DELETE FROM mappings
-        WHERE guild_id = $1
-        AND trigger = $2;
-        """
         async with ctx.pool.acquire() as conn:
-            await conn.fetch(query, ctx.guild.id, encrypt(trigger))
+            await ctx.client.queries.fetch(conn, "mappings/delete_guild_mapping", ctx.guild.id, trigger)
 
-        # To prevent the Runtime error here,
-        # I made a copy of mappings to iterate
-        for key in tuple(ctx.client._cmd_mapping_cache[ctx.guild.id].keys()):
-            if key == trigger:
-                del ctx.client._cmd_mapping_cache[ctx.guild.id][trigger]
+        ctx.client._cache_mapping(ctx.guild.id, trigger, None)
 
         await ctx.reply(
             embed=Embed(
@@ -1752,11 +1518,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         ctx: "XynusContext",
     ):
 
-        data = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.guild.id],
-            True
-        ).get(ctx.guild.id)
+        data = await ctx.client.get_mappings(ctx.guild.id)
 
 
         if not data:
@@ -1778,17 +1540,10 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
             return
         
 
-        query = """
-        DELETE FROM mappings
-        WHERE
-            guild = $1;
-        """
         async with ctx.pool.acquire() as conn:
-            await conn.fetch(query, ctx.guild.id)
+            await ctx.client.queries.fetch(conn, "mappings/clear_guild_mappings", ctx.guild.id)
 
-        # To prevent the Runtime error here,
-        # I made a copy of mappings to iterate
-        del ctx.client._cmd_mapping_cache[ctx.guild.id]
+        ctx.client._cache_mappings(ctx.guild.id, None)
 
         await ctx.reply(
             embed=Embed(
@@ -1821,11 +1576,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         trigger = trigger.lower()
         new_trigger = new_trigger.lower().replace(" ", "")[:20:]
 
-        data = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.guild.id ,trigger],
-            True
-        )
+        data = await ctx.client.get_mappings(ctx.guild.id)
 
 
         if not data.get(trigger):
@@ -1844,35 +1595,18 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 allowed_mentions=AllowedMentions.none()
             )
 
-        query = """
-        INSERT INTO mappings (
-            trigger,
-            command,
-            guild_id,
-            created_at
-        )
-        SELECT 
-            $1, 
-            command, 
-            guild_id, 
-            $2
-        FROM mappings
-        WHERE 
-            trigger = $3
-        AND 
-            guild_id = $4;
-        """
 
         async with ctx.pool.acquire() as conn:
-            await conn.fetch(
-                query,
-                encrypt(new_trigger),
+            await ctx.client.queries.fetch(
+                conn,
+                "mappings/copy_guild_mapping",
+                new_trigger,
                 int(time()),
-                encrypt(trigger),
+                trigger,
                 ctx.guild.id
             )
         
-        ctx.client._cmd_mapping_cache[ctx.guild.id][new_trigger] = data.get(trigger)
+        ctx.client._cache_mapping(ctx.guild.id, new_trigger, data.get(trigger))
 
         embed = Embed(
             color=ctx.client.color,
@@ -1904,11 +1638,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         ctx: "XynusContext",
         trigger: str
     ):
-        data = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.guild.id ,trigger],
-            True
-        )
+        data = await ctx.client.get_mappings(ctx.guild.id)
 
         if not data.get(trigger):
             embed = Embed(
@@ -1919,48 +1649,27 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 embed=embed,
                 delete_button=True
             )
-        
-        conn = await ctx.pool.acquire()
-        encrypted_trigger = encrypt(trigger)
-
-        selection_query = """
-        SELECT id, share_code FROM mappings
-        WHERE 
-            guild_id = $1
-        AND   
-            trigger = $2;
-        """
-
 
-        result = await conn.fetchrow(
-            selection_query,
-            ctx.guild.id,
-            encrypted_trigger
-        )
-        
-        mapping_id = result["id"]
-        share_code = result["share_code"]
-        if not share_code:
-            share_code = md5(str(mapping_id).encode()).hexdigest()
-
-            insertion_query = """
-            UPDATE mappings
-            SET 
-                share_code = $1
-            WHERE
-                guild_id = $2
-            AND 
-                trigger = $3
-            """
-
-            await conn.fetch(
-                insertion_query,
-                share_code,
+        async with ctx.pool.acquire() as conn:
+            result = await ctx.client.queries.fetchrow(
+                conn,
+                "mappings/get_guild_share_code",
                 ctx.guild.id,
-                encrypted_trigger
+                trigger
             )
 
-        await ctx.pool.release(conn)
+            mapping_id = result["id"]
+            share_code = result["share_code"]
+            if not share_code:
+                share_code = md5(str(mapping_id).encode()).hexdigest()
+
+                await ctx.client.queries.fetch(
+                    conn,
+                    "mappings/set_guild_share_code",
+                    share_code,
+                    ctx.guild.id,
+                    trigger
+                )
 
         embed = Embed(
             description=f"**Here is a share code of the mapping {trigger!r}:** `{share_code}`",
@@ -2000,31 +1709,20 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         share_code: str
     ):
         
-        conn = await ctx.pool.acquire()
-
-        selection_query = """
-        SELECT * 
-        FROM mappings
-        WHERE share_code = $1;
-        """
-
-        record = await conn.fetchrow(
-            selection_query,
-            share_code
-        )
+        async with ctx.pool.acquire() as conn:
+            record = await ctx.client.queries.fetchrow(
+                conn,
+                "mappings/get_shared_mapping",
+                share_code
+            )
 
         if not record:
-            await ctx.pool.release(conn)
             return await ctx.reply("Didn't find any mapping")
         
-        trigger = decrypt(record["trigger"])
-        command = decrypt(record["command"])
+        trigger = record["trigger"]
+        command = record["command"]
 
-        data = ctx.db._traverse_dict(
-            ctx.client._cmd_mapping_cache,
-            [ctx.guild.id ,trigger],
-            True
-        )
+        data = await ctx.client.get_mappings(ctx.guild.id)
         if not await ctx.confirm(
             f"**Are you sure you want to import the mapping {trigger!r}?**"
         ):
@@ -2045,43 +1743,20 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 allowed_mentions=AllowedMentions.none()
             )
 
-        encrypted_trigger =  encrypt(trigger)
-
-
-        
-        insertion_query = """
-        INSERT INTO mappings(
-            guild_id,
-            trigger,
-            command,
-            created_at
-        )
-        SELECT 
-            $1,
-            $2,
-            command,
-            $3
-        
-        FROM mappings 
-        WHERE 
-            share_code = $4; 
-        """
-
-        await conn.fetch(
-            insertion_query,
-            ctx.guild.id,
-            encrypted_trigger,
-            int(time()),
-            share_code
-        )
-
-        await ctx.pool.release(conn)
+        async with ctx.pool.acquire() as conn:
+            await ctx.client.queries.fetch(
+                conn,
+                "mappings/import_guild_mapping",
+                ctx.guild.id,
+                trigger,
+                int(time()),
+                share_code
+            )
         
-        decrypted_trigger = decrypt(encrypted_trigger)
-        ctx.client._cmd_mapping_cache[ctx.guild.id][decrypted_trigger] = command
+        ctx.client._cache_mapping(ctx.guild.id, trigger, command)
         
         await ctx.reply(
-            f"**Added {decrypted_trigger!r} to your mappings**",
+            f"**Added {trigger!r} to your mappings**",
             allowed_mentions=AllowedMentions.none()
         )
     
@@ -2101,10 +1776,10 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
     ):
 
         guild_prefixes = (ctx.me.mention, )
-        cached_prefixes = ctx.client._prefix_cache.get(ctx.author.id, tuple())
+        cached_prefixes = await ctx.client.get_scope_prefixes(ctx.author.id)
         user_prefixes = (ctx.me.mention, ) + cached_prefixes
         if ctx.guild:
-            guild_prefixes+=ctx.client._prefix_cache.get(ctx.guild.id, tuple())
+            guild_prefixes+=await ctx.client.get_scope_prefixes(ctx.guild.id)
         
 
 
@@ -2168,58 +1843,31 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
     ):
         prefix = prefix[:5:].strip().lower()
 
-        cached_prefixes = ctx.client.db._traverse_dict(
-            ctx.client._prefix_cache,
-            [ctx.author.id],
-            True
-        ).get(ctx.author.id, tuple())
+        cached_prefixes = await ctx.client.get_scope_prefixes(ctx.author.id)
 
         if prefix in cached_prefixes:
             return await ctx.reply("This prefix is already in your prefixes.")
         
-        conn = await ctx.pool.acquire()
-
-        query = """
-        INSERT INTO prefixes(
-            user_id,
-            prefixes
-        )
-        VALUES(
-            $1,
-            ARRAY[$2]::TEXT[]
-        )
-        ON CONFLICT (user_id)
-        DO UPDATE 
-        SET prefixes = ARRAY_CAT(
-            prefixes.prefixes, 
-            EXCLUDED.prefixes
-        );
-        """
-        if not cached_prefixes:
-            for default_prefix in ctx.client._settings.PREFIX:
-                await conn.fetch(
-                    query,
-                    ctx.author.id,
-                    encrypt(default_prefix)
-                )
-                ctx.client._prefix_cache[ctx.author.id] = cached_prefixes + (default_prefix, )
-                cached_prefixes = ctx.client.db._traverse_dict(
-                    ctx.client._prefix_cache,
-                    [ctx.author.id],
-                    True
-                ).get(ctx.author.id, tuple())
-
-        encrypted_prefix = encrypt(prefix)
-
-        await conn.fetch(
-            query,
-            ctx.author.id,
-            encrypted_prefix
-        )
+        async with ctx.pool.acquire() as conn:
+            if not cached_prefixes:
+                for default_prefix in ctx.client._settings.PREFIX:
+                    await ctx.client.queries.fetch(
+                        conn,
+                        "prefixes/add_user_prefix",
+                        ctx.author.id,
+                        default_prefix
+                    )
+                    ctx.client._cache_prefixes(ctx.author.id, cached_prefixes + (default_prefix, ))
+                    cached_prefixes = await ctx.client.get_scope_prefixes(ctx.author.id)
 
-        await ctx.pool.release(conn)
+            await ctx.client.queries.fetch(
+                conn,
+                "prefixes/add_user_prefix",
+                ctx.author.id,
+                prefix
+            )
 
-        ctx.client._prefix_cache[ctx.author.id] = cached_prefixes + (prefix, )
+        ctx.client._cache_prefixes(ctx.author.id, cached_prefixes + (prefix, ))
         await ctx.reply(
             f"Added {prefix} to your prefixes",
             allowed_mentions=AllowedMentions.none()
@@ -2242,29 +1890,15 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
             " permanently."
         ): return
 
-        query = """
-        INSERT INTO prefixes(
-            user_id,
-            prefixes
-        )
-        VALUES(
-            $1,
-            ARRAY[$2]::TEXT[]
-        )
-        ON CONFLICT (user_id)
-        DO UPDATE 
-        SET prefixes = EXCLUDED.prefixes
-        """
-
-        encrypted_prefix = encrypt(prefix)
         async with ctx.pool.acquire() as conn:
-            await conn.fetch(
-                query,
+            await ctx.client.queries.fetch(
+                conn,
+                "prefixes/set_user_prefix",
                 ctx.author.id,
-                encrypted_prefix
+                prefix
             )
 
-        ctx.client._prefix_cache[ctx.author.id] = (prefix, )
+        ctx.client._cache_prefixes(ctx.author.id, (prefix, ))
         await ctx.reply(
             f"Now your prefix is {prefix!r}.",
             allowed_mentions=AllowedMentions.none()
@@ -2281,11 +1915,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
     ):
         prefix = prefix[:5:].strip().lower()
 
-        cached_prefixes = ctx.client.db._traverse_dict(
-            ctx.client._prefix_cache,
-            [ctx.author.id],
-            True
-        ).get(ctx.author.id, tuple())
+        cached_prefixes = await ctx.client.get_scope_prefixes(ctx.author.id)
 
         if not prefix in cached_prefixes:
             return await ctx.reply(
@@ -2293,41 +1923,28 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 allowed_mentions=AllowedMentions.none()
             )
         
-        conn = await ctx.pool.acquire()
-        query = """
-        UPDATE prefixes 
-        SET prefixes = ARRAY_REMOVE(
-            prefixes, 
-            $1
-        )
-        WHERE 
-            user_id = $2;
-        """
-
-        await conn.fetch(
-            query,
-            encrypt(prefix),
-            ctx.author.id
-        )
+        async with ctx.pool.acquire() as conn:
+            await ctx.client.queries.fetch(
+                conn,
+                "prefixes/remove_user_prefix",
+                prefix,
+                ctx.author.id
+            )
 
-        ctx.client._prefix_cache[ctx.author.id] = tuple_remove_item(
-            ctx.client._prefix_cache[ctx.author.id], 
-            prefix
-        )
+            ctx.client._cache_prefixes(ctx.author.id, tuple_remove_item(
+                cached_prefixes, 
+                prefix
+            ))
 
-        if not ctx.client._prefix_cache.get(ctx.author.id):
-            del ctx.client._prefix_cache[ctx.author.id]
-            deletion_query = """
-            DELETE FROM prefixes 
-            WHERE user_id = $1;
-            """
+            if not await ctx.client.get_scope_prefixes(ctx.author.id):
+                ctx.client._cache_prefixes(ctx.author.id, None)
 
-            await conn.fetch(
-                deletion_query,
-                ctx.author.id
-            )
+                await ctx.client.queries.fetch(
+                    conn,
+                    "prefixes/delete_user_prefixes",
+                    ctx.author.id
+                )
 
-            
 
         await ctx.reply(
             f"Removed {prefix!r} from your prefixes",
@@ -2344,39 +1961,29 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         self,
         ctx: "XynusContext",
     ):
-        conn = await ctx.pool.acquire()
-        selection_query = """
-        SELECT * FROM prefixes 
-        WHERE user_id = $1;
-        """
-
-        data = await conn.fetchrow(
-            selection_query,
-            ctx.author.id
-        )
+        async with ctx.pool.acquire() as conn:
+            data = await ctx.client.queries.fetchrow(
+                conn,
+                "prefixes/get_user_prefixes",
+                ctx.author.id
+            )
 
         if not data:
-            await ctx.reply("You don't have any prefixes")
-            return await ctx.pool.release(conn)
+            return await ctx.reply("You don't have any prefixes")
 
         if not await ctx.confirm(
             "Are you sure? this will delete all"
             " of your prefixes"
-        ): return await ctx.pool.release(conn)
+        ): return
 
-        
-        query = """
-        DELETE FROM prefixes
-        WHERE 
-            user_id = $1;
-        """
-        await conn.execute(
-            query,
-            ctx.author.id
-        )
-        await ctx.pool.release(conn)
+        async with ctx.pool.acquire() as conn:
+            await ctx.client.queries.execute(
+                conn,
+                "prefixes/delete_user_prefixes",
+                ctx.author.id
+            )
 
-        del ctx.client._prefix_cache[ctx.author.id]
+        ctx.client._cache_prefixes(ctx.author.id, None)
         await ctx.reply("Your prefixes has been reset.")
 
 
@@ -2408,11 +2015,7 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
     ):
         prefix = prefix[:5:].strip().lower()
 
-        cached_prefixes = ctx.client.db._traverse_dict(
-            ctx.client._prefix_cache,
-            [ctx.guild.id],
-            True
-        ).get(ctx.guild.id, tuple())
+        cached_prefixes = await ctx.client.get_scope_prefixes(ctx.guild.id)
 
         if prefix in cached_prefixes:
             return await ctx.reply(
@@ -2420,49 +2023,26 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
                 allowed_mentions=AllowedMentions.none()
             )
         
-        conn = await ctx.pool.acquire()
-
-        query = """
-        INSERT INTO prefixes(
-            guild_id,
-            prefixes
-        )
-        VALUES(
-            $1,
-            ARRAY[$2]::TEXT[]
-        )
-        ON CONFLICT (guild_id)
-        DO UPDATE 
-        SET prefixes = ARRAY_CAT(
-            prefixes.prefixes, 
-            EXCLUDED.prefixes
-        );
-        """
-        if not cached_prefixes:
-            for default_prefix in ctx.client._settings.PREFIX:
-                await conn.fetch(
-                    query,
-                    ctx.guild.id,
-                    encrypt(default_prefix)
-                )
-                ctx.client._prefix_cache[ctx.guild.id] = cached_prefixes + (default_prefix, )
-                cached_prefixes = ctx.client.db._traverse_dict(
-                    ctx.client._prefix_cache,
-                    [ctx.guild.id],
-                    True
-                ).get(ctx.guild.id, tuple())
-
-        encrypted_prefix = encrypt(prefix)
-
-        await conn.fetch(
-            query,
-            ctx.guild.id,
-            encrypted_prefix
-        )
+        async with ctx.pool.acquire() as conn:
+            if not cached_prefixes:
+                for default_prefix in ctx.client._settings.PREFIX:
+                    await ctx.client.queries.fetch(
+                        conn,
+                        "prefixes/add_guild_prefix",
+                        ctx.guild.id,
+                        default_prefix
+                    )
+                    ctx.client._cache_prefixes(ctx.guild.id, cached_prefixes + (default_prefix, ))
+                    cached_prefixes = await ctx.client.get_scope_prefixes(ctx.guild.id)
 
-        await ctx.pool.release(conn)
+            await ctx.client.queries.fetch(
+                conn,
+                "prefixes/add_guild_prefix",
+                ctx.guild.id,
+                prefix
+            )
 
-        ctx.client._prefix_cache[ctx.guild.id] = cached_prefixes + (prefix, )
+        ctx.client._cache_prefixes(ctx.guild.id, cached_prefixes + (prefix, ))
         await ctx.reply(
             f"Added {prefix} to server prefixes.",
             allowed_mentions=AllowedMentions.none()
@@ -2488,29 +2068,15 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
             " permanently."
         ): return
 
-        query = """
-        INSERT INTO prefixes(
-            guild_id,
-            prefixes
-        )
-        VALUES(
-            $1,
-            ARRAY[$2]::TEXT[]
-        )
-        ON CONFLICT (guild_id)
-        DO UPDATE 
-        SET prefixes = EXCLUDED.prefixes;
-        """
-
-        encrypted_prefix = encrypt(prefix)
         async with ctx.pool.acquire() as conn:
-            await conn.fetch(
-                query,
+            await ctx.client.queries.fetch(
+                conn,
+                "prefixes/set_guild_prefix",
                 ctx.guild.id,
-                encrypted_prefix
+                prefix
             )
 
-        ctx.client._prefix_cache[ctx.guild.id] = (prefix, )
+        ctx.client._cache_prefixes(ctx.guild.id, (prefix, ))
         await ctx.reply(
             f"Now your prefix is {prefix!r}.",
             allowed_mentions=AllowedMentions.none()
@@ -2531,38 +2097,26 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
     ):
         prefix = prefix[:5:].strip().lower()
 
-        cached_prefixes = ctx.client.db._traverse_dict(
-            ctx.client._prefix_cache,
-            [ctx.guild.id],
-            True
-        ).get(ctx.guild.id, tuple())
+        cached_prefixes = await ctx.client.get_scope_prefixes(ctx.guild.id)
 
         if not prefix in cached_prefixes:
             return await ctx.reply(
                 f"there is not prefix called {prefix!r}.",
                 allowed_mentions=AllowedMentions.none()
             )
-        query = """
-        UPDATE prefixes 
-        SET prefixes = ARRAY_REMOVE(
-            prefixes,
-            $1
-        )
-        WHERE 
-            guild_id = $2;
-        """
 
         async with ctx.pool.acquire() as conn:
-            await conn.fetch(
-                query,
-                encrypt(prefix),
+            await ctx.client.queries.fetch(
+                conn,
+                "prefixes/remove_guild_prefix",
+                prefix,
                 ctx.guild.id
             )
         
-        ctx.client._prefix_cache[ctx.guild.id] = tuple_remove_item(
-            ctx.client._prefix_cache[ctx.guild.id], 
+        ctx.client._cache_prefixes(ctx.guild.id, tuple_remove_item(
+            cached_prefixes, 
             prefix
-        )
+        ))
 
         await ctx.reply(
             f"Removed {prefix!r} from prefixes.",
@@ -2582,39 +2136,28 @@ class Tools(XynusCog, emoji=_emojis.get("tools")):
         self,
         ctx: "XynusContext",
     ):
-        conn = await ctx.pool.acquire()
-        selection_query = """
-        SELECT * FROM prefixes 
-        WHERE guild_id = $1;
-        """
-
-        data = await conn.fetchrow(
-            selection_query,
-            ctx.guild.id
-        )
+        async with ctx.pool.acquire() as conn:
+            data = await ctx.client.queries.fetchrow(
+                conn,
+                "prefixes/get_guild_prefixes",
+                ctx.guild.id
+            )
 
         if not data:
-            await ctx.reply("There is no prefixes here")
-            return await ctx.pool.release(conn)
+            return await ctx.reply("There is no prefixes here")
 
         if not await ctx.confirm(
             "Are you sure? this will delete all"
             " prefixes"
-        ): return await ctx.pool.release(conn)
-
-        query = """
-        DELETE FROM prefixes
-        WHERE 
-            guild_id = $1;
-        """
-
-        await conn.fetch(
-            query,
-            ctx.guild.id
-        )
+        ): return
 
-        await ctx.pool.release(conn)
-        del ctx.client._prefix_cache[ctx.guild.id]
+        async with ctx.pool.acquire() as conn:
+            await ctx.client.queries.fetch(
+                conn,
+                "prefixes/delete_guild_prefixes",
+                ctx.guild.id
+            )
+        ctx.client._cache_prefixes(ctx.guild.id, None)
         await ctx.reply("Your prefixes has been reset.")
 
 
@@ -1,8 +1,6 @@
 from argparse import ArgumentParser
 
-import discord
-
-from bot.core import Xynus
+from bot.utils.profiler import StartupProfiler
 
 parser = ArgumentParser()
 parser.add_argument(
@@ -24,14 +22,32 @@ parser.add_argument(
     default=20,
     help="The log level for logger. can be int or str; defaults to INFO | 20."
 )
+parser.add_argument(
+    "--force-sync", "-S",
+    action="store_true",
+    help="Sync the application commands even if they haven't changed since the last sync."
+)
+parser.add_argument(
+    "--profile-startup",
+    action="store_true",
+    help="Time the startup phases and module imports, the report is saved in ./data/profiles."
+)
 
 args = parser.parse_args()
+profiler = StartupProfiler(args.profile_startup)
+
+# Imported after parsing the arguments so the profiler can time them.
+with profiler.track_imports(), profiler.phase("imports"):
+    import discord
+
+    from bot.core import Xynus
 
 client = Xynus(
     intents=discord.Intents.all(),
     allowed_mentions=discord.AllowedMentions(replied_user=False),
     proxy=args.proxy,
-    args=args
+    args=args,
+    profiler=profiler
 )
 
 
@@ -0,0 +1,105 @@
+"""Stores triggers, commands and prefixes as plain text instead of base64.
+
+The unique trigger constraints are dropped while the rows are rewritten,
+so a decoded trigger can't collide with another one that isn't decoded
+yet, and they come back with the "C" collation: their indexes then serve
+both ``trigger = $1`` and ``trigger LIKE 'abc%'``.
+
+Like every migration, it runs in a single transaction. Changing the
+collation locks ``mappings`` (ACCESS EXCLUSIVE) until it commits, so the
+table can't be read while the rows are rewritten, and a failure rolls
+back every batch. The bot waits for the migrations before it starts.
+"""
+
+from base64 import b64decode
+from logging import getLogger
+from time import perf_counter
+
+# Rows read and rewritten at once. It bounds the memory of the migrating
+# process, not the duration of the lock nor the size of the transaction.
+BATCH_SIZE = 5000
+
+
+def decode(text: str) -> str:
+    # Same as the old ``decrypt`` of bot/utils/functions.py.
+    return b64decode(text.encode("utf-8")).decode("utf-8")
+
+
+async def decode_mappings(conn) -> int:
+    last_id = 0
+    count = 0
+
+    while True:
+        records = await conn.fetch(
+            "SELECT id, trigger, command FROM mappings WHERE id > $1 ORDER BY id LIMIT $2;",
+            last_id,
+            BATCH_SIZE
+        )
+
+        if not records:
+            return count
+
+        await conn.executemany(
+            "UPDATE mappings SET trigger = $2, command = $3 WHERE id = $1;",
+            [
+                (record["id"], decode(record["trigger"]), decode(record["command"]))
+                for record in records
+            ]
+        )
+
+        last_id = records[-1]["id"]
+        count += len(records)
+
+
+async def decode_prefixes(conn) -> int:
+    last_id = 0
+    count = 0
+
+    while True:
+        records = await conn.fetch(
+            "SELECT id, prefixes FROM prefixes WHERE id > $1 ORDER BY id LIMIT $2;",
+            last_id,
+            BATCH_SIZE
+        )
+
+        if not records:
+            return count
+
+        await conn.executemany(
+            "UPDATE prefixes SET prefixes = $2 WHERE id = $1;",
+            [
+                (record["id"], [decode(prefix) for prefix in record["prefixes"]])
+                for record in records
+            ]
+        )
+
+        last_id = records[-1]["id"]
+        count += len(records)
+
+
+async def upgrade(conn) -> None:
+    log = getLogger("xynus.db")
+    start_time = perf_counter()
+
+    await conn.execute(
+        """
+        ALTER TABLE mappings DROP CONSTRAINT IF EXISTS unique_user_trigger;
+        ALTER TABLE mappings DROP CONSTRAINT IF EXISTS unique_guild_trigger;
+        ALTER TABLE mappings ALTER COLUMN trigger TYPE TEXT COLLATE "C";
+        """
+    )
+
+    mappings_count = await decode_mappings(conn)
+    prefixes_count = await decode_prefixes(conn)
+
+    await conn.execute(
+        """
+        ALTER TABLE mappings ADD CONSTRAINT unique_user_trigger UNIQUE (user_id, trigger);
+        ALTER TABLE mappings ADD CONSTRAINT unique_guild_trigger UNIQUE (guild_id, trigger);
+        ANALYZE mappings;
+        ANALYZE prefixes;
+        """
+    )
+
+    taked_time = round((perf_counter() - start_time) * 1000, 3)
+    log.info(f"Decoded {mappings_count} mapping(s) and {prefixes_count} prefix row(s) in {taked_time}ms")
@@ -0,0 +1,18 @@
+-- Indexes for the lookups the unique constraints don't cover,
+-- "python -m bot.core.plans" checks that every query uses one.
+
+-- Open tickets of a member, see tickets/get_open_tickets_of_owner.sql.
+-- Tickets are looked up by channel through the unique channel_id index.
+CREATE INDEX IF NOT EXISTS tickets_open_owner_idx
+ON tickets (owner_id, guild_id)
+WHERE is_open = TRUE AND is_valid = TRUE;
+
+-- Shared mappings, see mappings/get_shared_mapping.sql and the imports.
+CREATE INDEX IF NOT EXISTS mappings_share_code_idx
+ON mappings (share_code)
+WHERE share_code IS NOT NULL;
+
+-- Streams the mappings ordered by scope without sorting the whole
+-- table first, see mappings/get_all_mappings.sql.
+CREATE INDEX IF NOT EXISTS mappings_scope_idx
+ON mappings ((COALESCE(guild_id, user_id)));
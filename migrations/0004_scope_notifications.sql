@@ -0,0 +1,84 @@
+-- Publishes the scopes whose mappings or prefixes changed, so every bot
+-- process can drop them from its caches. Payloads look like
+-- "<table>:<scope id>:<version>", versions let a process that lost its
+-- listening connection find what it missed.
+
+CREATE SEQUENCE IF NOT EXISTS scope_version_seq;
+
+CREATE TABLE IF NOT EXISTS scope_versions(
+    scope_id BIGINT NOT NULL,
+    kind TEXT NOT NULL,
+    version BIGINT NOT NULL,
+    PRIMARY KEY (scope_id, kind)
+);
+
+CREATE INDEX IF NOT EXISTS scope_versions_version_idx
+ON scope_versions (version);
+
+-- Statement level, so bulk writes notify once per scope instead of once per row.
+CREATE OR REPLACE FUNCTION notify_scope_changes() RETURNS TRIGGER AS $$
+DECLARE
+    scopes BIGINT[];
+    changed RECORD;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT ARRAY_AGG(DISTINCT COALESCE(guild_id, user_id)) INTO scopes
+        FROM new_rows;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT ARRAY_AGG(DISTINCT scope_id) INTO scopes
+        FROM (
+            SELECT COALESCE(guild_id, user_id) AS scope_id FROM new_rows
+            UNION
+            SELECT COALESCE(guild_id, user_id) FROM old_rows
+        ) AS changed_scopes;
+    ELSE
+        SELECT ARRAY_AGG(DISTINCT COALESCE(guild_id, user_id)) INTO scopes
+        FROM old_rows;
+    END IF;
+
+    FOR changed IN
+        INSERT INTO scope_versions AS versions (scope_id, kind, version)
+        SELECT scope_id, TG_TABLE_NAME, NEXTVAL('scope_version_seq')
+        FROM UNNEST(scopes) AS scope_id
+        ON CONFLICT (scope_id, kind) DO UPDATE SET version = EXCLUDED.version
+        RETURNING versions.scope_id, versions.version
+    LOOP
+        PERFORM PG_NOTIFY(
+            'xynus_scopes',
+            TG_TABLE_NAME || ':' || changed.scope_id || ':' || changed.version
+        );
+    END LOOP;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER mappings_inserted
+AFTER INSERT ON mappings
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_scope_changes();
+
+CREATE TRIGGER mappings_updated
+AFTER UPDATE ON mappings
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_scope_changes();
+
+CREATE TRIGGER mappings_deleted
+AFTER DELETE ON mappings
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_scope_changes();
+
+CREATE TRIGGER prefixes_inserted
+AFTER INSERT ON prefixes
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_scope_changes();
+
+CREATE TRIGGER prefixes_updated
+AFTER UPDATE ON prefixes
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_scope_changes();
+
+CREATE TRIGGER prefixes_deleted
+AFTER DELETE ON prefixes
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_scope_changes();
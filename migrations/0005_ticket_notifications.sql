@@ -0,0 +1,31 @@
+-- Publishes the tickets that changed on the channel of
+-- migrations/0004_scope_notifications.sql, so every bot process
+-- serving the guild reads them again. Payloads look like
+-- "tickets:<channel id>:<version>", the scope is the ticket channel.
+
+CREATE OR REPLACE FUNCTION notify_ticket_changes() RETURNS TRIGGER AS $$
+DECLARE
+    changed_id BIGINT;
+    changed_version BIGINT;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_id := OLD.channel_id;
+    ELSE
+        changed_id := NEW.channel_id;
+    END IF;
+
+    INSERT INTO scope_versions AS versions (scope_id, kind, version)
+    VALUES (changed_id, 'tickets', NEXTVAL('scope_version_seq'))
+    ON CONFLICT (scope_id, kind) DO UPDATE SET version = EXCLUDED.version
+    RETURNING versions.version INTO changed_version;
+
+    PERFORM PG_NOTIFY('xynus_scopes', 'tickets:' || changed_id || ':' || changed_version);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Tickets are written one at a time, a row level trigger is enough.
+CREATE TRIGGER tickets_changed
+AFTER INSERT OR UPDATE OR DELETE ON tickets
+FOR EACH ROW EXECUTE FUNCTION notify_ticket_changes();
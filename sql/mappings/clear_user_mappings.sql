@@ -0,0 +1,3 @@
+DELETE FROM mappings
+WHERE
+    user_id = $1;
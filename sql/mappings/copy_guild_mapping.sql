@@ -0,0 +1,16 @@
+INSERT INTO mappings (
+    trigger,
+    command,
+    guild_id,
+    created_at
+)
+SELECT
+    $1,
+    command,
+    guild_id,
+    $2
+FROM mappings
+WHERE
+    trigger = $3
+AND
+    guild_id = $4;
@@ -0,0 +1,16 @@
+INSERT INTO mappings (
+    trigger,
+    command,
+    user_id,
+    created_at
+)
+SELECT
+    $1,
+    command,
+    user_id,
+    $2
+FROM mappings
+WHERE
+    trigger = $3
+AND
+    user_id = $4;
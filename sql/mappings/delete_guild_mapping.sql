@@ -0,0 +1,3 @@
+DELETE FROM mappings
+WHERE guild_id = $1
+AND trigger = $2;
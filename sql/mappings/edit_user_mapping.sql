@@ -0,0 +1,8 @@
+UPDATE mappings
+SET
+    trigger = $1,
+    command = $2
+WHERE
+    user_id = $3
+AND
+    trigger = $4;
@@ -0,0 +1,3 @@
+SELECT user_id, guild_id, trigger, command
+FROM mappings
+ORDER BY COALESCE(guild_id, user_id);
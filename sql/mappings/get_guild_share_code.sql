@@ -0,0 +1,5 @@
+SELECT id, share_code FROM mappings
+WHERE
+    guild_id = $1
+AND
+    trigger = $2;
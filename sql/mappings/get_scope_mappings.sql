@@ -0,0 +1,4 @@
+SELECT user_id, guild_id, trigger, command
+FROM mappings
+WHERE user_id = ANY($1::BIGINT[])
+OR guild_id = ANY($1::BIGINT[]);
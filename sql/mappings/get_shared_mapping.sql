@@ -0,0 +1,3 @@
+SELECT *
+FROM mappings
+WHERE share_code = $1;
@@ -0,0 +1,9 @@
+SELECT
+    command,
+    created_at
+FROM
+    mappings
+WHERE
+    trigger = $1
+AND
+    user_id = $2;
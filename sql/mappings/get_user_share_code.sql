@@ -0,0 +1,5 @@
+SELECT id, share_code FROM mappings
+WHERE
+    user_id = $1
+AND
+    trigger = $2;
@@ -0,0 +1,15 @@
+INSERT INTO mappings(
+    user_id,
+    trigger,
+    command,
+    created_at
+)
+SELECT
+    $1,
+    $2,
+    command,
+    $3
+
+FROM mappings
+WHERE
+    share_code = $4;
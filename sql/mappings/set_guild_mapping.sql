@@ -0,0 +1,16 @@
+INSERT INTO mappings(
+    guild_id,
+    trigger,
+    command,
+    created_at
+)
+VALUES (
+    $1,
+    $2,
+    $3,
+    $4
+)
+ON CONFLICT (guild_id, trigger)
+DO UPDATE
+    SET command = EXCLUDED.command,
+        created_at = EXCLUDED.created_at;
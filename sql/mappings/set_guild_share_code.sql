@@ -0,0 +1,7 @@
+UPDATE mappings
+SET
+    share_code = $1
+WHERE
+    guild_id = $2
+AND
+    trigger = $3;
@@ -0,0 +1,14 @@
+INSERT INTO prefixes(
+    guild_id,
+    prefixes
+)
+VALUES(
+    $1,
+    ARRAY[$2]::TEXT[]
+)
+ON CONFLICT (guild_id)
+DO UPDATE
+SET prefixes = ARRAY_CAT(
+    prefixes.prefixes,
+    EXCLUDED.prefixes
+);
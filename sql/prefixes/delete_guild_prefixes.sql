@@ -0,0 +1,3 @@
+DELETE FROM prefixes
+WHERE
+    guild_id = $1;
@@ -0,0 +1,2 @@
+DELETE FROM prefixes
+WHERE user_id = $1;
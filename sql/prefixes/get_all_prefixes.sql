@@ -0,0 +1,2 @@
+SELECT user_id, guild_id, prefixes
+FROM prefixes;
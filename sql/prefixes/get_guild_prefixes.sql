@@ -0,0 +1,2 @@
+SELECT * FROM prefixes
+WHERE guild_id = $1;
@@ -0,0 +1,2 @@
+SELECT * FROM prefixes
+WHERE user_id = $1;
@@ -0,0 +1,7 @@
+UPDATE prefixes
+SET prefixes = ARRAY_REMOVE(
+    prefixes,
+    $1
+)
+WHERE
+    guild_id = $2;
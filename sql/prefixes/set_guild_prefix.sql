@@ -0,0 +1,11 @@
+INSERT INTO prefixes(
+    guild_id,
+    prefixes
+)
+VALUES(
+    $1,
+    ARRAY[$2]::TEXT[]
+)
+ON CONFLICT (guild_id)
+DO UPDATE
+SET prefixes = EXCLUDED.prefixes;
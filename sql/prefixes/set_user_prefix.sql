@@ -0,0 +1,11 @@
+INSERT INTO prefixes(
+    user_id,
+    prefixes
+)
+VALUES(
+    $1,
+    ARRAY[$2]::TEXT[]
+)
+ON CONFLICT (user_id)
+DO UPDATE
+SET prefixes = EXCLUDED.prefixes;
@@ -0,0 +1,3 @@
+DELETE FROM tickets
+WHERE channel_id = $1
+AND guild_id = $2;
@@ -0,0 +1,5 @@
+-- Every ticket counted against its owner, read at boot to fill the ticket index.
+SELECT guild_id, owner_id, channel_id, user_ids, is_open, is_valid, panel_id, original_name
+FROM tickets
+WHERE is_open = TRUE
+AND is_valid = TRUE;
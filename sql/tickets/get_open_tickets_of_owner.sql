@@ -0,0 +1,6 @@
+SELECT channel_id
+FROM tickets
+WHERE owner_id = $1
+AND guild_id = $2
+AND is_open = TRUE
+AND is_valid = TRUE;
@@ -0,0 +1,3 @@
+SELECT guild_id, owner_id, channel_id, user_ids, is_open, is_valid, panel_id, original_name
+FROM tickets
+WHERE channel_id = $1;
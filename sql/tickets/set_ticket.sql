@@ -0,0 +1,21 @@
+-- Creates a ticket or updates the state of an existing one.
+-- $1 guild_id, $2 owner_id, $3 channel_id, $4 user_ids,
+-- $5 is_open, $6 is_valid, $7 panel_id, $8 original_name
+INSERT INTO tickets (
+    guild_id,
+    owner_id,
+    channel_id,
+    user_ids,
+    is_open,
+    is_valid,
+    panel_id,
+    original_name
+)
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+ON CONFLICT (channel_id) DO UPDATE SET
+    owner_id = EXCLUDED.owner_id,
+    user_ids = EXCLUDED.user_ids,
+    is_open = EXCLUDED.is_open,
+    is_valid = EXCLUDED.is_valid,
+    panel_id = EXCLUDED.panel_id,
+    original_name = EXCLUDED.original_name;